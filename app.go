@@ -18,7 +18,8 @@ import (
 type App struct {
 	ctx              context.Context
 	backendCmd       *exec.Cmd
-	quitting         bool // true = real quit from tray, false = hide-to-tray on window close
+	backendExited    <-chan struct{} // closed once backendCmd has been waited for
+	quitting         bool            // true = real quit from tray, false = hide-to-tray on window close
 	syncWatchCancels sync.Map
 	moveWatchCancel  context.CancelFunc
 	moveWatchMu      sync.Mutex
@@ -107,7 +108,7 @@ func (a *App) startup(ctx context.Context) {
 	// Start Python backend
 	log.Println("Starting backend...")
 	envVars := readEnvFile(envFile())
-	cmd, err := startBackend(envVars)
+	cmd, ready, err := startBackend(envVars)
 	if err != nil {
 		runtime.MessageDialog(ctx, runtime.MessageDialogOptions{
 			Type:    runtime.ErrorDialog,
@@ -118,9 +119,19 @@ func (a *App) startup(ctx context.Context) {
 	}
 	a.backendCmd = cmd
 
-	// Wait for backend to be ready
-	if !waitForBackend(30 * time.Second) {
-		stopBackend(a.backendCmd)
+	// Watch for backend process death (also ends the readiness wait early).
+	// This is the only Wait on the Cmd; stopBackend waits on the channel.
+	exited := make(chan struct{})
+	a.backendExited = exited
+	go func() {
+		err := cmd.Wait()
+		close(exited)
+		log.Printf("Backend process exited: %v", err)
+	}()
+
+	// Wait for the backend to announce on stdout that it is ready
+	if !waitForBackend(ready, exited, 30*time.Second) {
+		stopBackend(a.backendCmd, a.backendExited)
 		runtime.MessageDialog(ctx, runtime.MessageDialogOptions{
 			Type:    runtime.ErrorDialog,
 			Title:   "Backend Timeout",
@@ -129,12 +140,6 @@ func (a *App) startup(ctx context.Context) {
 		return
 	}
 	log.Println("Backend is ready")
-
-	// Watch for backend process death
-	go func() {
-		a.backendCmd.Wait()
-		log.Println("Backend process exited unexpectedly")
-	}()
 }
 
 // shutdown is called when the app is closing.
@@ -144,7 +149,7 @@ func (a *App) shutdown(ctx context.Context) {
 	// before we release port 47200. If the order were reversed, a relaunching
 	// second instance could grab port 47200 and try to start its own backend
 	// while our uvicorn is still listening on 8000, causing a bind error.
-	stopBackend(a.backendCmd)
+	stopBackend(a.backendCmd, a.backendExited)
 	if a.instanceListener != nil {
 		a.instanceListener.Close()
 	}
@@ -333,7 +338,7 @@ func (a *App) DownloadAndInstall(latestVersion string) {
 				return
 			}
 			emit("done", 100, "Installer launched. The app will now close.")
-			stopBackend(a.backendCmd)
+			stopBackend(a.backendCmd, a.backendExited)
 			a.quit()
 		} else {
 			if err := installLinux(tmpPath); err != nil {
@@ -341,7 +346,7 @@ func (a *App) DownloadAndInstall(latestVersion string) {
 				return
 			}
 			emit("done", 100, "Update installed. Restarting…")
-			stopBackend(a.backendCmd)
+			stopBackend(a.backendCmd, a.backendExited)
 			// Release single-instance port before spawning the new version.
 			if a.instanceListener != nil {
 				a.instanceListener.Close()
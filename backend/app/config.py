@@ -7,6 +7,8 @@ class Settings(BaseSettings):
     database_url: str = "sqlite+aiosqlite:////data/db/scdl-web.db"
     music_root: str = "/data/music"
     archives_root: str = "/data/archives"
+    # Enables the /api/admin profiling endpoints regardless of the DB setting
+    profiling_enabled: bool = False
 
 
 settings = Settings()
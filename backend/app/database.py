@@ -1,6 +1,9 @@
+import time
+
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from app import metrics
 from app.config import settings
 
 engine = create_async_engine(settings.database_url, echo=False)
@@ -10,16 +13,52 @@ async_session = async_sessionmaker(engine, expire_on_commit=False)
 @event.listens_for(engine.sync_engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor = dbapi_connection.cursor()
+    # Only takes effect on a new database (or at the next VACUUM); lets
+    # maintenance hand freed pages back to the filesystem incrementally
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
     cursor.execute("PRAGMA journal_mode=WAL")
     cursor.execute("PRAGMA foreign_keys=ON")
     cursor.close()
 
 
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start"].pop()
+    metrics.db_query_seconds.observe(
+        time.perf_counter() - start, kind=metrics.statement_kind(statement),
+    )
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _record_query_error(exception_context):
+    metrics.db_query_errors.inc()
+    stack = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if stack:
+        stack.pop()
+
+
+def _create_missing_indexes(sync_conn) -> None:
+    """create_all skips existing tables, so add indexes introduced since."""
+    from app.models import Base
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 async def init_db():
     from app.models import Base
+    from app.services import log_search
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
+        await log_search.create_index(conn)
 
 
 async def get_db():
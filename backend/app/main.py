@@ -1,3 +1,6 @@
+from app.startup import startup_timer  # first, so the timer covers the imports below
+
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -5,18 +8,25 @@ from datetime import datetime, timezone
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import update
 
+from app import metrics
+from app.config import settings as app_settings
 from app.database import init_db, async_session
 from app.models.sync_run import SyncRun
-from app.routers import sources, settings, history, sync, filesystem, rekordbox
+from app.routers import admin, sources, settings, history, stats, sync, filesystem, rekordbox
 from app.ws.sync_progress import ws_manager
+from app.services import library_stats, log_search
 from app.services.auto_sync import auto_sync_scheduler
-from app.services.library_mover import library_mover
+from app.services.maintenance import db_maintenance
+from app.services.move_journal import JOURNAL_NAME
 from app.services.sync_manager import sync_manager
 
+# The Rekordbox exporter (vendored pyrekordbox) and the library mover are imported
+# lazily — on first use or by _deferred_startup — to keep them off the cold start.
+
 
 def _setup_file_logging() -> None:
     """Write all logs (server + scdl) to a rotating file when LOG_DIR is set.
@@ -84,17 +94,69 @@ async def _cleanup_stale_runs() -> None:
             )
 
 
+def _wire_services() -> None:
+    """Import the lazily-loaded services and hand them the WebSocket manager."""
+    from app.services import rekordbox_exporter
+    from app.services.library_mover import library_mover
+
+    library_mover.set_ws_manager(ws_manager)
+    rekordbox_exporter.set_ws_manager(ws_manager)
+
+
+async def _backfill_library_stats() -> None:
+    music_root = await sync_manager.get_current_music_root()
+
+    def filemap_entries(source) -> tuple[Path, list[str]]:
+        folder = music_root / source.local_folder
+        return folder, list(sync_manager.runner.load_filemap(source.id, folder).values())
+
+    await library_stats.backfill(filemap_entries)
+
+
+async def _deferred_startup() -> None:
+    """Non-critical startup work, run once the server is accepting requests."""
+    try:
+        with startup_timer.phase("deferred_imports"):
+            await asyncio.to_thread(_wire_services)
+        with startup_timer.phase("auto_sync"):
+            await auto_sync_scheduler.start()
+        logging.getLogger(__name__).info(
+            "Deferred startup done: imports %.0fms, auto-sync %.0fms",
+            startup_timer.phases["deferred_imports"] * 1000,
+            startup_timer.phases["auto_sync"] * 1000,
+        )
+        await db_maintenance.start()
+        await _backfill_library_stats()
+        await log_search.backfill()
+    except Exception:
+        logging.getLogger(__name__).exception("Deferred startup failed")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
-    await _cleanup_stale_runs()
-    sync_manager.set_ws_manager(ws_manager)
-    await sync_manager.load_max_concurrent()
-    library_mover.set_ws_manager(ws_manager)
-    ws_manager.set_log_buffer_provider(lambda sid: sync_manager.log_buffers.get(sid))
-    await auto_sync_scheduler.start()
+    startup_timer.mark("imports")
+    with startup_timer.phase("init_db"):
+        await init_db()
+        await _cleanup_stale_runs()
+        await library_stats.init()
+    with startup_timer.phase("load_settings"):
+        sync_manager.set_ws_manager(ws_manager)
+        await sync_manager.load_max_concurrent()
+        ws_manager.set_log_buffer_provider(lambda sid: sync_manager.log_buffers.get(sid))
+    # An interrupted library move must resume before any sync can start
+    if (Path(app_settings.archives_root) / JOURNAL_NAME).exists():
+        with startup_timer.phase("resume_move"):
+            _wire_services()
+            from app.services.library_mover import library_mover
+            library_mover.resume_interrupted(Path(app_settings.archives_root))
+    logging.getLogger(__name__).info("Startup: %s", startup_timer.summary())
+    deferred = asyncio.create_task(_deferred_startup())
     yield
+    deferred.cancel()
     auto_sync_scheduler.stop()
+    db_maintenance.stop()
+    from app.services import rekordbox_exporter
+    rekordbox_exporter.shutdown_analysis_pool()
 
 
 app = FastAPI(title="scdl-web", lifespan=lifespan)
@@ -110,9 +172,11 @@ app.add_middleware(
 app.include_router(sources.router)
 app.include_router(settings.router)
 app.include_router(history.router)
+app.include_router(stats.router)
 app.include_router(sync.router)
 app.include_router(filesystem.router)
 app.include_router(rekordbox.router)
+app.include_router(admin.router)
 
 
 @app.get("/api/health")
@@ -120,8 +184,15 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/api/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition of the in-process metrics."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/api/move-library/live")
 async def get_move_live_state(cursor: int = 0):
+    from app.services.library_mover import library_mover
     return library_mover.get_live_state(cursor)
 
 
@@ -0,0 +1,241 @@
+"""Minimal Prometheus-style metrics, rendered in the text exposition format.
+
+Counters, gauges and histograms are plain in-memory numbers guarded by a lock
+(they are updated from copier threads and SQLAlchemy's worker thread too), so
+recording a sample costs well under a microsecond and the endpoint can stay on.
+"""
+
+import bisect
+import math
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+
+LabelKey = tuple[tuple[str, str], ...]
+
+# Seconds; spans fast DB queries up to multi-hour syncs and library moves
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0,
+)
+
+
+def _label_key(labels: dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """A settable value, or one computed at scrape time by ``fn``."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float] | None = None):
+        super().__init__(name, help)
+        self._values: dict[LabelKey, float] = {}
+        self._fn = fn
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._fn = fn
+
+    def samples(self) -> list[str]:
+        if self._fn is not None:
+            return [f"{self.name} {_format_value(float(self._fn()))}"]
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self._buckets = tuple(sorted(buckets))
+        # label key → [per-bucket counts (last is +Inf), sum, count]
+        self._series: dict[LabelKey, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        i = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self._buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(s[0]), s[1], s[2]) for k, s in self._series.items()]
+        lines = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, n in zip(self._buckets + (math.inf,), counts):
+                cumulative += n
+                le = ("le", _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ── Process ──────────────────────────────────────────────────────
+
+_STARTED = time.time()
+Gauge("scdl_web_start_time_seconds", "Unix time the backend process started.", fn=lambda: _STARTED)
+
+# ── Syncs (SyncManager / ScdlRunner) ─────────────────────────────
+
+sync_queue_wait = Histogram(
+    "scdl_web_sync_queue_wait_seconds", "Time a source waited for a free sync slot.",
+)
+sync_duration = Histogram(
+    "scdl_web_sync_duration_seconds", "Wall time of sync runs, by final status.",
+)
+syncs_total = Counter("scdl_web_syncs_total", "Finished sync runs, by final status.")
+syncs_running = Gauge("scdl_web_syncs_running", "Syncs currently running.")
+syncs_queued = Gauge("scdl_web_syncs_queued", "Syncs waiting for a free slot.")
+
+scdl_first_output = Histogram(
+    "scdl_web_scdl_first_output_seconds", "Time from spawning scdl to its first output line.",
+)
+scdl_tracks = Counter("scdl_web_scdl_tracks_total", "Tracks processed by scdl, by result.")
+scdl_downloaded_bytes = Counter(
+    "scdl_web_scdl_downloaded_bytes_total", "Size of the audio files written by scdl.",
+)
+scdl_shared_bytes = Counter(
+    "scdl_web_scdl_shared_bytes_total", "Size of the tracks linked from another source instead of downloaded.",
+)
+
+# ── WebSockets (ConnectionManager) ───────────────────────────────
+
+ws_connections = Gauge("scdl_web_ws_connections", "Open WebSocket connections.")
+ws_messages = Counter("scdl_web_ws_messages_total", "WebSocket messages sent.")
+ws_send_errors = Counter("scdl_web_ws_send_errors_total", "WebSocket sends that failed.")
+ws_send_seconds = Histogram(
+    "scdl_web_ws_send_seconds",
+    "Time to hand one message to a client; grows when a client falls behind.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+# ── Library moves (LibraryMover) ─────────────────────────────────
+
+library_move_in_progress = Gauge("scdl_web_library_move_in_progress", "1 while a library move is running.")
+library_moves = Counter("scdl_web_library_moves_total", "Library moves, by final status.")
+library_move_duration = Histogram(
+    "scdl_web_library_move_duration_seconds", "Wall time of library moves, by final status.",
+)
+library_move_files = Counter("scdl_web_library_move_files_total", "Files moved between library roots.")
+library_move_bytes = Counter("scdl_web_library_move_bytes_total", "Bytes moved between library roots.")
+
+# ── Rekordbox export ─────────────────────────────────────────────
+
+rekordbox_export_duration = Histogram(
+    "scdl_web_rekordbox_export_seconds", "Time to export a batch of sources to the XML.",
+)
+rekordbox_tracks = Counter(
+    "scdl_web_rekordbox_tracks_total", "Tracks added to / removed from the Rekordbox XML.",
+)
+
+# ── Database (SQLAlchemy engine events) ──────────────────────────
+
+db_query_seconds = Histogram(
+    "scdl_web_db_query_seconds", "SQL statement execution time, by statement kind.",
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+db_query_errors = Counter("scdl_web_db_query_errors_total", "SQL statements that raised.")
+
+
+def statement_kind(statement: str) -> str:
+    """SELECT/INSERT/UPDATE/DELETE/… for labelling, without parsing the statement."""
+    head = statement.lstrip()[:8].split(None, 1)
+    kind = head[0].upper() if head else ""
+    return kind if kind in {"SELECT", "INSERT", "UPDATE", "DELETE", "PRAGMA", "CREATE"} else "OTHER"
+
+
+def render() -> str:
+    return REGISTRY.render()
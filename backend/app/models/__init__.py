@@ -8,5 +8,8 @@ class Base(DeclarativeBase):
 from app.models.source import Source
 from app.models.sync_run import SyncRun
 from app.models.global_settings import GlobalSetting
+from app.models.sync_trace import SyncTrace
+from app.models.library_stats import DailyStats, LibraryFile, LibraryTotal
+from app.models.audio_analysis import AudioAnalysis
 
-__all__ = ["Base", "Source", "SyncRun", "GlobalSetting"]
+__all__ = ["Base", "Source", "SyncRun", "GlobalSetting", "SyncTrace", "DailyStats", "LibraryFile", "LibraryTotal", "AudioAnalysis"]
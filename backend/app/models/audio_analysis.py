@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class AudioAnalysis(Base):
+    """Cached tempo/key estimate of an audio file, keyed by its identity on disk."""
+
+    __tablename__ = "audio_analysis"
+
+    # "st_dev:st_ino" — shared by hardlinks, so a track linked into several
+    # sources is analyzed once; size and mtime tell when the file changed
+    file_id: Mapped[str] = mapped_column(String, primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    bpm: Mapped[float | None] = mapped_column(Float, nullable=True)  # None: no steady pulse / not decodable
+    key: Mapped[str | None] = mapped_column(String, nullable=True)  # Rekordbox notation, e.g. "Am"
+    analyzed_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
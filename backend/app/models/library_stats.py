@@ -0,0 +1,56 @@
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class LibraryFile(Base):
+    """An audio file the app downloaded (a filemap entry), with its size at last check."""
+
+    __tablename__ = "library_files"
+
+    source_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("sources.id", ondelete="CASCADE"), primary_key=True,
+    )
+    path: Mapped[str] = mapped_column(String, primary_key=True)  # relative to the source folder
+    format: Mapped[str] = mapped_column(String, nullable=False)  # file extension, e.g. "mp3"
+    size: Mapped[int] = mapped_column(BigInteger, default=0)
+    added_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+
+class LibraryTotal(Base):
+    """Running track count and size per source and format, kept in step with library_files."""
+
+    __tablename__ = "library_totals"
+
+    source_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("sources.id", ondelete="CASCADE"), primary_key=True,
+    )
+    format: Mapped[str] = mapped_column(String, primary_key=True)
+    tracks: Mapped[int] = mapped_column(Integer, default=0)
+    bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+class DailyStats(Base):
+    """Per-day counters per source; source_id 0 holds the all-sources total."""
+
+    __tablename__ = "stats_daily"
+    # Clustered by source, then day: a series is one contiguous key range
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    source_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    runs: Mapped[int] = mapped_column(Integer, default=0)
+    runs_failed: Mapped[int] = mapped_column(Integer, default=0)
+    runs_cancelled: Mapped[int] = mapped_column(Integer, default=0)
+    run_seconds: Mapped[float] = mapped_column(Float, default=0)
+    # As reported by the runs (scdl output)
+    tracks_added: Mapped[int] = mapped_column(Integer, default=0)
+    tracks_removed: Mapped[int] = mapped_column(Integer, default=0)
+    # Changes to library_files, the basis of the library size series
+    files_added: Mapped[int] = mapped_column(Integer, default=0)
+    files_removed: Mapped[int] = mapped_column(Integer, default=0)
+    bytes_added: Mapped[int] = mapped_column(BigInteger, default=0)
+    bytes_removed: Mapped[int] = mapped_column(BigInteger, default=0)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base
@@ -8,6 +8,12 @@ from app.models import Base
 
 class SyncRun(Base):
     __tablename__ = "sync_runs"
+    __table_args__ = (
+        # Latest run per source (source list, history filtered by source)
+        Index("ix_sync_runs_source_started", "source_id", "started_at"),
+        # Only runs that still have a log, oldest first: what retention compacts
+        Index("ix_sync_runs_log_retained", "started_at", sqlite_where=text("log_output IS NOT NULL")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     source_id: Mapped[int] = mapped_column(Integer, ForeignKey("sources.id", ondelete="CASCADE"), nullable=False)
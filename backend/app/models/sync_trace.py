@@ -0,0 +1,15 @@
+from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class SyncTrace(Base):
+    """Chrome trace JSON of a sync run, kept out of sync_runs so listings stay light."""
+
+    __tablename__ = "sync_traces"
+
+    run_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("sync_runs.id", ondelete="CASCADE"), primary_key=True,
+    )
+    trace_json: Mapped[str] = mapped_column(Text, nullable=False)
@@ -0,0 +1,143 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings as app_settings
+from app.database import get_db
+from app.models.global_settings import GlobalSetting
+from app.models.source import Source
+from app.schemas.admin import ProfileStartRequest
+from app.services.profiler import memory_profiler, profile_manager
+
+
+async def require_profiling(db: AsyncSession = Depends(get_db)) -> None:
+    """Admin endpoints are off unless PROFILING_ENABLED or the profiling_enabled setting is set."""
+    if app_settings.profiling_enabled:
+        return
+    row = await db.get(GlobalSetting, "profiling_enabled")
+    if not (row and row.value == "true"):
+        raise HTTPException(403, "Profiling is disabled (set PROFILING_ENABLED=1 or the profiling_enabled setting)")
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_profiling)])
+
+
+def _attachment(data: bytes, filename: str, media_type: str) -> Response:
+    return Response(
+        data, media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# ── CPU profiles ─────────────────────────────────────────────────
+# Static routes MUST come before dynamic /{session_id} routes
+
+
+@router.get("/profile")
+async def list_profiles():
+    current = profile_manager.current
+    return {
+        "running": current.to_dict() if current else None,
+        "sessions": [s.to_dict() for s in reversed(profile_manager.sessions)],
+    }
+
+
+@router.post("/profile/start")
+async def start_profile(payload: ProfileStartRequest, db: AsyncSession = Depends(get_db)):
+    """Profile for a time window, or for one sync of ``source_id`` (started right away)."""
+    try:
+        if payload.source_id is not None:
+            if not await db.get(Source, payload.source_id):
+                raise HTTPException(404, "Source not found")
+            session = await profile_manager.profile_sync(payload.mode, payload.source_id)
+        else:
+            session = profile_manager.start(payload.mode, payload.duration)
+    except RuntimeError as e:
+        raise HTTPException(409, str(e))
+    return session.to_dict()
+
+
+@router.post("/profile/stop")
+async def stop_profile():
+    session = profile_manager.stop()
+    if session is None:
+        raise HTTPException(404, "No profiling session is running")
+    return session.to_dict()
+
+
+@router.get("/profile/{session_id}")
+async def get_profile(session_id: int):
+    session = profile_manager.get(session_id)
+    if not session:
+        raise HTTPException(404, "Profile not found")
+    return session.to_dict()
+
+
+@router.get("/profile/{session_id}/download")
+async def download_profile(session_id: int):
+    """pstats file for cProfile sessions, speedscope JSON for sampling sessions."""
+    session = profile_manager.get(session_id)
+    if not session:
+        raise HTTPException(404, "Profile not found")
+    if session.data is None:
+        raise HTTPException(409, "Profiling session is still running")
+    media_type = "application/octet-stream" if session.mode == "cprofile" else "application/json"
+    return _attachment(session.data, session.filename, media_type)
+
+
+# ── Memory snapshots ─────────────────────────────────────────────
+
+
+@router.get("/memory")
+async def list_snapshots():
+    return {
+        "tracing": memory_profiler.tracing,
+        "snapshots": [
+            {"id": s.id, "taken_at": s.taken_at.isoformat(), "traced_bytes": s.traced_bytes}
+            for s in memory_profiler.snapshots
+        ],
+    }
+
+
+@router.post("/memory/snapshot")
+async def take_snapshot(limit: int = 30):
+    """Take a tracemalloc snapshot (starting tracing on the first call) and summarize it."""
+    entry, started = await asyncio.to_thread(memory_profiler.take_snapshot)
+    summary = await asyncio.to_thread(memory_profiler.summary, entry, limit)
+    summary["tracing_started"] = started
+    return summary
+
+
+@router.post("/memory/stop")
+async def stop_tracing():
+    """Stop tracemalloc and drop all snapshots."""
+    memory_profiler.stop()
+    return {"tracing": False}
+
+
+@router.get("/memory/diff")
+async def diff_snapshots(base: int, target: int, limit: int = 30):
+    """What changed between two snapshots, per module and per line."""
+    base_entry, target_entry = memory_profiler.get(base), memory_profiler.get(target)
+    if not base_entry or not target_entry:
+        raise HTTPException(404, "Snapshot not found")
+    return await asyncio.to_thread(memory_profiler.diff, base_entry, target_entry, limit)
+
+
+@router.get("/memory/{snapshot_id}")
+async def get_snapshot(snapshot_id: int, limit: int = 30):
+    entry = memory_profiler.get(snapshot_id)
+    if not entry:
+        raise HTTPException(404, "Snapshot not found")
+    return await asyncio.to_thread(memory_profiler.summary, entry, limit)
+
+
+@router.get("/memory/{snapshot_id}/download")
+async def download_snapshot(snapshot_id: int):
+    """The raw snapshot, loadable with ``tracemalloc.Snapshot.load()``."""
+    entry = memory_profiler.get(snapshot_id)
+    if not entry:
+        raise HTTPException(404, "Snapshot not found")
+    data = await asyncio.to_thread(memory_profiler.dump, entry)
+    return _attachment(data, f"scdl-web-memory-{snapshot_id}.tracemalloc", "application/octet-stream")
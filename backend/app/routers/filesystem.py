@@ -1,46 +1,105 @@
+import asyncio
 import os
+import threading
+import time
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Query
 
 router = APIRouter(prefix="/api/filesystem", tags=["filesystem"])
 
+# Listings are cached briefly so paging, filtering and going back and forth in the
+# picker don't re-read large (network) directories. A changed mtime invalidates.
+LISTING_TTL = 10.0
+_LISTING_CACHE_MAX = 64
+
+# path → (expires_at, dir mtime_ns, [(name, full path, is_dir)])
+_listing_cache: dict[str, tuple[float, int, list[tuple[str, str, bool]]]] = {}
+_listing_lock = threading.Lock()
+
+
+def _list_directory(target: Path) -> list[tuple[str, str, bool]]:
+    """Sorted (name, path, is_dir) of the visible, readable entries of ``target``.
+
+    One ``os.scandir`` pass: entry types come from the directory read itself and
+    readability is checked with ``os.access`` instead of listing each subdirectory.
+    """
+    key = str(target)
+    mtime = target.stat().st_mtime_ns
+    now = time.monotonic()
+    with _listing_lock:
+        cached = _listing_cache.get(key)
+    if cached and cached[0] > now and cached[1] == mtime:
+        return cached[2]
+
+    entries: list[tuple[str, str, bool]] = []
+    with os.scandir(target) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir():
+                    if os.access(entry.path, os.R_OK | os.X_OK):
+                        entries.append((entry.name, entry.path, True))
+                elif entry.is_file():
+                    entries.append((entry.name, entry.path, False))
+            except OSError:
+                continue
+    entries.sort()
+
+    with _listing_lock:
+        if len(_listing_cache) >= _LISTING_CACHE_MAX:
+            _listing_cache.pop(next(iter(_listing_cache)))
+        _listing_cache[key] = (now + LISTING_TTL, mtime, entries)
+    return entries
+
 
 @router.get("/browse")
-async def browse_directory(path: str = Query("/"), file_glob: str | None = Query(None)):
-    """List directories (and optionally files) at the given path for the picker."""
+async def browse_directory(
+    path: str = Query("/"),
+    file_glob: str | None = Query(None),
+    prefix: str | None = Query(None),
+    limit: int = Query(500, ge=1, le=5000),
+    offset: int = Query(0, ge=0),
+):
+    """List directories (and optionally files) at the given path for the picker.
+
+    Directories come first, then files matching ``file_glob``; ``prefix`` filters
+    names case-insensitively and ``limit``/``offset`` page through the result.
+    """
     target = Path(path).expanduser()
 
     if not target.is_absolute():
         raise HTTPException(400, "Path must be absolute")
-    if not target.exists():
-        raise HTTPException(404, f"Path does not exist: {path}")
-    if not target.is_dir():
-        raise HTTPException(400, f"Path is not a directory: {path}")
 
-    dirs: list[dict] = []
-    files: list[dict] = []
     try:
-        for entry in sorted(target.iterdir()):
-            if entry.name.startswith("."):
-                continue
-            if entry.is_dir():
-                try:
-                    # Check if we can read the directory
-                    os.listdir(entry)
-                    dirs.append({"name": entry.name, "path": str(entry)})
-                except PermissionError:
-                    pass
-            elif file_glob and entry.is_file() and entry.match(file_glob):
-                files.append({"name": entry.name, "path": str(entry)})
+        entries = await asyncio.to_thread(_list_directory, target)
+    except FileNotFoundError:
+        raise HTTPException(404, f"Path does not exist: {path}")
+    except NotADirectoryError:
+        raise HTTPException(400, f"Path is not a directory: {path}")
     except PermissionError:
         raise HTTPException(403, f"Permission denied: {path}")
 
+    needle = prefix.casefold() if prefix else None
+    matches = [
+        (name, entry_path, is_dir)
+        for name, entry_path, is_dir in entries
+        if (needle is None or name.casefold().startswith(needle))
+        and (is_dir or (file_glob and Path(name).match(file_glob)))
+    ]
+    # Sort keeps directories and files interleaved by name; list directories first
+    matches.sort(key=lambda e: not e[2])
+    page = matches[offset:offset + limit]
+
     parent = str(target.parent) if target != target.parent else None
 
     return {
         "current": str(target),
         "parent": parent,
-        "directories": dirs,
-        "files": files,
+        "directories": [{"name": name, "path": p} for name, p, is_dir in page if is_dir],
+        "files": [{"name": name, "path": p} for name, p, is_dir in page if not is_dir],
+        "total": len(matches),
+        "offset": offset,
+        "has_more": offset + len(page) < len(matches),
     }
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.source import Source
 from app.models.sync_run import SyncRun
-from app.schemas.sync_run import SyncRunDetail, SyncRunRead
+from app.models.sync_trace import SyncTrace
+from app.schemas.sync_run import SyncRunDetail, SyncRunRead, SyncRunSearchHit, SyncRunSearchResult
+from app.services import log_search
 
 router = APIRouter(prefix="/api/history", tags=["history"])
 
@@ -32,6 +34,48 @@ async def list_history(
     return out
 
 
+# Static routes MUST come before dynamic /{run_id} routes
+@router.get("/search", response_model=SyncRunSearchResult)
+async def search_history(
+    q: str = Query(min_length=1, max_length=500),
+    source_id: int | None = None,
+    status: str | None = None,
+    before: int | None = Query(default=None, description="Only runs older than this run id (paging)"),
+    limit: int = Query(default=20, ge=1, le=100),
+    lines: int = Query(default=5, ge=1, le=50, description="Matching lines returned per run"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Full-text search over sync logs; newest matching runs first, with highlighted lines."""
+    if not log_search.available:
+        raise HTTPException(503, "Log search is unavailable (SQLite was built without FTS5)")
+    try:
+        groups, next_before = await log_search.search(db, q, source_id, status, before, limit, lines)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    runs = {}
+    if groups:
+        result = await db.execute(select(SyncRun).where(SyncRun.id.in_([g["run_id"] for g in groups])))
+        runs = {run.id: run for run in result.scalars().all()}
+    names = {}
+    out = []
+    for group in groups:
+        run = runs.get(group["run_id"])
+        if run is None:  # deleted since it was indexed
+            continue
+        if run.source_id not in names:
+            source = await db.get(Source, run.source_id)
+            names[run.source_id] = source.name if source else None
+        hit = SyncRunSearchHit.model_validate({
+            **SyncRunRead.model_validate(run).model_dump(),
+            "source_name": names[run.source_id],
+            "match_count": group["match_count"],
+            "matches": group["matches"],
+        })
+        out.append(hit)
+    return SyncRunSearchResult(results=out, next_before=next_before)
+
+
 @router.get("/{run_id}", response_model=SyncRunDetail)
 async def get_run_detail(run_id: int, db: AsyncSession = Depends(get_db)):
     run = await db.get(SyncRun, run_id)
@@ -41,4 +85,20 @@ async def get_run_detail(run_id: int, db: AsyncSession = Depends(get_db)):
     source = await db.get(Source, run.source_id)
     if source:
         data.source_name = source.name
+    data.has_trace = (
+        await db.scalar(select(func.count()).where(SyncTrace.run_id == run_id))
+    ) > 0
     return data
+
+
+@router.get("/{run_id}/trace")
+async def download_run_trace(run_id: int, db: AsyncSession = Depends(get_db)):
+    """Download the run's phase/track timeline as Chrome trace JSON (chrome://tracing, Perfetto)."""
+    trace = await db.get(SyncTrace, run_id)
+    if not trace:
+        raise HTTPException(404, "No trace recorded for this sync run")
+    return Response(
+        trace.trace_json,
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="sync-run-{run_id}-trace.json"'},
+    )
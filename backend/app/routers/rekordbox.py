@@ -1,27 +1,50 @@
 from fastapi import APIRouter, HTTPException
 
-from app.schemas.rekordbox import RekordboxExportResult, RekordboxStatus
-from app.services import rekordbox_exporter
-
+from app.schemas.rekordbox import (
+    RekordboxBatchExportRequest,
+    RekordboxBatchExportResult,
+    RekordboxExportResult,
+    RekordboxStatus,
+)
 router = APIRouter(prefix="/api/rekordbox", tags=["rekordbox"])
 
 
+def _exporter():
+    # Imported on first use: the exporter pulls in the vendored pyrekordbox
+    from app.services import rekordbox_exporter
+    return rekordbox_exporter
+
+
+# Static routes MUST come before dynamic /{source_id} routes
+@router.post("/export", response_model=RekordboxBatchExportResult)
+async def export_sources(payload: RekordboxBatchExportRequest | None = None):
+    """Export several sources (all if no ids are given) with a single XML write."""
+    return await _exporter().export_sources(payload.source_ids if payload else None)
+
+
 @router.post("/{source_id}/export", response_model=RekordboxExportResult)
 async def export_source(source_id: int):
     """Export all audio files from a source to Rekordbox as a playlist."""
     try:
-        return await rekordbox_exporter.export_source(source_id)
+        return await _exporter().export_source(source_id)
     except FileNotFoundError as e:
         raise HTTPException(404, str(e))
 
 
+@router.get("/{source_id}/progress")
+async def get_export_progress(source_id: int):
+    """Poll endpoint for export progress (fallback if WS not connected)."""
+    progress = _exporter().get_export_progress(source_id)
+    return {"is_exporting": progress is not None, "progress": progress}
+
+
 @router.get("/discover")
 async def discover_xml():
     """Scan default OS paths for existing Rekordbox XML files."""
-    paths = rekordbox_exporter.discover_xml_paths()
+    paths = _exporter().discover_xml_paths()
     return {"detected_paths": paths}
 
 
 @router.get("/status", response_model=RekordboxStatus)
 async def get_status():
-    return await rekordbox_exporter.get_status()
+    return await _exporter().get_status()
@@ -10,7 +10,10 @@ from app.database import get_db
 from app.models.global_settings import GlobalSetting
 from app.schemas.settings import SettingsRead, SettingsUpdate
 from app.services.auto_sync import auto_sync_scheduler
-from app.services.library_mover import library_mover
+from app.services.maintenance import (
+    DEFAULT_FAILED_LOG_RETENTION_DAYS, DEFAULT_LOG_RETENTION_DAYS, DEFAULT_RUN_RETENTION_DAYS,
+    db_maintenance,
+)
 from app.services.sync_manager import sync_manager
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
@@ -19,7 +22,9 @@ logger = logging.getLogger(__name__)
 SETTING_KEYS = [
     "auth_token", "default_audio_format", "default_name_format", "music_root",
     "auto_sync_enabled", "auto_sync_interval_minutes", "max_concurrent_syncs",
-    "rekordbox_xml_path", "onboarding_complete",
+    "rekordbox_xml_path", "rekordbox_auto_export", "onboarding_complete",
+    "profiling_enabled", "history_log_retention_days", "history_failed_log_retention_days",
+    "history_run_retention_days", "share_tracks_across_sources", "rekordbox_analyze_audio",
 ]
 
 
@@ -43,7 +48,20 @@ def _build_settings_read(settings: dict[str, str | None]) -> SettingsRead:
         if settings.get("max_concurrent_syncs")
         else 2,
         rekordbox_xml_path=settings.get("rekordbox_xml_path"),
+        rekordbox_auto_export=settings.get("rekordbox_auto_export") == "true",
+        rekordbox_analyze_audio=settings.get("rekordbox_analyze_audio") == "true",
         onboarding_complete=settings.get("onboarding_complete") == "true",
+        profiling_enabled=settings.get("profiling_enabled") == "true",
+        history_log_retention_days=int(settings["history_log_retention_days"])
+        if settings.get("history_log_retention_days")
+        else DEFAULT_LOG_RETENTION_DAYS,
+        history_failed_log_retention_days=int(settings["history_failed_log_retention_days"])
+        if settings.get("history_failed_log_retention_days")
+        else DEFAULT_FAILED_LOG_RETENTION_DAYS,
+        history_run_retention_days=int(settings["history_run_retention_days"])
+        if settings.get("history_run_retention_days")
+        else DEFAULT_RUN_RETENTION_DAYS,
+        share_tracks_across_sources=settings.get("share_tracks_across_sources") == "true",
     )
 
 
@@ -97,6 +115,7 @@ async def move_check(
     db: AsyncSession = Depends(get_db),
 ):
     """Pre-flight check: how many files would be moved."""
+    from app.services.library_mover import library_mover
     if sync_manager.is_syncing:
         raise HTTPException(409, "Cannot move library while a sync is running")
     if library_mover.is_moving:
@@ -115,9 +134,11 @@ async def move_check(
 @router.post("/move-library")
 async def move_library(
     payload: SettingsUpdate,
+    verify_checksums: bool = Query(False),
     db: AsyncSession = Depends(get_db),
 ):
     """Start the library move as a background task."""
+    from app.services.library_mover import library_mover
     if sync_manager.is_syncing:
         raise HTTPException(409, "Cannot move library while a sync is running")
     if library_mover.is_moving:
@@ -135,7 +156,10 @@ async def move_library(
         raise HTTPException(400, "New path is the same as the current path")
 
     archives_root = Path(app_settings.archives_root)
-    library_mover.start_move(old_root, new_root, archives_root)
+    try:
+        library_mover.start_move(old_root, new_root, archives_root, verify_checksums)
+    except RuntimeError as e:
+        raise HTTPException(409, str(e))
 
     return {"status": "started"}
 
@@ -143,11 +167,34 @@ async def move_library(
 @router.get("/move-status")
 async def move_status():
     """Poll endpoint for move status (fallback if WS not connected)."""
+    from app.services.library_mover import library_mover
     return {
         "is_moving": library_mover.is_moving,
         "status": library_mover.status,
         "total_files": library_mover.total_files,
         "moved_files": library_mover.moved_files,
         "current_file": library_mover.current_file,
+        "total_bytes": library_mover.total_bytes,
+        "moved_bytes": library_mover.moved_bytes,
+        "bytes_per_sec": round(library_mover.bytes_per_sec),
         "error": library_mover.error,
     }
+
+
+@router.get("/maintenance")
+async def maintenance_status():
+    """Retention/maintenance state and the report of the last pass."""
+    return db_maintenance.status()
+
+
+@router.post("/maintenance/run")
+async def run_maintenance(full_vacuum: bool = Query(False)):
+    """Apply history retention now; ``full_vacuum`` also rebuilds the database file."""
+    from app.services.library_mover import library_mover
+    if full_vacuum and (sync_manager.is_syncing or library_mover.is_moving):
+        raise HTTPException(409, "A full vacuum needs all syncs and library moves to be finished")
+    try:
+        db_maintenance.start_run(full_vacuum)
+    except RuntimeError as e:
+        raise HTTPException(409, str(e))
+    return {"status": "started"}
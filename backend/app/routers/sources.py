@@ -14,6 +14,7 @@ from app.database import get_db
 from app.models.source import Source
 from app.models.sync_run import SyncRun
 from app.schemas.source import SourceCreate, SourceRead, SourceUpdate
+from app.services import library_stats, log_search
 from app.services.sync_manager import sync_manager
 
 router = APIRouter(prefix="/api/sources", tags=["sources"])
@@ -164,6 +165,9 @@ async def delete_source(
         if music_folder.exists():
             shutil.rmtree(music_folder)
 
+    run_ids = (await db.execute(select(SyncRun.id).where(SyncRun.source_id == source_id))).scalars().all()
+    await log_search.remove_runs(db, list(run_ids))
+    await library_stats.forget_source(db, source_id)
     await db.delete(source)
     await db.commit()
 
@@ -227,7 +231,7 @@ async def list_tracks(source_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(400, "Invalid folder path")
 
     # Load filemap to associate track IDs with files on disk
-    filemap = sync_manager.runner._load_filemap(source.id)
+    filemap = sync_manager.runner.load_filemap(source.id, folder)
     filemap_paths: dict[str, str] = {v: k for k, v in filemap.items()}
 
     tracks = []
@@ -315,9 +319,9 @@ async def delete_track(
         raise HTTPException(404, "File not found")
 
     # Resolve track_id: prefer the one from the client, fall back to filemap lookup
-    filemap = sync_manager.runner._load_filemap(source.id)
+    filemap = sync_manager.runner.load_filemap(source.id, folder)
     if not track_id:
-        abs_path = str(file_path)
+        abs_path = str(folder / file_path.relative_to(folder.resolve()))
         for tid, fp in filemap.items():
             if fp == abs_path:
                 track_id = tid
@@ -325,10 +329,11 @@ async def delete_track(
 
     if track_id:
         filemap.pop(track_id, None)
-        sync_manager.runner._save_filemap(source.id, filemap)
+        sync_manager.runner.save_filemap(source.id, folder, filemap)
 
     # Delete the file — next sync's prepare_sync_files will exclude it
     file_path.unlink()
+    await library_stats.refresh_source(source.id, folder, filemap.values())
 
     return {"status": "deleted"}
 
@@ -0,0 +1,24 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models.source import Source
+from app.schemas.stats import LibraryStats
+from app.services import library_stats
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+@router.get("", response_model=LibraryStats)
+async def get_stats(
+    bucket: Literal["day", "week", "month"] = "day",
+    days: int = Query(default=90, ge=1, le=3660),
+    source_id: int | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Library size, per-format/per-source totals and time-bucketed sync activity."""
+    if source_id is not None and not await db.get(Source, source_id):
+        raise HTTPException(404, "Source not found")
+    return await library_stats.get_stats(db, bucket, days, source_id)
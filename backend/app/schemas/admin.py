@@ -0,0 +1,10 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ProfileStartRequest(BaseModel):
+    # "sample": all threads, speedscope JSON; "cprofile": event loop thread, pstats
+    mode: Literal["sample", "cprofile"] = "sample"
+    duration: float | None = Field(default=None, gt=0)  # seconds; None = until stopped (capped)
+    source_id: int | None = None  # profile one sync of this source instead of a time window
@@ -5,11 +5,29 @@ class RekordboxExportResult(BaseModel):
     tracks_added: int
     tracks_skipped: int
     playlist_updated: int
+    tracks_removed: int = 0
     xml_path: str
     playlist_name: str
     is_rekordbox_running: bool
 
 
+class RekordboxSourceExportResult(BaseModel):
+    source_id: int
+    result: RekordboxExportResult | None = None
+    error: str | None = None
+
+
+class RekordboxBatchExportRequest(BaseModel):
+    source_ids: list[int] | None = None  # None = all sources
+
+
+class RekordboxBatchExportResult(BaseModel):
+    xml_path: str
+    exported: int
+    failed: int
+    results: list[RekordboxSourceExportResult]
+
+
 class RekordboxStatus(BaseModel):
     platform: str
     xml_exists: bool
@@ -17,3 +35,4 @@ class RekordboxStatus(BaseModel):
     total_tracks: int
     total_playlists: int
     detected_paths: list[str] = []
+    analysis_available: bool = False  # NumPy and ffmpeg found: tempo/key are estimated
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SettingsRead(BaseModel):
@@ -10,7 +10,14 @@ class SettingsRead(BaseModel):
     auto_sync_interval_minutes: int = 60
     max_concurrent_syncs: int = 2
     rekordbox_xml_path: str | None = None
+    rekordbox_auto_export: bool = False
+    rekordbox_analyze_audio: bool = False
     onboarding_complete: bool = False
+    profiling_enabled: bool = False
+    history_log_retention_days: int = 0
+    history_failed_log_retention_days: int = 0
+    history_run_retention_days: int = 0
+    share_tracks_across_sources: bool = False
 
 
 class SettingsUpdate(BaseModel):
@@ -22,4 +29,11 @@ class SettingsUpdate(BaseModel):
     auto_sync_interval_minutes: int | None = None
     max_concurrent_syncs: int | None = None
     rekordbox_xml_path: str | None = None
+    rekordbox_auto_export: bool | None = None
+    rekordbox_analyze_audio: bool | None = None
     onboarding_complete: bool | None = None
+    profiling_enabled: bool | None = None
+    history_log_retention_days: int | None = Field(default=None, ge=0)
+    history_failed_log_retention_days: int | None = Field(default=None, ge=0)
+    history_run_retention_days: int | None = Field(default=None, ge=0)
+    share_tracks_across_sources: bool | None = None
@@ -0,0 +1,58 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class LibraryTotals(BaseModel):
+    tracks: int
+    bytes: int
+    tracking_since: str | None = None  # first day file changes were recorded
+
+
+class FormatTotals(BaseModel):
+    format: str
+    tracks: int
+    bytes: int
+
+
+class SharedTotals(BaseModel):
+    tracks: int  # linked from another source instead of downloaded
+    bytes_saved: int  # not downloaded
+    bytes_deduplicated: int  # of those, hardlinked: not stored twice
+
+
+class SourceStats(BaseModel):
+    source_id: int
+    name: str
+    tracks: int
+    bytes: int
+    runs: int  # within the requested window
+    runs_failed: int
+    failure_rate: float | None = None
+
+
+class StatsBucket(BaseModel):
+    bucket: date  # first day of the bucket
+    runs: int
+    runs_failed: int
+    runs_cancelled: int
+    run_seconds: float
+    failure_rate: float | None = None
+    tracks_added: int  # as reported by the runs
+    tracks_removed: int
+    files_added: int  # changes to the library on disk
+    files_removed: int
+    bytes_added: int
+    bytes_removed: int
+    library_tracks: int  # library size at the end of the bucket
+    library_bytes: int
+
+
+class LibraryStats(BaseModel):
+    bucket: str
+    start: date
+    library: LibraryTotals
+    formats: list[FormatTotals]
+    shared: SharedTotals
+    sources: list[SourceStats]  # empty when filtered to one source
+    series: list[StatsBucket]
@@ -20,6 +20,23 @@ class SyncRunRead(BaseModel):
 
 class SyncRunDetail(SyncRunRead):
     log_output: str | None = None
+    has_trace: bool = False
+
+
+class LogMatch(BaseModel):
+    line: int  # index of the line in log_output (0-based)
+    text: str
+    highlights: list[tuple[int, int]] = []  # [start, end) offsets of the matched terms in text
+
+
+class SyncRunSearchHit(SyncRunRead):
+    match_count: int
+    matches: list[LogMatch] = []  # the first matching lines of the run
+
+
+class SyncRunSearchResult(BaseModel):
+    results: list[SyncRunSearchHit]
+    next_before: int | None = None  # pass as ``before`` to get the next page
 
 
 class SyncStatus(BaseModel):
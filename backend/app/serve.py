@@ -0,0 +1,37 @@
+"""Run the backend with uvicorn and announce readiness on stdout.
+
+Used by the desktop shell (``python -m app.serve --port 8000``): once the socket
+is listening a single ``SCDL_WEB_READY {...}`` line is printed, carrying the
+startup timing report, so the shell doesn't have to poll /api/health.
+"""
+
+import argparse
+import json
+
+import uvicorn
+
+from app.startup import READY_MARKER, startup_timer
+
+
+class _ReadyServer(uvicorn.Server):
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets)
+        if self.should_exit:
+            return
+        startup_timer.ready()
+        print(f"{READY_MARKER} {json.dumps(startup_timer.report())}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the scdl-web backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    config = uvicorn.Config("app.main:app", host=args.host, port=args.port)
+    server = _ReadyServer(config)
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
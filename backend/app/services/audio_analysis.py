@@ -0,0 +1,167 @@
+import importlib.util
+import logging
+import shutil
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+# Audio is decoded to low-rate mono PCM: enough for onsets and for pitch up to
+# ~2 kHz, and 120 s of it is ~2.6 MB of int16.
+SAMPLE_RATE = 11025
+ANALYSIS_SECONDS = 120
+MIN_SECONDS = 10  # shorter decodes give no usable tempo
+
+# Onset envelope: 1024-sample frames every 128 samples (~86 frames/s)
+ONSET_FRAME = 1024
+ONSET_HOP = 128
+TEMPO_MIN, TEMPO_MAX = 60.0, 200.0
+TEMPO_PRIOR = 120.0  # log-normal prior against half/double tempo picks
+TEMPO_PRIOR_OCTAVES = 1.0
+MIN_TEMPO_CORRELATION = 0.1
+# Reported tempos are folded into the usual DJ range
+FOLD_MIN, FOLD_MAX = 70.0, 180.0
+
+# Chroma: long frames for frequency resolution, pitches between A2 and ~B6
+CHROMA_FRAME = 4096
+CHROMA_HOP = 2048
+CHROMA_FMIN, CHROMA_FMAX = 110.0, 2000.0
+MIN_KEY_CORRELATION = 0.6
+
+# Krumhansl-Kessler key profiles, tonic first
+_MAJOR_PROFILE = (6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88)
+_MINOR_PROFILE = (6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17)
+# Rekordbox "Tonality" notation
+_MAJOR_KEYS = ("C", "Db", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B")
+_MINOR_KEYS = ("Cm", "C#m", "Dm", "Ebm", "Em", "Fm", "F#m", "Gm", "G#m", "Am", "Bbm", "Bm")
+
+
+def find_ffmpeg() -> str | None:
+    return shutil.which("ffmpeg")
+
+
+def is_available() -> bool:
+    """Analysis needs NumPy (optional, not installed by default) and ffmpeg."""
+    return importlib.util.find_spec("numpy") is not None and find_ffmpeg() is not None
+
+
+def decode(path: str, ffmpeg: str):
+    """Decode the start of ``path`` to mono float32 PCM at SAMPLE_RATE."""
+    import numpy as np
+
+    result = subprocess.run(
+        [ffmpeg, "-nostdin", "-v", "error", "-t", str(ANALYSIS_SECONDS), "-i", path,
+         "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+        capture_output=True, check=True,
+    )
+    return np.frombuffer(result.stdout, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def _frames(pcm, frame: int, hop: int):
+    import numpy as np
+
+    frames = np.lib.stride_tricks.sliding_window_view(pcm, frame)[::hop]
+    return frames * np.hanning(frame).astype(np.float32)
+
+
+def onset_envelope(pcm):
+    """Spectral flux of the log-compressed spectrum, with its local mean removed."""
+    import numpy as np
+
+    spectrum = np.log1p(100.0 * np.abs(np.fft.rfft(_frames(pcm, ONSET_FRAME, ONSET_HOP), axis=1)))
+    flux = np.maximum(np.diff(spectrum, axis=0), 0.0).sum(axis=1)
+    # ~0.5 s moving average: keeps the beats, drops loudness changes
+    width = int(0.5 * SAMPLE_RATE / ONSET_HOP) | 1
+    flux = np.maximum(flux - np.convolve(flux, np.ones(width) / width, mode="same"), 0.0)
+    # Light smoothing, so a peak between two frames still lines up with its lag
+    return np.convolve(flux, np.hanning(5)[1:-1] / 2.0, mode="same")
+
+
+def _peak(values, i: int) -> float:
+    """Sub-sample position of the peak at ``i`` by parabolic interpolation."""
+    if 0 < i < len(values) - 1:
+        a, b, c = values[i - 1], values[i], values[i + 1]
+        denom = a - 2 * b + c
+        if denom < 0:
+            return i + 0.5 * (a - c) / denom
+    return float(i)
+
+
+def estimate_tempo(envelope) -> float | None:
+    """Beats per minute from the autocorrelation of an onset envelope."""
+    import numpy as np
+
+    fps = SAMPLE_RATE / ONSET_HOP
+    n = len(envelope)
+    envelope = envelope - envelope.mean()
+    if n < MIN_SECONDS * fps or not envelope.any():
+        return None
+    spectrum = np.fft.rfft(envelope, 2 * n)
+    ac = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+    ac /= ac[0]
+
+    lags = np.arange(int(60 * fps / TEMPO_MAX), int(60 * fps / TEMPO_MIN) + 1)
+    # A beat period also correlates at twice its lag; counting it favours the
+    # beat over off-beats and eighth notes
+    score = ac[lags] + 0.5 * ac[np.minimum(2 * lags, n - 1)]
+    prior = np.exp(-0.5 * (np.log2(60 * fps / lags / TEMPO_PRIOR) / TEMPO_PRIOR_OCTAVES) ** 2)
+    lag = int(lags[np.argmax(score * prior)])
+    if ac[lag] < MIN_TEMPO_CORRELATION:
+        return None  # no steady pulse
+
+    # Refine on the peak at a multiple of the lag: the frame quantization of
+    # that peak is divided by the multiple
+    multiple = max(1, min(8, (n // 2) // lag))
+    centre = lag * multiple
+    lo, hi = centre - multiple, min(centre + multiple + 1, n - 1)
+    period = _peak(ac, lo + int(np.argmax(ac[lo:hi]))) / multiple
+
+    bpm = 60 * fps / period
+    while bpm < FOLD_MIN:
+        bpm *= 2
+    while bpm >= FOLD_MAX:
+        bpm /= 2
+    return round(bpm, 2)
+
+
+def estimate_key(pcm) -> str | None:
+    """Musical key from the correlation of the average chroma with key profiles."""
+    import numpy as np
+
+    if len(pcm) < CHROMA_FRAME:
+        return None
+    spectrum = np.log1p(np.abs(np.fft.rfft(_frames(pcm, CHROMA_FRAME, CHROMA_HOP), axis=1))).mean(axis=0)
+    freqs = np.fft.rfftfreq(CHROMA_FRAME, 1.0 / SAMPLE_RATE)
+    band = (freqs >= CHROMA_FMIN) & (freqs <= CHROMA_FMAX)
+    pitch_class = np.rint(12 * np.log2(freqs[band] / 440.0) + 9).astype(int) % 12  # 0 = C
+    chroma = np.bincount(pitch_class, weights=spectrum[band], minlength=12)
+    if not chroma.any():
+        return None
+
+    # Every rotation of both profiles at once: row k is the profile with tonic k
+    rotations = (np.arange(12)[None, :] - np.arange(12)[:, None]) % 12
+    profiles = np.vstack([np.asarray(_MAJOR_PROFILE)[rotations], np.asarray(_MINOR_PROFILE)[rotations]])
+    profiles = profiles - profiles.mean(axis=1, keepdims=True)
+    centred = chroma - chroma.mean()
+    norms = np.linalg.norm(profiles, axis=1) * np.linalg.norm(centred)
+    if not norms.all():
+        return None
+    correlation = profiles @ centred / norms
+    best = int(np.argmax(correlation))
+    if correlation[best] < MIN_KEY_CORRELATION:
+        return None
+    return _MAJOR_KEYS[best] if best < 12 else _MINOR_KEYS[best - 12]
+
+
+def analyze_file(path: str, ffmpeg: str) -> tuple[float | None, str | None]:
+    """Return ``(bpm, key)`` for an audio file; either is None when unknown.
+
+    Runs in a worker process, so it only takes and returns plain values.
+    """
+    try:
+        pcm = decode(path, ffmpeg)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.debug("Could not decode %s: %s", path, e)
+        return None, None
+    if len(pcm) < MIN_SECONDS * SAMPLE_RATE:
+        return None, None
+    return estimate_tempo(onset_envelope(pcm)), estimate_key(pcm)
@@ -0,0 +1,141 @@
+import errno
+import hashlib
+import os
+import shutil
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+try:
+    import xxhash  # optional — much faster than BLAKE2 when installed
+except ImportError:
+    xxhash = None
+
+# Large chunks keep syscall overhead negligible on multi-GB libraries while still
+# giving smooth byte-level progress.
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Errors meaning "this kernel copy primitive can't handle these files" — fall back
+# to the next method instead of failing the copy.
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.EOPNOTSUPP,
+    getattr(errno, "ENOTSUP", errno.EOPNOTSUPP), getattr(errno, "ENOTSOCK", errno.EINVAL),
+}
+
+ProgressCallback = Callable[[int], None]
+
+
+def checksum_name() -> str:
+    return "xxh3-128" if xxhash is not None else "blake2b-128"
+
+
+def _new_hasher():
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def _kernel_copiers(infd: int, outfd: int) -> list[Callable[[int, int], int]]:
+    """Return zero-copy primitives available here, each ``(offset, count) -> bytes copied``."""
+    copiers: list[Callable[[int, int], int]] = []
+    if hasattr(os, "copy_file_range"):
+        copiers.append(lambda off, n: os.copy_file_range(infd, outfd, n, off, off))
+    if sys.platform.startswith("linux"):
+        # Linux sendfile accepts regular files as output since 2.6.33
+        copiers.append(lambda off, n: os.sendfile(outfd, infd, off, n))
+    return copiers
+
+
+def _copy_chunks(fsrc, fdst, offset: int, on_progress: ProgressCallback | None, hasher=None) -> int:
+    """Buffered copy from ``offset`` to EOF; optionally hashes the data as it passes."""
+    fsrc.seek(offset)
+    fdst.seek(offset)
+    buf = bytearray(COPY_CHUNK_SIZE)
+    view = memoryview(buf)
+    copied = 0
+    while True:
+        n = fsrc.readinto(buf)
+        if not n:
+            break
+        chunk = view[:n]
+        if hasher is not None:
+            hasher.update(chunk)
+        fdst.write(chunk)
+        copied += n
+        if on_progress:
+            on_progress(n)
+    return copied
+
+
+def _copy_kernel(fsrc, fdst, size: int, on_progress: ProgressCallback | None) -> int:
+    infd, outfd = fsrc.fileno(), fdst.fileno()
+    copied = 0
+    for copier in _kernel_copiers(infd, outfd):
+        # copy_file_range uses explicit offsets and never moves the output fd, while
+        # sendfile writes at its current position: line it up with what's copied
+        os.lseek(outfd, copied, os.SEEK_SET)
+        try:
+            while copied < size:
+                n = copier(copied, COPY_CHUNK_SIZE)
+                if n == 0:
+                    break  # e.g. pseudo-filesystems reporting a bogus size
+                copied += n
+                if on_progress:
+                    on_progress(n)
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+        if copied >= size:
+            return copied
+    return copied + _copy_chunks(fsrc, fdst, copied, on_progress)
+
+
+def hash_file(path: Path) -> str:
+    """Return the checksum of a file (same algorithm as ``copy_file(checksum=True)``)."""
+    hasher = _new_hasher()
+    buf = bytearray(COPY_CHUNK_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb") as f:
+        while n := f.readinto(buf):
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+def copy_file(
+    src: Path,
+    dst: Path,
+    on_progress: ProgressCallback | None = None,
+    checksum: bool = False,
+    verify: bool = False,
+) -> str | None:
+    """Copy a file's contents and metadata (like ``shutil.copy2``), as fast as possible.
+
+    Without ``checksum`` the data is copied in the kernel (``copy_file_range``, then
+    ``sendfile``) and only falls back to a buffered copy where neither works. With
+    ``checksum`` the data has to pass through userspace to be hashed, so it is
+    copied in large buffers and hashed on the way (still a single read); the
+    digest is returned. ``verify`` (implies ``checksum``) also reads the
+    destination back and compares, at the cost of a second full read.
+
+    ``on_progress`` is called from the copying thread with the number of bytes
+    written since the previous call.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        if checksum or verify:
+            hasher = _new_hasher()
+            copied = _copy_chunks(fsrc, fdst, 0, on_progress, hasher)
+        else:
+            copied = _copy_kernel(fsrc, fdst, size, on_progress)
+        fdst.flush()
+        written = os.fstat(fdst.fileno()).st_size
+    if copied != size or written != size:
+        raise OSError(f"Size mismatch after copy: {src} ({size} bytes, {written} written)")
+    shutil.copystat(src, dst)
+
+    if not (checksum or verify):
+        return None
+    digest = hasher.hexdigest()
+    if verify and hash_file(dst) != digest:
+        raise OSError(f"Checksum mismatch after copy: {src}")
+    return digest
@@ -1,18 +1,124 @@
 import asyncio
-import json
 import logging
 import os
-import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from sqlalchemy import select
 
+from app import metrics
 from app.database import async_session
 from app.models.global_settings import GlobalSetting
 from app.models.source import Source
+from app.services import file_copy
+from app.services.move_journal import MoveJournal
+from app.services.scdl_runner import ScdlRunner
 
 logger = logging.getLogger(__name__)
 
+# Concurrent copies for cross-device moves: enough to keep a disk/NAS queue busy
+# without thrashing a spinning disk with too many interleaved streams.
+COPY_WORKERS = 4
+PROGRESS_INTERVAL = 0.5  # seconds between byte-level progress broadcasts
+# A pre-check plan is reused by the move if confirmed within this many seconds
+# and no source folder changed in between.
+PLAN_TTL = 600.0
+
+
+def _scan_folder(folder: Path) -> tuple[list[tuple[Path, int]], int]:
+    """Return (files with their sizes, folder mtime_ns) using one scandir pass per directory."""
+    try:
+        mtime = folder.stat().st_mtime_ns
+    except OSError:
+        return [], 0
+    files: list[tuple[Path, int]] = []
+    stack = [str(folder)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        files.append((Path(entry.path), entry.stat().st_size))
+                except OSError:
+                    continue
+    files.sort()
+    return files, mtime
+
+
+def _remove_copied(folder: Path, journal: MoveJournal) -> list[Path]:
+    """Delete the originals under ``folder`` that were copied and not modified since,
+    then the directories left empty.
+
+    Returns the files that were kept: added or changed after the plan was scanned
+    or the file copied, so they are not at the new location.
+    """
+    kept: list[Path] = []
+    for dirpath, _, filenames in os.walk(folder, topdown=False):
+        for name in filenames:
+            path = Path(dirpath, name)
+            try:
+                if journal.original_unchanged(path, path.stat()):
+                    path.unlink()
+                    continue
+            except OSError as e:
+                logger.warning("Could not remove %s: %s", path, e)
+            kept.append(path)
+        try:
+            os.rmdir(dirpath)
+        except OSError:
+            pass  # not empty: something in it was kept
+    return kept
+
+
+@dataclass
+class SourceMove:
+    source: Source
+    old_folder: Path
+    new_folder: Path
+    files: list[tuple[Path, int]]  # (old path, size)
+    mtime_ns: int  # of old_folder when scanned
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size in self.files)
+
+
+@dataclass
+class MovePlan:
+    old_root: Path
+    new_root: Path
+    sources: list[SourceMove] = field(default_factory=list)
+    created_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def total_files(self) -> int:
+        return sum(len(s.files) for s in self.sources)
+
+    @property
+    def total_size(self) -> int:
+        return sum(s.size for s in self.sources)
+
+    def is_fresh(self) -> bool:
+        """True if the plan is recent and no source folder was modified since the scan."""
+        if time.monotonic() - self.created_at > PLAN_TTL:
+            return False
+        for s in self.sources:
+            try:
+                if s.old_folder.stat().st_mtime_ns != s.mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
 
 class LibraryMover:
     def __init__(self):
@@ -21,9 +127,15 @@ class LibraryMover:
         self.total_files: int = 0
         self.moved_files: int = 0
         self.current_file: str = ""
+        self.total_bytes: int = 0
+        self.moved_bytes: int = 0
+        self.bytes_per_sec: float = 0.0
         self.status: str = "idle"
         self.error: str | None = None
         self.log_lines: list[str] = []
+        self._bytes_lock = threading.Lock()
+        self._plan: MovePlan | None = None
+        metrics.library_move_in_progress.set_function(lambda: int(self.is_moving))
 
     @property
     def is_moving(self) -> bool:
@@ -40,174 +152,332 @@ class LibraryMover:
         self.log_lines.append(line)
         await self._broadcast({"type": "log", "line": line})
 
-    async def pre_check(self, old_root: Path, new_root: Path) -> dict:
-        """Check what would be moved. Returns counts for the confirmation dialog."""
+    async def build_plan(self, old_root: Path, new_root: Path) -> MovePlan:
+        """Scan every source folder (one worker thread per source) into a move plan.
+
+        The plan is cached so that the move confirmed right after the pre-check
+        doesn't walk the library a second time.
+        """
         async with async_session() as db:
             result = await db.execute(select(Source))
-            sources = result.scalars().all()
-
-        total_files = 0
-        total_size = 0
-        source_count = 0
-
-        for source in sources:
-            folder = old_root / source.local_folder
-            if folder.exists():
-                file_count = 0
-                folder_size = 0
-                for f in folder.rglob("*"):
-                    if f.is_file():
-                        file_count += 1
-                        folder_size += f.stat().st_size
-                if file_count > 0:
-                    source_count += 1
-                    total_files += file_count
-                    total_size += folder_size
+            sources = list(result.scalars().all())
+
+        scans = await asyncio.gather(*(
+            asyncio.to_thread(_scan_folder, old_root / source.local_folder)
+            for source in sources
+        ))
+        plan = MovePlan(old_root=old_root, new_root=new_root)
+        for source, (files, mtime) in zip(sources, scans):
+            if files:
+                plan.sources.append(SourceMove(
+                    source=source,
+                    old_folder=old_root / source.local_folder,
+                    new_folder=new_root / source.local_folder,
+                    files=files,
+                    mtime_ns=mtime,
+                ))
+        self._plan = plan
+        return plan
+
+    async def _get_plan(self, old_root: Path, new_root: Path) -> MovePlan:
+        """Reuse the pre-check plan for these roots if still fresh, else rescan."""
+        plan, self._plan = self._plan, None
+        if (
+            plan is not None
+            and (plan.old_root, plan.new_root) == (old_root, new_root)
+            and await asyncio.to_thread(plan.is_fresh)
+        ):
+            return plan
+        return await self.build_plan(old_root, new_root)
 
+    async def pre_check(self, old_root: Path, new_root: Path) -> dict:
+        """Check what would be moved. Returns counts for the confirmation dialog."""
+        plan = await self.build_plan(old_root, new_root)
         return {
-            "source_count": source_count,
-            "total_files": total_files,
-            "total_size": total_size,
-            "needs_move": total_files > 0,
+            "source_count": len(plan.sources),
+            "total_files": plan.total_files,
+            "total_size": plan.total_size,
+            "needs_move": plan.total_files > 0,
         }
 
-    def start_move(self, old_root: Path, new_root: Path, archives_root: Path):
+    def start_move(
+        self, old_root: Path, new_root: Path, archives_root: Path, verify_checksums: bool = False,
+    ):
         if self.is_moving:
             raise RuntimeError("A move is already in progress")
+        journal = MoveJournal.load(archives_root)
+        if journal is not None and (journal.old_root, journal.new_root) != (old_root, new_root):
+            if journal.phase_reached("rewrite"):
+                # Files already live at the journal's destination; a different move would lose them
+                raise RuntimeError(
+                    f"An interrupted move to {journal.new_root} must be resumed first"
+                )
+            # Only copies were made and the originals are intact, so it's safe to abandon
+            logger.info("Discarding interrupted move to %s", journal.new_root)
+            journal.discard()
+            journal = None
+        self._start(old_root, new_root, archives_root, verify_checksums, journal)
+
+    def resume_interrupted(self, archives_root: Path) -> bool:
+        """Resume a move left unfinished by a crash or restart. Called at startup.
+
+        A move that stopped on an error (disk full, permission denied) would most
+        likely fail again, so it is left for the user to retry with ``start_move``.
+        """
+        journal = MoveJournal.load(archives_root)
+        if journal is None:
+            return False
+        if journal.failed:
+            logger.warning(
+                "Library move from %s to %s failed (%s); start it again to retry",
+                journal.old_root, journal.new_root, journal.failed_error,
+            )
+            self.status = "failed"
+            self.error = journal.failed_error
+            return False
+        logger.warning(
+            "Resuming interrupted library move from %s to %s (%s phase)",
+            journal.old_root, journal.new_root, journal.phase,
+        )
+        self._start(journal.old_root, journal.new_root, archives_root, journal.verify_checksums, journal)
+        return True
+
+    def _start(
+        self, old_root: Path, new_root: Path, archives_root: Path,
+        verify_checksums: bool, journal: MoveJournal | None,
+    ):
         # Reset state
         self.total_files = 0
         self.moved_files = 0
         self.current_file = ""
+        self.total_bytes = 0
+        self.moved_bytes = 0
+        self.bytes_per_sec = 0.0
         self.status = "idle"
         self.error = None
         self.log_lines = []
-        self._task = asyncio.create_task(self._run_move(old_root, new_root, archives_root))
+        self._task = asyncio.create_task(
+            self._run_move(old_root, new_root, archives_root, verify_checksums, journal)
+        )
 
-    async def _run_move(self, old_root: Path, new_root: Path, archives_root: Path):
-        try:
-            # Phase 1: Scan
-            self.status = "scanning"
-            await self._broadcast({"type": "status", "status": "scanning"})
-            await self._log(f"Scanning files in {old_root}...")
-
-            async with async_session() as db:
-                result = await db.execute(select(Source))
-                sources = list(result.scalars().all())
-
-            move_plan: list[tuple[Source, Path, Path]] = []
-            all_files: list[tuple[Path, Path]] = []
-
-            for source in sources:
-                old_folder = old_root / source.local_folder
-                new_folder = new_root / source.local_folder
-                if old_folder.exists():
-                    has_files = False
-                    for f in old_folder.rglob("*"):
-                        if f.is_file():
-                            rel = f.relative_to(old_folder)
-                            all_files.append((f, new_folder / rel))
-                            has_files = True
-                    if has_files:
-                        move_plan.append((source, old_folder, new_folder))
-
-            self.total_files = len(all_files)
-            await self._log(f"Found {len(all_files)} files across {len(move_plan)} sources")
-            await self._broadcast({
-                "type": "progress", "current": 0, "total": len(all_files),
-            })
+    def _progress_message(self) -> dict:
+        return {
+            "type": "progress",
+            "current": self.moved_files,
+            "total": self.total_files,
+            "bytes_done": self.moved_bytes,
+            "bytes_total": self.total_bytes,
+            "bytes_per_sec": round(self.bytes_per_sec),
+        }
 
-            if len(all_files) == 0:
-                await self._update_setting(new_root)
-                self.status = "completed"
-                await self._log("No files to move. Setting updated.")
-                await self._broadcast({"type": "status", "status": "completed"})
-                return
+    def _add_bytes(self, n: int) -> None:
+        # Called from copier threads
+        with self._bytes_lock:
+            self.moved_bytes += n
+
+    async def _report_copy_progress(self) -> None:
+        """Broadcast byte-level progress and a smoothed throughput while copying."""
+        last_bytes, last_time = self.moved_bytes, time.monotonic()
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            now = time.monotonic()
+            rate = (self.moved_bytes - last_bytes) / max(now - last_time, 1e-6)
+            self.bytes_per_sec = rate if not self.bytes_per_sec else 0.7 * self.bytes_per_sec + 0.3 * rate
+            last_bytes, last_time = self.moved_bytes, now
+            await self._broadcast(self._progress_message())
+
+    async def _copy_files(
+        self, jobs: list[tuple[Path, Path]], verify_checksums: bool, journal: MoveJournal,
+    ) -> None:
+        """Copy files on a bounded pool of threads; the first failure aborts the rest.
+
+        Each completed copy is journaled so an interrupted move doesn't redo it.
+        """
+        def copy_one(src: Path, dst: Path) -> tuple[Path, os.stat_result, int, str | None]:
+            self.current_file = src.name
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            # The original's mtime before copying: cleanup only deletes it if unchanged
+            src_mtime_ns = src.stat().st_mtime_ns
+            digest = file_copy.copy_file(src, dst, self._add_bytes, checksum=verify_checksums)
+            return src, dst.stat(), src_mtime_ns, digest
+
+        loop = asyncio.get_running_loop()
+        pool = ThreadPoolExecutor(max_workers=COPY_WORKERS, thread_name_prefix="move-copy")
+        reporter = asyncio.create_task(self._report_copy_progress())
+        futures = [loop.run_in_executor(pool, copy_one, src, dst) for src, dst in jobs]
+        try:
+            for fut in asyncio.as_completed(futures):
+                src, st, src_mtime_ns, digest = await fut
+                journal.record_copy(src, st.st_size, st.st_mtime_ns, src_mtime_ns, digest)
+                self.moved_files += 1
+        finally:
+            reporter.cancel()
+            # Drop queued copies and wait for the running ones before returning
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+            await asyncio.gather(*futures, return_exceptions=True)
+            await self._broadcast(self._progress_message())
+
+    async def _transfer(
+        self, old_root: Path, new_root: Path, verify_checksums: bool,
+        journal: MoveJournal, resuming: bool,
+    ) -> bool:
+        """Copy phase: rename or copy every source folder. Returns False if there was nothing to move."""
+        self.status = "scanning"
+        await self._broadcast({"type": "status", "status": "scanning"})
+        await self._log(f"Scanning files in {old_root}...")
+
+        plan = await self._get_plan(old_root, new_root)
+        move_plan = plan.sources
+
+        self.total_files = plan.total_files
+        self.total_bytes = plan.total_size
+        await self._log(f"Found {self.total_files} files across {len(move_plan)} sources")
+        await self._broadcast(self._progress_message())
+
+        if self.total_files == 0 and not resuming:
+            return False
 
-            # Phase 2: Move
-            self.status = "moving"
-            await self._broadcast({"type": "status", "status": "moving"})
+        self.status = "moving"
+        await self._broadcast({"type": "status", "status": "moving"})
 
+        if resuming:
+            same_fs = journal.same_fs
+        else:
             same_fs = self._is_same_filesystem(old_root, new_root)
-
-            for source, old_folder, new_folder in move_plan:
-                await self._log(f"Moving {source.name}...")
-
-                if same_fs:
-                    new_folder.parent.mkdir(parents=True, exist_ok=True)
-                    try:
-                        await asyncio.to_thread(old_folder.rename, new_folder)
-                        # Count files for this source
-                        count = sum(
-                            1 for f, _ in all_files
-                            if str(f).startswith(str(old_folder) + os.sep)
-                            or str(f).startswith(str(old_folder))
-                            and f.parent == old_folder
-                        )
-                        self.moved_files += count
-                        await self._broadcast({
-                            "type": "progress",
-                            "current": self.moved_files,
-                            "total": self.total_files,
-                        })
-                        continue
-                    except OSError:
-                        await self._log("  Rename failed, falling back to copy...")
-
-                # Slow path: copy file by file
-                for old_file, new_file in all_files:
-                    if not self._is_under(old_file, old_folder):
-                        continue
-                    self.current_file = old_file.name
-                    new_file.parent.mkdir(parents=True, exist_ok=True)
-                    await asyncio.to_thread(shutil.copy2, str(old_file), str(new_file))
-                    # Verify
-                    new_size = await asyncio.to_thread(lambda: new_file.stat().st_size)
-                    old_size = await asyncio.to_thread(lambda: old_file.stat().st_size)
-                    if new_size != old_size:
-                        raise RuntimeError(f"Size mismatch after copy: {old_file}")
+            journal.start(
+                old_root, new_root, [entry.source.id for entry in move_plan],
+                same_fs, verify_checksums,
+            )
+        copy_jobs: list[tuple[Path, Path]] = []
+        skipped = 0
+
+        for entry in move_plan:
+            old_folder, new_folder = entry.old_folder, entry.new_folder
+            await self._log(f"Moving {entry.source.name}...")
+
+            if same_fs:
+                new_folder.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    await asyncio.to_thread(old_folder.rename, new_folder)
+                    journal.record_rename(entry.source.id)
+                    self.moved_files += len(entry.files)
+                    self.moved_bytes += entry.size
+                    await self._broadcast(self._progress_message())
+                    continue
+                except OSError:
+                    await self._log("  Rename failed, falling back to copy...")
+
+            # Slow path: queue the source's files for the parallel copier,
+            # minus those a previous attempt already copied
+            for old_file, size in entry.files:
+                new_file = new_folder / old_file.relative_to(old_folder)
+                if resuming and journal.is_copied(old_file, new_file):
+                    skipped += 1
                     self.moved_files += 1
-                    if self.moved_files % 10 == 0 or self.moved_files == self.total_files:
-                        await self._broadcast({
-                            "type": "progress",
-                            "current": self.moved_files,
-                            "total": self.total_files,
-                        })
-
-            # Phase 3: Rewrite filemaps
-            self.status = "rewriting"
-            await self._broadcast({"type": "status", "status": "rewriting"})
-            await self._log("Rewriting filemaps...")
-
-            old_root_str = str(old_root)
-            new_root_str = str(new_root)
-
-            for source, _, _ in move_plan:
-                filemap_path = archives_root / f"source-{source.id}-filemap.json"
-                if filemap_path.exists():
-                    try:
-                        raw = await asyncio.to_thread(filemap_path.read_text)
-                        filemap: dict[str, str] = json.loads(raw)
-                        rewritten = {
-                            tid: fp.replace(old_root_str, new_root_str, 1)
-                            for tid, fp in filemap.items()
-                        }
-                        await asyncio.to_thread(
-                            filemap_path.write_text,
-                            json.dumps(rewritten, indent=2),
-                        )
-                        await self._log(f"  Rewrote filemap for {source.name} ({len(rewritten)} entries)")
-                    except (json.JSONDecodeError, OSError) as e:
-                        await self._log(f"  WARNING: Failed to rewrite filemap for {source.name}: {e}")
-
-            # Phase 4: Cleanup old folders (only for cross-device moves)
-            if not same_fs:
-                await self._log("Cleaning up old location...")
-                for _, old_folder, _ in move_plan:
-                    if old_folder.exists():
-                        await asyncio.to_thread(shutil.rmtree, str(old_folder))
-
-            # Phase 5: Update setting in DB
+                    self.moved_bytes += size
+                else:
+                    copy_jobs.append((old_file, new_file))
+
+        if skipped:
+            await self._log(f"Skipping {skipped} files already copied before the interruption")
+        if copy_jobs:
+            mode = f", computing {file_copy.checksum_name()} checksums" if verify_checksums else ""
+            await self._log(f"Copying {len(copy_jobs)} files with {COPY_WORKERS} workers{mode}...")
+            started = time.monotonic()
+            bytes_before = self.moved_bytes
+            await self._copy_files(copy_jobs, verify_checksums, journal)
+            elapsed = max(time.monotonic() - started, 1e-6)
+            copied = self.moved_bytes - bytes_before
+            await self._log(
+                f"  Copied {copied / 1e9:.2f} GB in {elapsed:.0f}s "
+                f"({copied / elapsed / 1e6:.1f} MB/s)"
+            )
+        return True
+
+    async def _migrate_filemaps(
+        self, old_root: Path, archives_root: Path,
+        sources: dict[int, Source], journal: MoveJournal,
+    ) -> None:
+        """Make legacy absolute filemap entries relative so they survive the move.
+
+        Current filemaps store paths relative to the source folder and need no
+        rewrite; only files written by older versions are touched.
+        """
+        self.status = "rewriting"
+        await self._broadcast({"type": "status", "status": "rewriting"})
+
+        runner = ScdlRunner(str(old_root), str(archives_root))
+        for source_id in journal.source_ids:
+            if source_id in journal.rewritten:
+                continue
+            source = sources.get(source_id)
+            if source is not None:
+                try:
+                    migrated = await asyncio.to_thread(
+                        runner.migrate_filemap, source_id, runner.get_music_folder(source),
+                    )
+                    if migrated:
+                        await self._log(f"  Migrated filemap for {source.name} ({migrated} entries)")
+                except OSError as e:
+                    await self._log(f"  WARNING: Failed to migrate filemap for {source.name}: {e}")
+            journal.record_rewrite(source_id)
+
+    async def _run_move(
+        self, old_root: Path, new_root: Path, archives_root: Path,
+        verify_checksums: bool = False, journal: MoveJournal | None = None,
+    ):
+        # Every step is journaled; on failure or crash the journal is kept so that
+        # the move can pick up where it stopped (see resume_interrupted).
+        resuming = journal is not None
+        if journal is None:
+            journal = MoveJournal.for_archives(archives_root)
+        started = time.monotonic()
+        try:
+            if resuming:
+                if journal.failed:
+                    journal.record_resume()
+                await self._log(
+                    f"Resuming interrupted move from {old_root} to {new_root} ({journal.phase} phase)"
+                )
+
+            # Phase 1: Scan, then move (rename or copy)
+            if not journal.phase_reached("rewrite"):
+                if not await self._transfer(old_root, new_root, verify_checksums, journal, resuming):
+                    await self._update_setting(new_root)
+                    self.status = "completed"
+                    await self._log("No files to move. Setting updated.")
+                    await self._broadcast({"type": "status", "status": "completed"})
+                    return
+                journal.set_phase("rewrite")
+
+            sources = await self._load_sources(journal.source_ids)
+
+            # Phase 2: Migrate legacy filemaps (relative entries need no rewrite)
+            if not journal.phase_reached("cleanup"):
+                await self._migrate_filemaps(old_root, archives_root, sources, journal)
+                journal.set_phase("cleanup")
+
+            # Phase 3: Cleanup old folders (only for cross-device moves). Only the
+            # journaled copies are deleted, never the whole tree: files added or
+            # changed since the scan were not copied and stay where they are.
+            if not journal.phase_reached("update_setting"):
+                if not journal.same_fs:
+                    await self._log("Cleaning up old location...")
+                    for source in sources.values():
+                        old_folder = old_root / source.local_folder
+                        if source.id in journal.renamed or not old_folder.exists():
+                            continue
+                        kept = await asyncio.to_thread(_remove_copied, old_folder, journal)
+                        if kept:
+                            await self._log(
+                                f"  WARNING: {len(kept)} files in {old_folder} changed or were added "
+                                "after the scan and were not moved; they were left in place"
+                            )
+                journal.set_phase("update_setting")
+
+            # Phase 4: Update setting in DB
             await self._update_setting(new_root)
+            journal.discard()
 
             self.status = "completed"
             await self._log(f"Library move completed: {self.moved_files} files moved")
@@ -217,10 +487,29 @@ class LibraryMover:
             self.status = "failed"
             self.error = str(e)
             await self._log(f"ERROR: {e}")
+            if journal.path.exists():
+                # Not resumed automatically at startup, unlike a crashed move
+                try:
+                    journal.record_failure(str(e))
+                except OSError as journal_error:
+                    logger.warning("Could not mark the move journal as failed: %s", journal_error)
+                await self._log("The move can be resumed by starting it again with the same folder.")
             await self._broadcast({
                 "type": "status", "status": "failed", "error": str(e),
             })
             logger.exception("Library move failed")
+        finally:
+            journal.close()
+            metrics.library_move_duration.observe(time.monotonic() - started, status=self.status)
+            metrics.library_moves.inc(status=self.status)
+            metrics.library_move_files.inc(self.moved_files)
+            metrics.library_move_bytes.inc(self.moved_bytes)
+
+    @staticmethod
+    async def _load_sources(source_ids: list[int]) -> dict[int, Source]:
+        async with async_session() as db:
+            result = await db.execute(select(Source).where(Source.id.in_(source_ids)))
+            return {source.id: source for source in result.scalars().all()}
 
     async def _update_setting(self, new_root: Path):
         async with async_session() as db:
@@ -240,6 +529,9 @@ class LibraryMover:
             "progress": {
                 "current": self.moved_files,
                 "total": self.total_files,
+                "bytes_done": self.moved_bytes,
+                "bytes_total": self.total_bytes,
+                "bytes_per_sec": round(self.bytes_per_sec),
             } if self.total_files > 0 else None,
             "error": self.error,
         }
@@ -252,13 +544,5 @@ class LibraryMover:
         except OSError:
             return False
 
-    @staticmethod
-    def _is_under(child: Path, parent: Path) -> bool:
-        try:
-            child.relative_to(parent)
-            return True
-        except ValueError:
-            return False
-
 
 library_mover = LibraryMover()
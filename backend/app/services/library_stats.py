@@ -0,0 +1,379 @@
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.models.global_settings import GlobalSetting
+from app.models.library_stats import DailyStats, LibraryFile, LibraryTotal
+from app.models.source import Source
+from app.models.sync_run import SyncRun
+
+logger = logging.getLogger(__name__)
+
+# Rollups are kept up to date as runs finish and files come and go, so
+# /api/stats never scans sync_runs or the music folders. Runs up to the
+# watermark (fixed on the first start with stats) are rolled up once by
+# backfill(); later runs by record_run(), so none is counted twice.
+WATERMARK_SETTING = "library_stats_watermark_run_id"
+BACKFILL_SETTING = "library_stats_since"
+# Cumulative savings of tracks shared between sources (see track_store)
+SHARED_SETTING = "library_stats_shared"
+ALL_SOURCES = 0
+BATCH = 500
+
+_watermark: int | None = None
+_source_locks: dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _format_of(path: str) -> str:
+    return Path(path).suffix.lower().lstrip(".") or "other"
+
+
+def _relative(folder: Path, entry: str) -> str:
+    path = Path(entry)
+    if not path.is_absolute():
+        return path.as_posix()
+    for base in (folder, folder.resolve()):
+        try:
+            return path.relative_to(base).as_posix()
+        except ValueError:
+            continue
+    return entry
+
+
+def _stat_sizes(folder: Path, paths: Iterable[str]) -> dict[str, int]:
+    """Sizes of the files that exist; missing ones are left out."""
+    sizes = {}
+    for path in paths:
+        try:
+            sizes[path] = os.path.getsize(folder / path)
+        except OSError:
+            pass
+    return sizes
+
+
+async def _add_daily(db: AsyncSession, day: date, source_ids: Iterable[int], **counts) -> None:
+    for source_id in source_ids:
+        stmt = insert(DailyStats).values(day=day, source_id=source_id, **counts)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[DailyStats.source_id, DailyStats.day],
+            set_={key: getattr(DailyStats, key) + stmt.excluded[key] for key in counts},
+        ))
+
+
+async def init() -> None:
+    """Fix the backfill watermark on the first start (before any sync can run)."""
+    global _watermark
+    async with async_session() as db:
+        row = await db.get(GlobalSetting, WATERMARK_SETTING)
+        if row is None:
+            last_id = await db.scalar(select(func.max(SyncRun.id))) or 0
+            row = GlobalSetting(key=WATERMARK_SETTING, value=str(last_id))
+            db.add(row)
+            await db.commit()
+    _watermark = int(row.value)
+
+
+async def record_run(db: AsyncSession, run: SyncRun) -> None:
+    """Add a finished run to the daily counters, in the caller's transaction."""
+    if _watermark is None or run.id <= _watermark or run.status == "running":
+        return
+    started = run.started_at.replace(tzinfo=run.started_at.tzinfo or timezone.utc)
+    finished = run.finished_at or datetime.now(timezone.utc)
+    finished = finished.replace(tzinfo=finished.tzinfo or timezone.utc)
+    await _add_daily(
+        db, started.date(), (run.source_id, ALL_SOURCES),
+        runs=1,
+        runs_failed=int(run.status == "failed"),
+        runs_cancelled=int(run.status == "cancelled"),
+        run_seconds=max((finished - started).total_seconds(), 0.0),
+        tracks_added=run.tracks_added or 0,
+        tracks_removed=run.tracks_removed or 0,
+    )
+
+
+async def refresh_source(
+    source_id: int,
+    folder: Path,
+    entries: Iterable[str],
+    changed: Iterable[str] = (),
+    record: bool = True,
+) -> None:
+    """Bring a source's library_files in line with its filemap ``entries``.
+
+    Only new entries and ``changed`` paths (files a run rewrote) are stat'ed;
+    the per-format totals and, with ``record``, today's counters get the
+    difference.
+    """
+    async with _source_locks[source_id]:
+        async with async_session() as db:
+            known = dict((await db.execute(
+                select(LibraryFile.path, LibraryFile.size).where(LibraryFile.source_id == source_id)
+            )).all())
+            wanted = {_relative(folder, entry) for entry in entries}
+            to_stat = (wanted - known.keys()) | ({_relative(folder, p) for p in changed} & wanted)
+            sizes = await asyncio.to_thread(_stat_sizes, folder, to_stat) if to_stat else {}
+
+            added = {p: size for p, size in sizes.items() if p not in known}
+            resized = {p: size for p, size in sizes.items() if p in known and known[p] != size}
+            removed = [p for p in known if p not in wanted]
+            if not (added or resized or removed):
+                return
+
+            # format → [track delta, byte delta]
+            totals: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+            bytes_added = bytes_removed = 0
+            for path, size in added.items():
+                totals[_format_of(path)][0] += 1
+                totals[_format_of(path)][1] += size
+                bytes_added += size
+            for path, size in resized.items():
+                delta = size - known[path]
+                totals[_format_of(path)][1] += delta
+                if delta > 0:
+                    bytes_added += delta
+                else:
+                    bytes_removed -= delta
+            for path in removed:
+                totals[_format_of(path)][0] -= 1
+                totals[_format_of(path)][1] -= known[path]
+                bytes_removed += known[path]
+
+            if added:
+                await db.execute(insert(LibraryFile), [
+                    {"source_id": source_id, "path": p, "format": _format_of(p), "size": size}
+                    for p, size in added.items()
+                ])
+            for path, size in resized.items():
+                await db.execute(
+                    update(LibraryFile)
+                    .where(LibraryFile.source_id == source_id, LibraryFile.path == path)
+                    .values(size=size)
+                )
+            for i in range(0, len(removed), BATCH):
+                await db.execute(delete(LibraryFile).where(
+                    LibraryFile.source_id == source_id, LibraryFile.path.in_(removed[i:i + BATCH]),
+                ))
+            for fmt, (tracks, size) in totals.items():
+                stmt = insert(LibraryTotal).values(source_id=source_id, format=fmt, tracks=tracks, bytes=size)
+                await db.execute(stmt.on_conflict_do_update(
+                    index_elements=[LibraryTotal.source_id, LibraryTotal.format],
+                    set_={
+                        "tracks": LibraryTotal.tracks + stmt.excluded.tracks,
+                        "bytes": LibraryTotal.bytes + stmt.excluded.bytes,
+                    },
+                ))
+            if record:
+                await _add_daily(
+                    db, _today(), (source_id, ALL_SOURCES),
+                    files_added=len(added), files_removed=len(removed),
+                    bytes_added=bytes_added, bytes_removed=bytes_removed,
+                )
+            await db.commit()
+
+
+async def record_shared(db: AsyncSession, tracks: int, saved_bytes: int, deduplicated_bytes: int) -> None:
+    """Add tracks taken from another source instead of downloaded, in the caller's transaction."""
+    row = await db.get(GlobalSetting, SHARED_SETTING)
+    totals = _shared_totals(row)
+    totals["tracks"] += tracks
+    totals["bytes_saved"] += saved_bytes
+    totals["bytes_deduplicated"] += deduplicated_bytes
+    if row:
+        row.value = json.dumps(totals)
+    else:
+        db.add(GlobalSetting(key=SHARED_SETTING, value=json.dumps(totals)))
+
+
+def _shared_totals(row: GlobalSetting | None) -> dict[str, int]:
+    totals = {"tracks": 0, "bytes_saved": 0, "bytes_deduplicated": 0}
+    if row and row.value:
+        try:
+            totals.update(json.loads(row.value))
+        except ValueError:
+            pass
+    return totals
+
+
+async def forget_source(db: AsyncSession, source_id: int) -> None:
+    """Count a deleted source's files as removed today and drop its rollups.
+
+    Runs in the caller's transaction; library_files/library_totals rows go
+    with the source (ON DELETE CASCADE).
+    """
+    tracks, size = (await db.execute(
+        select(func.coalesce(func.sum(LibraryTotal.tracks), 0), func.coalesce(func.sum(LibraryTotal.bytes), 0))
+        .where(LibraryTotal.source_id == source_id)
+    )).one()
+    if tracks or size:
+        await _add_daily(db, _today(), (ALL_SOURCES,), files_removed=tracks, bytes_removed=size)
+    await db.execute(delete(DailyStats).where(DailyStats.source_id == source_id))
+    _source_locks.pop(source_id, None)
+
+
+async def backfill(load_entries) -> None:
+    """Roll up the sync history before the watermark once, and index the files
+    of sources that have none yet (without counting them as added today).
+
+    ``load_entries(source)`` returns ``(folder, filemap entries)``.
+    """
+    async with async_session() as db:
+        if await db.get(GlobalSetting, BACKFILL_SETTING) is None:
+            for source_column in ("source_id", str(ALL_SOURCES)):
+                await db.execute(text(
+                    "INSERT INTO stats_daily (day, source_id, runs, runs_failed, runs_cancelled, run_seconds,"
+                    " tracks_added, tracks_removed, files_added, files_removed, bytes_added, bytes_removed)"
+                    f" SELECT date(started_at), {source_column}, count(*), sum(status = 'failed'),"
+                    " sum(status = 'cancelled'),"
+                    " coalesce(sum(max(julianday(finished_at) - julianday(started_at), 0) * 86400), 0),"
+                    " coalesce(sum(tracks_added), 0), coalesce(sum(tracks_removed), 0), 0, 0, 0, 0"
+                    " FROM sync_runs WHERE id <= :watermark AND status != 'running'"
+                    " GROUP BY 1, 2"
+                    " ON CONFLICT (source_id, day) DO UPDATE SET"
+                    " runs = runs + excluded.runs, runs_failed = runs_failed + excluded.runs_failed,"
+                    " runs_cancelled = runs_cancelled + excluded.runs_cancelled,"
+                    " run_seconds = run_seconds + excluded.run_seconds,"
+                    " tracks_added = tracks_added + excluded.tracks_added,"
+                    " tracks_removed = tracks_removed + excluded.tracks_removed"
+                ), {"watermark": _watermark or 0})
+            db.add(GlobalSetting(key=BACKFILL_SETTING, value=_today().isoformat()))
+            await db.commit()
+            logger.info("Rolled up sync history into daily statistics")
+
+        indexed = set((await db.execute(select(LibraryTotal.source_id).distinct())).scalars().all())
+        sources = (await db.execute(select(Source))).scalars().all()
+    for source in sources:
+        if source.id not in indexed:
+            folder, entries = await asyncio.to_thread(load_entries, source)
+            await refresh_source(source.id, folder, entries, record=False)
+        await asyncio.sleep(0)
+
+
+# ── Queries ──────────────────────────────────────────────────────
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _buckets(start: date, end: date, bucket: str) -> list[date]:
+    out = []
+    current = bucket_start(start, bucket)
+    while current <= end:
+        out.append(current)
+        if bucket == "month":
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            current += timedelta(days=7 if bucket == "week" else 1)
+    return out
+
+
+_COUNTERS = (
+    "runs", "runs_failed", "runs_cancelled", "run_seconds", "tracks_added", "tracks_removed",
+    "files_added", "files_removed", "bytes_added", "bytes_removed",
+)
+
+
+async def get_stats(db: AsyncSession, bucket: str = "day", days: int = 90, source_id: int | None = None) -> dict:
+    """Library totals and time-bucketed series, read from the rollup tables only."""
+    today = _today()
+    start = bucket_start(today - timedelta(days=days - 1), bucket)
+    scope = ALL_SOURCES if source_id is None else source_id
+
+    totals_query = select(
+        LibraryTotal.format, func.sum(LibraryTotal.tracks), func.sum(LibraryTotal.bytes),
+    ).group_by(LibraryTotal.format).order_by(func.sum(LibraryTotal.bytes).desc())
+    if source_id is not None:
+        totals_query = totals_query.where(LibraryTotal.source_id == source_id)
+    formats = [
+        {"format": fmt, "tracks": tracks, "bytes": size}
+        for fmt, tracks, size in (await db.execute(totals_query)).all()
+        if tracks
+    ]
+    library_tracks = sum(f["tracks"] for f in formats)
+    library_bytes = sum(f["bytes"] for f in formats)
+
+    rows = (await db.execute(
+        select(DailyStats).where(DailyStats.source_id == scope, DailyStats.day >= start)
+    )).scalars().all()
+    by_bucket: dict[date, dict] = {b: dict.fromkeys(_COUNTERS, 0) for b in _buckets(start, today, bucket)}
+    for row in rows:
+        counters = by_bucket.setdefault(bucket_start(row.day, bucket), dict.fromkeys(_COUNTERS, 0))
+        for key in _COUNTERS:
+            counters[key] += getattr(row, key)
+
+    # Library size at the end of each bucket: today's totals minus the net
+    # change of every later bucket
+    series = []
+    tracks_after, bytes_after = library_tracks, library_bytes
+    for key in sorted(by_bucket, reverse=True):
+        counters = by_bucket[key]
+        series.append({
+            "bucket": key,
+            **counters,
+            "run_seconds": round(counters["run_seconds"], 1),
+            "failure_rate": round(counters["runs_failed"] / counters["runs"], 4) if counters["runs"] else None,
+            "library_tracks": tracks_after,
+            "library_bytes": bytes_after,
+        })
+        tracks_after -= counters["files_added"] - counters["files_removed"]
+        bytes_after -= counters["bytes_added"] - counters["bytes_removed"]
+    series.reverse()
+
+    sources = []
+    if source_id is None:
+        names = dict((await db.execute(select(Source.id, Source.name))).all())
+        library = {
+            sid: (tracks, size) for sid, tracks, size in (await db.execute(
+                select(LibraryTotal.source_id, func.sum(LibraryTotal.tracks), func.sum(LibraryTotal.bytes))
+                .group_by(LibraryTotal.source_id)
+            )).all()
+        }
+        activity = {
+            sid: (runs, failed) for sid, runs, failed in (await db.execute(
+                select(DailyStats.source_id, func.sum(DailyStats.runs), func.sum(DailyStats.runs_failed))
+                .where(DailyStats.day >= start, DailyStats.source_id != ALL_SOURCES)
+                .group_by(DailyStats.source_id)
+            )).all()
+        }
+        for sid, name in sorted(names.items(), key=lambda item: item[1].lower()):
+            tracks, size = library.get(sid, (0, 0))
+            runs, failed = activity.get(sid, (0, 0))
+            sources.append({
+                "source_id": sid, "name": name, "tracks": tracks, "bytes": size,
+                "runs": runs, "runs_failed": failed,
+                "failure_rate": round(failed / runs, 4) if runs else None,
+            })
+
+    since = await db.get(GlobalSetting, BACKFILL_SETTING)
+    shared = await db.get(GlobalSetting, SHARED_SETTING)
+    return {
+        "bucket": bucket,
+        "start": start,
+        "library": {
+            "tracks": library_tracks,
+            "bytes": library_bytes,
+            "tracking_since": since.value if since else None,
+        },
+        "formats": formats,
+        "shared": _shared_totals(shared),
+        "sources": sources,
+        "series": series,
+    }
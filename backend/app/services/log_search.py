@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import re
+from collections import deque
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.database import async_session
+from app.models.global_settings import GlobalSetting
+from app.models.sync_run import SyncRun
+
+logger = logging.getLogger(__name__)
+
+# One FTS5 row per log line. The rowid packs the run id and the line's index in
+# log_output (run_id << LINE_BITS | line), so a run's lines are a contiguous rowid
+# range: deleting or checking a run is a range lookup, and matches come back
+# grouped by run, newest run first, without joining anything.
+FTS_TABLE = "sync_log_fts"
+LINE_BITS = 20
+MAX_LINES = (1 << LINE_BITS) - 1
+BACKFILL_BATCH = 500
+BACKFILL_SETTING = "log_search_backfill_id"
+# Pages merged per maintenance pass; FTS5 keeps merging on later passes
+OPTIMIZE_MERGE_PAGES = 2000
+
+# highlight() markers; control characters never appear in scdl output
+_MARK_START, _MARK_END = "\x02", "\x03"
+_QUERY_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+available = False
+
+
+async def create_index(conn: AsyncConnection) -> None:
+    """Create the FTS5 table; search is disabled if SQLite lacks FTS5."""
+    global available
+    try:
+        await conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            "USING fts5(line, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        available = True
+    except OperationalError as e:
+        logger.warning("Sync log search disabled, SQLite has no FTS5: %s", e)
+
+
+def _rowid_range(run_id: int) -> tuple[int, int]:
+    return run_id << LINE_BITS, (run_id << LINE_BITS) | MAX_LINES
+
+
+def _line_rows(run_id: int, log_output: str) -> list[tuple[int, str]]:
+    base = run_id << LINE_BITS
+    return [
+        (base | i, line)
+        for i, line in enumerate(log_output.split("\n")[:MAX_LINES + 1])
+        if line.strip()
+    ]
+
+
+async def _insert_lines(db: AsyncSession, rows: list[tuple[int, str]]) -> None:
+    if rows:
+        conn = await db.connection()
+        await conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE} (rowid, line) VALUES (?, ?)", rows)
+
+
+async def index_run(db: AsyncSession, run_id: int, log_output: str | None) -> None:
+    """(Re)index a run's log lines in the caller's transaction."""
+    if not available:
+        return
+    lo, hi = _rowid_range(run_id)
+    await db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid BETWEEN :lo AND :hi"), {"lo": lo, "hi": hi})
+    if log_output:
+        await _insert_lines(db, _line_rows(run_id, log_output))
+
+
+async def remove_runs(db: AsyncSession, run_ids: list[int]) -> None:
+    """Drop the indexed lines of deleted runs, in the caller's transaction."""
+    if not available or not run_ids:
+        return
+    await db.execute(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid BETWEEN :lo AND :hi"),
+        [dict(zip(("lo", "hi"), _rowid_range(run_id))) for run_id in run_ids],
+    )
+
+
+async def backfill() -> int:
+    """Index runs that finished before log search existed, in small batches.
+
+    Progress is kept in a setting so an interrupted backfill continues where it
+    stopped; runs that are already indexed (finished live) are skipped.
+    """
+    if not available:
+        return 0
+    indexed = 0
+    async with async_session() as db:
+        row = await db.get(GlobalSetting, BACKFILL_SETTING)
+        cursor = int(row.value) if row and row.value else 0
+    while True:
+        async with async_session() as db:
+            result = await db.execute(
+                select(SyncRun.id, SyncRun.log_output)
+                .where(SyncRun.id > cursor, SyncRun.log_output.is_not(None))
+                .order_by(SyncRun.id)
+                .limit(BACKFILL_BATCH)
+            )
+            batch = result.all()
+            if not batch:
+                break
+            # Runs of this batch that were already indexed when they finished
+            done = set((await db.execute(
+                text(f"SELECT DISTINCT rowid >> {LINE_BITS} FROM {FTS_TABLE} WHERE rowid BETWEEN :lo AND :hi"),
+                {"lo": _rowid_range(batch[0][0])[0], "hi": _rowid_range(batch[-1][0])[1]},
+            )).scalars().all())
+            rows = []
+            for run_id, log_output in batch:
+                if run_id not in done:
+                    rows.extend(_line_rows(run_id, log_output))
+                    indexed += 1
+            await _insert_lines(db, rows)
+            cursor = batch[-1][0]
+            row = await db.get(GlobalSetting, BACKFILL_SETTING)
+            if row:
+                row.value = str(cursor)
+            else:
+                db.add(GlobalSetting(key=BACKFILL_SETTING, value=str(cursor)))
+            await db.commit()
+        # Give syncs and requests a turn between batches
+        await asyncio.sleep(0)
+    if indexed:
+        logger.info("Indexed the logs of %d earlier sync runs for search", indexed)
+    return indexed
+
+
+async def optimize_index(conn: AsyncConnection) -> None:
+    """Merge a bounded amount of the index's segments left by many small inserts."""
+    if available:
+        await conn.exec_driver_sql(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rank) VALUES ('merge', {OPTIMIZE_MERGE_PAGES})"
+        )
+
+
+def build_query(q: str) -> str | None:
+    """Turn user input into a safe FTS5 query.
+
+    Every word and "quoted phrase" must match (AND); a trailing ``*`` makes a
+    word a prefix. FTS5 operators and punctuation are taken literally.
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM_RE.findall(q):
+        prefix = False
+        if not phrase:
+            prefix = word.endswith("*")
+            phrase = word.rstrip("*")
+        if phrase.strip():
+            terms.append('"' + phrase.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms) or None
+
+
+def _parse_highlight(marked: str) -> tuple[str, list[tuple[int, int]]]:
+    """Split highlight() output into plain text and [start, end) offsets."""
+    out: list[str] = []
+    spans: list[tuple[int, int]] = []
+    length = 0
+    start = None
+    for part in re.split(f"([{_MARK_START}{_MARK_END}])", marked):
+        if part == _MARK_START:
+            start = length
+        elif part == _MARK_END:
+            if start is not None:
+                spans.append((start, length))
+            start = None
+        else:
+            out.append(part)
+            length += len(part)
+    return "".join(out), spans
+
+
+async def search(
+    db: AsyncSession,
+    q: str,
+    source_id: int | None = None,
+    status: str | None = None,
+    before: int | None = None,
+    limit: int = 20,
+    lines_per_run: int = 5,
+) -> tuple[list[dict], int | None]:
+    """Find runs whose log matches ``q``, newest first.
+
+    Returns ``([{"run_id", "match_count", "matches"}], next_before)``; pass
+    ``next_before`` as ``before`` for the next page. Matching lines are streamed
+    in rowid order and reading stops after ``limit`` runs, so the cost depends on
+    the page size rather than on how many runs match.
+    """
+    match = build_query(q)
+    if match is None:
+        raise ValueError("Search query is empty")
+    where = [f"{FTS_TABLE} MATCH :match"]
+    params: dict = {"match": match}
+    if before is not None:
+        where.append("rowid < :before")
+        params["before"] = before << LINE_BITS
+    if source_id is not None or status is not None:
+        conditions = []
+        if source_id is not None:
+            conditions.append("source_id = :source_id")
+            params["source_id"] = source_id
+        if status is not None:
+            conditions.append("status = :status")
+            params["status"] = status
+        where.append(f"(rowid >> {LINE_BITS}) IN (SELECT id FROM sync_runs WHERE {' AND '.join(conditions)})")
+    sql = (
+        f"SELECT rowid, highlight({FTS_TABLE}, 0, char(2), char(3)) FROM {FTS_TABLE} "
+        f"WHERE {' AND '.join(where)} ORDER BY rowid DESC"
+    )
+
+    groups: list[dict] = []
+    next_before = None
+    result = await db.stream(text(sql), params)
+    try:
+        async for rowid, marked in result:
+            run_id, line = rowid >> LINE_BITS, rowid & MAX_LINES
+            if not groups or groups[-1]["run_id"] != run_id:
+                if len(groups) == limit:
+                    next_before = groups[-1]["run_id"]
+                    break
+                # Lines arrive last-first; keeping the final N keeps the first N
+                groups.append({"run_id": run_id, "match_count": 0, "lines": deque(maxlen=lines_per_run)})
+            groups[-1]["match_count"] += 1
+            groups[-1]["lines"].append((line, marked))
+    finally:
+        await result.close()
+
+    for group in groups:
+        matches = []
+        for line, marked in reversed(group.pop("lines")):
+            plain, spans = _parse_highlight(marked)
+            matches.append({"line": line, "text": plain, "highlights": spans})
+        group["matches"] = matches
+    return groups, next_before
@@ -0,0 +1,321 @@
+import asyncio
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.database import async_session, engine
+from app.models.global_settings import GlobalSetting
+from app.models.sync_run import SyncRun
+from app.models.sync_trace import SyncTrace
+from app.services import log_search
+
+logger = logging.getLogger(__name__)
+
+# Retention defaults (days; 0 keeps forever). Nothing is deleted until the user
+# sets a policy; runs keep their counters after their log is dropped.
+DEFAULT_LOG_RETENTION_DAYS = 0
+DEFAULT_FAILED_LOG_RETENTION_DAYS = 0
+DEFAULT_RUN_RETENTION_DAYS = 0
+
+MAINTENANCE_INTERVAL_HOURS = 6
+STARTUP_DELAY_SECONDS = 300
+# Each batch is its own short write transaction; the pause between batches
+# lets a finishing sync commit without waiting behind maintenance.
+BATCH_SIZE = 500
+BATCH_PAUSE_SECONDS = 0.05
+VACUUM_PAGES_PER_STEP = 2000
+ANALYSIS_LIMIT = 1000
+REPORT_SETTING = "maintenance_last_report"
+
+_FINISHED = SyncRun.status != "running"
+
+
+@dataclass
+class RetentionPolicy:
+    log_days: int = DEFAULT_LOG_RETENTION_DAYS
+    failed_log_days: int = DEFAULT_FAILED_LOG_RETENTION_DAYS
+    run_days: int = DEFAULT_RUN_RETENTION_DAYS
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, str | None]) -> "RetentionPolicy":
+        def days(key: str, default: int) -> int:
+            value = settings.get(key)
+            return max(int(value), 0) if value else default
+
+        return cls(
+            log_days=days("history_log_retention_days", DEFAULT_LOG_RETENTION_DAYS),
+            failed_log_days=days("history_failed_log_retention_days", DEFAULT_FAILED_LOG_RETENTION_DAYS),
+            run_days=days("history_run_retention_days", DEFAULT_RUN_RETENTION_DAYS),
+        )
+
+
+@dataclass
+class MaintenanceReport:
+    started_at: str
+    duration_seconds: float = 0.0
+    logs_compacted: int = 0
+    log_bytes_removed: int = 0
+    runs_deleted: int = 0
+    reclaimed_bytes: int = 0
+    free_bytes: int = 0
+    database_bytes: int = 0
+    auto_vacuum: str = "none"
+    full_vacuum: bool = False
+    analyzed: bool = False
+    error: str | None = None
+
+
+def _cutoff(days: int) -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+
+
+@asynccontextmanager
+async def _autocommit() -> AsyncIterator[AsyncConnection]:
+    """A connection outside any transaction, for VACUUM and friends."""
+    async with engine.connect() as conn:
+        yield await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+
+async def _pragma(name: str) -> int:
+    async with engine.connect() as conn:
+        return (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+
+
+class DatabaseMaintenance:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._manual_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self.next_run_at: datetime | None = None
+        self.last_report: MaintenanceReport | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    async def start(self) -> None:
+        """Load the last report and start the periodic loop (called on startup)."""
+        async with async_session() as db:
+            row = await db.get(GlobalSetting, REPORT_SETTING)
+        if row and row.value:
+            try:
+                self.last_report = MaintenanceReport(**json.loads(row.value))
+            except (TypeError, ValueError):
+                pass
+        self._task = asyncio.create_task(self._loop())
+
+    def stop(self) -> None:
+        """Cancel the background loop (called on app shutdown)."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            self._task = None
+        self.next_run_at = None
+
+    async def _loop(self) -> None:
+        delay = STARTUP_DELAY_SECONDS
+        try:
+            while True:
+                self.next_run_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                await asyncio.sleep(delay)
+                delay = MAINTENANCE_INTERVAL_HOURS * 3600
+                if not self.is_running:
+                    await self._run_logged()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.next_run_at = None
+
+    async def _run_logged(self, full_vacuum: bool = False) -> None:
+        try:
+            await self.run(full_vacuum)
+        except Exception:
+            logger.exception("Database maintenance failed")
+
+    def start_run(self, full_vacuum: bool = False) -> None:
+        """Start a maintenance pass in the background (manual trigger)."""
+        if self.is_running:
+            raise RuntimeError("Database maintenance is already running")
+        self._manual_task = asyncio.create_task(self._run_logged(full_vacuum))
+
+    async def load_policy(self) -> RetentionPolicy:
+        async with async_session() as db:
+            rows = (await db.execute(select(GlobalSetting))).scalars().all()
+        return RetentionPolicy.from_settings({r.key: r.value for r in rows})
+
+    async def run(self, full_vacuum: bool = False) -> MaintenanceReport:
+        """One maintenance pass: apply retention, give back free pages, refresh statistics.
+
+        ``full_vacuum`` rebuilds the whole database file (and switches an older
+        database to incremental auto-vacuum). It blocks writers while it runs,
+        so callers only request it when no sync or library move is active.
+        """
+        if self.is_running:
+            raise RuntimeError("Database maintenance is already running")
+        async with self._lock:
+            start = time.perf_counter()
+            report = MaintenanceReport(started_at=datetime.now(timezone.utc).isoformat())
+            try:
+                policy = await self.load_policy()
+                size_before = await self._database_bytes()
+                await self._apply_retention(policy, report)
+                if full_vacuum:
+                    await self._full_vacuum()
+                    report.full_vacuum = True
+                else:
+                    await self._incremental_vacuum()
+                await self._analyze()
+                report.analyzed = True
+                report.database_bytes = await self._database_bytes()
+                report.reclaimed_bytes = max(size_before - report.database_bytes, 0)
+                report.free_bytes = await _pragma("freelist_count") * await _pragma("page_size")
+                report.auto_vacuum = {0: "none", 1: "full", 2: "incremental"}.get(
+                    await _pragma("auto_vacuum"), "none",
+                )
+            except Exception as e:
+                report.error = str(e)
+                raise
+            finally:
+                report.duration_seconds = round(time.perf_counter() - start, 2)
+                self.last_report = report
+                await self._save_report(report)
+            logger.info(
+                "Database maintenance: %d logs compacted (%.1f MB), %d runs deleted, "
+                "%.1f MB reclaimed, %.1f MB free in %.1fs",
+                report.logs_compacted, report.log_bytes_removed / 1e6, report.runs_deleted,
+                report.reclaimed_bytes / 1e6, report.free_bytes / 1e6, report.duration_seconds,
+            )
+            return report
+
+    # ── Retention ────────────────────────────────────────────────
+
+    async def _apply_retention(self, policy: RetentionPolicy, report: MaintenanceReport) -> None:
+        if policy.log_days:
+            await self._compact_logs(
+                SyncRun.status != "failed", _cutoff(policy.log_days), report,
+            )
+        if policy.failed_log_days:
+            await self._compact_logs(
+                SyncRun.status == "failed", _cutoff(policy.failed_log_days), report,
+            )
+        if policy.run_days:
+            # Failed runs are never deleted while their log is still kept
+            await self._delete_runs(SyncRun.status != "failed", _cutoff(policy.run_days), report)
+            if policy.failed_log_days:
+                failed_days = max(policy.run_days, policy.failed_log_days)
+                await self._delete_runs(SyncRun.status == "failed", _cutoff(failed_days), report)
+
+    async def _compact_logs(self, condition, cutoff: datetime, report: MaintenanceReport) -> None:
+        """Drop log output (and traces) of old runs, keeping their counters."""
+        while True:
+            async with async_session() as db:
+                # Served by the partial index over runs that still have a log
+                rows = (await db.execute(
+                    select(SyncRun.id, func.length(SyncRun.log_output))
+                    .where(SyncRun.log_output.is_not(None), SyncRun.started_at < cutoff, _FINISHED, condition)
+                    .order_by(SyncRun.started_at)
+                    .limit(BATCH_SIZE)
+                )).all()
+                if not rows:
+                    return
+                run_ids = [run_id for run_id, _ in rows]
+                await db.execute(update(SyncRun).where(SyncRun.id.in_(run_ids)).values(log_output=None))
+                await db.execute(delete(SyncTrace).where(SyncTrace.run_id.in_(run_ids)))
+                await log_search.remove_runs(db, run_ids)
+                await db.commit()
+            report.logs_compacted += len(rows)
+            report.log_bytes_removed += sum(length or 0 for _, length in rows)
+            await asyncio.sleep(BATCH_PAUSE_SECONDS)
+
+    async def _delete_runs(self, condition, cutoff: datetime, report: MaintenanceReport) -> None:
+        """Delete old runs outright; each source keeps its latest run for "last synced"."""
+        async with async_session() as db:
+            latest = select(func.max(SyncRun.id)).group_by(SyncRun.source_id)
+            keep = set((await db.execute(latest)).scalars().all())
+        while True:
+            async with async_session() as db:
+                # Run ids grow with start time, so the oldest runs are first in rowid order
+                run_ids = [
+                    run_id for run_id in (await db.execute(
+                        select(SyncRun.id)
+                        .where(SyncRun.started_at < cutoff, _FINISHED, condition, SyncRun.id.not_in(keep))
+                        .order_by(SyncRun.id)
+                        .limit(BATCH_SIZE)
+                    )).scalars().all()
+                ]
+                if not run_ids:
+                    return
+                await log_search.remove_runs(db, run_ids)
+                # sync_traces rows go with the run (ON DELETE CASCADE)
+                await db.execute(delete(SyncRun).where(SyncRun.id.in_(run_ids)))
+                await db.commit()
+            report.runs_deleted += len(run_ids)
+            await asyncio.sleep(BATCH_PAUSE_SECONDS)
+
+    # ── Storage ──────────────────────────────────────────────────
+
+    @staticmethod
+    async def _database_bytes() -> int:
+        return await _pragma("page_count") * await _pragma("page_size")
+
+    @staticmethod
+    async def _incremental_vacuum() -> None:
+        """Return free pages to the filesystem a few thousand pages at a time.
+
+        Only has an effect on databases in incremental auto-vacuum mode (new
+        databases, or older ones after a full vacuum); elsewhere freed pages
+        stay in the file and are reused by later writes.
+        """
+        if await _pragma("auto_vacuum") != 2:
+            return
+        async with _autocommit() as conn:
+            # sqlite3's execute() steps a statement once, which frees a single
+            # page; executescript() runs the pragma to completion
+            driver = (await conn.get_raw_connection()).driver_connection
+            while (await conn.exec_driver_sql("PRAGMA freelist_count")).scalar():
+                await driver.executescript(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})")
+                await asyncio.sleep(BATCH_PAUSE_SECONDS)
+            await conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    @staticmethod
+    async def _full_vacuum() -> None:
+        async with _autocommit() as conn:
+            await conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            await conn.exec_driver_sql("VACUUM")
+            await conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    @staticmethod
+    async def _analyze() -> None:
+        """Refresh planner statistics from a bounded sample of each index."""
+        async with _autocommit() as conn:
+            await conn.exec_driver_sql(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+            await conn.exec_driver_sql("ANALYZE")
+        async with engine.begin() as conn:
+            await log_search.optimize_index(conn)
+
+    @staticmethod
+    async def _save_report(report: MaintenanceReport) -> None:
+        async with async_session() as db:
+            value = json.dumps(asdict(report))
+            row = await db.get(GlobalSetting, REPORT_SETTING)
+            if row:
+                row.value = value
+            else:
+                db.add(GlobalSetting(key=REPORT_SETTING, value=value))
+            await db.commit()
+
+    def status(self) -> dict:
+        return {
+            "running": self.is_running,
+            "next_run_at": self.next_run_at,
+            "last_report": asdict(self.last_report) if self.last_report else None,
+        }
+
+
+db_maintenance = DatabaseMaintenance()
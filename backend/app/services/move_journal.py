@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import IO
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_NAME = "library-move.journal"
+
+# Move phases, in order. A resumed move restarts at the recorded phase.
+# "rewrite" only migrates legacy absolute filemaps; current ones are root-relative.
+PHASES = ["copy", "rewrite", "cleanup", "update_setting"]
+
+# Per-file records are flushed immediately but only fsynced this often, so a
+# power loss can cost at most a few seconds of copies (they are simply redone).
+FSYNC_INTERVAL = 2.0
+
+
+class MoveJournal:
+    """Append-only JSON-lines record of a library move, used to resume after a crash.
+
+    The first line describes the move (roots, sources, options); later lines record
+    phase changes and completed work. A torn last line (crash mid-write) is ignored.
+    The journal is deleted once the move completes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.old_root: Path | None = None
+        self.new_root: Path | None = None
+        self.source_ids: list[int] = []
+        self.same_fs: bool = False
+        self.verify_checksums: bool = False
+        self.phase: str = PHASES[0]
+        # Set when the move stopped on an error (rather than a crash or restart);
+        # such a move is only retried when the user starts it again
+        self.failed_error: str | None = None
+        # old file path → {"size", "mtime_ns", "src_mtime_ns", "digest"} of verified
+        # copies; "mtime_ns" is the copy's, "src_mtime_ns" the original's when copied
+        self.copied: dict[str, dict] = {}
+        self.renamed: set[int] = set()
+        self.rewritten: set[int] = set()
+        self._fh: IO[str] | None = None
+        self._last_sync = 0.0
+
+    @classmethod
+    def for_archives(cls, archives_root: Path) -> "MoveJournal":
+        return cls(archives_root / JOURNAL_NAME)
+
+    @classmethod
+    def load(cls, archives_root: Path) -> "MoveJournal | None":
+        """Return the journal of an interrupted move, or None if there is none."""
+        journal = cls.for_archives(archives_root)
+        try:
+            lines = journal.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return None
+        for line in lines:
+            try:
+                journal._apply(json.loads(line))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                logger.warning("Skipping unreadable move journal entry: %.80s", line)
+        if journal.old_root is None:
+            logger.warning("Move journal at %s has no header, discarding", journal.path)
+            journal.discard()
+            return None
+        return journal
+
+    def _apply(self, rec: dict) -> None:
+        kind = rec["type"]
+        if kind == "start":
+            self.old_root = Path(rec["old_root"])
+            self.new_root = Path(rec["new_root"])
+            self.source_ids = list(rec["source_ids"])
+            self.same_fs = bool(rec["same_fs"])
+            self.verify_checksums = bool(rec.get("verify_checksums"))
+        elif kind == "phase":
+            self.phase = rec["phase"]
+        elif kind == "failed":
+            self.failed_error = rec["error"]
+        elif kind == "resumed":
+            self.failed_error = None
+        elif kind == "copied":
+            self.copied[rec["src"]] = {
+                "size": rec["size"], "mtime_ns": rec["mtime_ns"],
+                "src_mtime_ns": rec.get("src_mtime_ns", rec["mtime_ns"]), "digest": rec.get("digest"),
+            }
+        elif kind == "renamed":
+            self.renamed.add(rec["source_id"])
+        elif kind == "rewritten":
+            self.rewritten.add(rec["source_id"])
+
+    def _write(self, rec: dict, sync: bool = False) -> None:
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._apply(rec)
+        self._fh.write(json.dumps(rec) + "\n")
+        self._fh.flush()
+        now = time.monotonic()
+        if sync or now - self._last_sync >= FSYNC_INTERVAL:
+            os.fsync(self._fh.fileno())
+            self._last_sync = now
+
+    def start(
+        self, old_root: Path, new_root: Path, source_ids: list[int],
+        same_fs: bool, verify_checksums: bool,
+    ) -> None:
+        """Begin a new journal, replacing any previous one."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+        self._write({
+            "type": "start",
+            "old_root": str(old_root),
+            "new_root": str(new_root),
+            "source_ids": source_ids,
+            "same_fs": same_fs,
+            "verify_checksums": verify_checksums,
+        }, sync=True)
+
+    def set_phase(self, phase: str) -> None:
+        self._write({"type": "phase", "phase": phase}, sync=True)
+
+    def record_failure(self, error: str) -> None:
+        self._write({"type": "failed", "error": error}, sync=True)
+
+    def record_resume(self) -> None:
+        self._write({"type": "resumed"}, sync=True)
+
+    def record_copy(
+        self, src: Path, size: int, mtime_ns: int, src_mtime_ns: int, digest: str | None,
+    ) -> None:
+        rec = {
+            "type": "copied", "src": str(src), "size": size,
+            "mtime_ns": mtime_ns, "src_mtime_ns": src_mtime_ns,
+        }
+        if digest:
+            rec["digest"] = digest
+        self._write(rec)
+
+    def record_rename(self, source_id: int) -> None:
+        self._write({"type": "renamed", "source_id": source_id}, sync=True)
+
+    def record_rewrite(self, source_id: int) -> None:
+        self._write({"type": "rewritten", "source_id": source_id}, sync=True)
+
+    def is_copied(self, src: Path, dst: Path) -> bool:
+        """True if ``src`` was copied in an earlier attempt and neither file changed since."""
+        rec = self.copied.get(str(src))
+        if rec is None:
+            return False
+        try:
+            st = dst.stat()
+            if not self.original_unchanged(src, src.stat()):
+                return False
+        except OSError:
+            return False
+        # copystat() gave the copy the source's mtime
+        return st.st_size == rec["size"] and st.st_mtime_ns == rec["mtime_ns"]
+
+    def original_unchanged(self, src: Path, st: os.stat_result) -> bool:
+        """True if ``src`` (with stat ``st``) was copied and not modified since."""
+        rec = self.copied.get(str(src))
+        return rec is not None and st.st_size == rec["size"] and st.st_mtime_ns == rec["src_mtime_ns"]
+
+    @property
+    def failed(self) -> bool:
+        return self.failed_error is not None
+
+    def phase_reached(self, phase: str) -> bool:
+        return PHASES.index(self.phase) >= PHASES.index(phase)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def discard(self) -> None:
+        """Delete the journal (the move completed or was abandoned)."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,487 @@
+import asyncio
+import cProfile
+import io
+import itertools
+import json
+import logging
+import marshal
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# A forgotten session must not keep profiling (and slowing down) the server for days
+MAX_PROFILE_SECONDS = 600
+SAMPLE_INTERVAL = 0.005
+# Finished profiles and memory snapshots are kept in memory; only the latest few
+MAX_PROFILES = 5
+MAX_SNAPSHOTS = 4
+TRACEMALLOC_FRAMES = 10
+# At the root of every traceback, so never the module responsible for an allocation
+_ENTRY_MODULES = {"app.serve"}
+
+
+# ── Sampling profiler (all threads, speedscope output) ───────────
+
+
+class SamplingProfiler:
+    """Samples the stacks of every thread with ``sys._current_frames()``.
+
+    Unlike cProfile it sees the scdl reader, copier and SQLAlchemy worker
+    threads, and its overhead doesn't depend on how many calls are made.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self._frames: dict[tuple[str, str, int], int] = {}
+        # thread id → (list of stacks as frame indexes, list of weights in seconds)
+        self._samples: dict[int, tuple[list[list[int]], list[float]]] = {}
+        self._thread_names: dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.duration = 0.0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _frame_index(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        index = self._frames.get(key)
+        if index is None:
+            index = self._frames[key] = len(self._frames)
+        return index
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        started = last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            weight, last = now - last, now
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_index(frame.f_code))
+                    frame = frame.f_back
+                stack.reverse()
+                samples, weights = self._samples.setdefault(ident, ([], []))
+                samples.append(stack)
+                weights.append(weight)
+                self._thread_names.setdefault(ident, names.get(ident, str(ident)))
+        self.duration = time.perf_counter() - started
+
+    def to_speedscope(self, name: str) -> dict:
+        """Return the samples in speedscope's file format, one profile per thread."""
+        frames = [
+            {"name": func, "file": filename, "line": line}
+            for (func, filename, line) in self._frames
+        ]
+        profiles = [
+            {
+                "type": "sampled",
+                "name": self._thread_names[ident],
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+            for ident, (samples, weights) in self._samples.items()
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "scdl-web",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+# ── Profile sessions ─────────────────────────────────────────────
+
+
+@dataclass
+class ProfileSession:
+    id: int
+    mode: str  # "cprofile" (event loop thread, pstats) or "sample" (all threads, speedscope)
+    started_at: datetime
+    duration: float | None = None
+    source_id: int | None = None
+    status: str = "running"  # running, finished
+    finished_at: datetime | None = None
+    summary: list[dict] = field(default_factory=list)
+    data: bytes | None = None
+    _profiler: cProfile.Profile | SamplingProfiler | None = None
+
+    @property
+    def filename(self) -> str:
+        stamp = self.started_at.strftime("%Y%m%d-%H%M%S")
+        ext = "pstats" if self.mode == "cprofile" else "speedscope.json"
+        return f"scdl-web-profile-{stamp}.{ext}"
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration": self.duration,
+            "source_id": self.source_id,
+            "filename": self.filename if self.data else None,
+            "summary": self.summary,
+        }
+
+
+def _pstats_summary(stats: pstats.Stats, limit: int = 30) -> list[dict]:
+    """Top functions by cumulative time."""
+    rows = []
+    for (filename, line, func), (cc, nc, tt, ct, _callers) in stats.stats.items():
+        rows.append({
+            "function": f"{func} ({Path(filename).name}:{line})",
+            "calls": nc,
+            "own_seconds": round(tt, 4),
+            "cumulative_seconds": round(ct, 4),
+        })
+    rows.sort(key=lambda r: r["cumulative_seconds"], reverse=True)
+    return rows[:limit]
+
+
+def _sample_summary(profiler: SamplingProfiler, limit: int = 30) -> list[dict]:
+    """Functions by the time they were on any sampled stack (inclusive) and on top of it."""
+    frames = list(profiler._frames)
+    inclusive: dict[int, float] = {}
+    own: dict[int, float] = {}
+    for samples, weights in profiler._samples.values():
+        for stack, weight in zip(samples, weights):
+            for index in set(stack):
+                inclusive[index] = inclusive.get(index, 0.0) + weight
+            if stack:
+                own[stack[-1]] = own.get(stack[-1], 0.0) + weight
+    rows = [
+        {
+            "function": f"{frames[i][0]} ({Path(frames[i][1]).name}:{frames[i][2]})",
+            "own_seconds": round(own.get(i, 0.0), 4),
+            "cumulative_seconds": round(seconds, 4),
+        }
+        for i, seconds in inclusive.items()
+    ]
+    rows.sort(key=lambda r: r["cumulative_seconds"], reverse=True)
+    return rows[:limit]
+
+
+class ProfileManager:
+    """Runs at most one profiling session at a time and keeps the latest results."""
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.sessions: deque[ProfileSession] = deque(maxlen=MAX_PROFILES)
+        self._current: ProfileSession | None = None
+        self._stop_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def current(self) -> ProfileSession | None:
+        return self._current
+
+    def get(self, session_id: int) -> ProfileSession | None:
+        return next((s for s in self.sessions if s.id == session_id), None)
+
+    def start(self, mode: str, duration: float | None, source_id: int | None = None) -> ProfileSession:
+        """Start profiling; must be called on the event loop thread.
+
+        cProfile only sees the thread it was enabled on, which here is the event
+        loop, where request handlers and the sync/WebSocket pipeline run.
+        """
+        if self._current:
+            raise RuntimeError("A profiling session is already running")
+        session = ProfileSession(
+            id=next(self._ids), mode=mode, started_at=datetime.now(timezone.utc),
+            duration=min(duration or MAX_PROFILE_SECONDS, MAX_PROFILE_SECONDS), source_id=source_id,
+        )
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:  # another profiler (e.g. a debugger) is active
+                raise RuntimeError(str(e)) from e
+        else:
+            profiler = SamplingProfiler()
+            profiler.start()
+        session._profiler = profiler
+        self._current = session
+        self.sessions.append(session)
+        self._stop_handle = asyncio.get_running_loop().call_later(session.duration, self.stop)
+        logger.info("Profiling started (%s, up to %.0fs)", mode, session.duration)
+        return session
+
+    def stop(self) -> ProfileSession | None:
+        session, self._current = self._current, None
+        if self._stop_handle:
+            self._stop_handle.cancel()
+            self._stop_handle = None
+        if session is None:
+            return None
+        profiler, session._profiler = session._profiler, None
+        session.finished_at = datetime.now(timezone.utc)
+        session.duration = round((session.finished_at - session.started_at).total_seconds(), 3)
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            profiler.create_stats()
+            # Same format as Profile.dump_stats, loadable by pstats/snakeviz
+            session.data = marshal.dumps(profiler.stats)
+            session.summary = _pstats_summary(pstats.Stats(profiler, stream=io.StringIO()))
+        elif isinstance(profiler, SamplingProfiler):
+            profiler.stop()
+            name = f"scdl-web {session.started_at:%Y-%m-%d %H:%M:%S}"
+            session.data = json.dumps(profiler.to_speedscope(name)).encode()
+            session.summary = _sample_summary(profiler)
+        session.status = "finished"
+        logger.info("Profiling stopped after %.1fs", session.duration)
+        return session
+
+    async def profile_sync(self, mode: str, source_id: int) -> ProfileSession:
+        """Profile one sync of ``source_id``: start it now and stop when it ends."""
+        from app.services.sync_manager import sync_manager
+
+        session = self.start(mode, None, source_id)
+        status = await sync_manager.start_sync(source_id)
+        task = sync_manager.active_tasks.get(source_id)
+        if status != "started" or task is None:
+            self.stop()
+            raise RuntimeError(f"Could not start a sync for source {source_id}: {status}")
+
+        def _done(_task: asyncio.Task) -> None:
+            if self._current is session:
+                self.stop()
+
+        task.add_done_callback(_done)
+        return session
+
+
+profile_manager = ProfileManager()
+
+
+# ── Memory snapshots (tracemalloc) ───────────────────────────────
+
+
+@dataclass
+class MemorySnapshot:
+    id: int
+    taken_at: datetime
+    snapshot: tracemalloc.Snapshot
+    traced_bytes: int
+    holders: dict[str, int]
+
+
+def _module_name(filename: str) -> str:
+    """Map a source file to a dotted module name, using the longest sys.path prefix."""
+    path = Path(filename)
+    best = None
+    for entry in sys.path:
+        try:
+            relative = path.relative_to(Path(entry or ".").resolve())
+        except (ValueError, OSError):
+            continue
+        if best is None or len(relative.parts) < len(best.parts):
+            best = relative
+    if best is None:
+        return filename
+    parts = list(best.with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts) or filename
+
+
+def _group_by_module(stats: list, attr: str = "size") -> tuple[dict[str, int], dict[str, int]]:
+    """Sum ``attr`` of traceback statistics per module.
+
+    Returns two groupings: by the module that made the allocation (often the
+    stdlib or a library), and by the innermost app module on the traceback,
+    i.e. the app code responsible for it.
+    """
+    modules: dict[str, int] = {}
+    app_modules: dict[str, int] = {}
+    cache: dict[str, str] = {}
+
+    def module_of(filename: str) -> str:
+        module = cache.get(filename)
+        if module is None:
+            module = cache[filename] = _module_name(filename)
+        return module
+
+    for stat in stats:
+        value = getattr(stat, attr)
+        # Frames are ordered from the oldest to the most recent call
+        names = [module_of(frame.filename) for frame in stat.traceback]
+        modules[names[-1]] = modules.get(names[-1], 0) + value
+        owner = next(
+            (n for n in reversed(names) if n.startswith("app.") and n not in _ENTRY_MODULES),
+            "(outside app)",
+        )
+        app_modules[owner] = app_modules.get(owner, 0) + value
+    return modules, app_modules
+
+
+def _top(totals: dict[str, int], key: str, limit: int) -> list[dict]:
+    ranked = sorted(totals.items(), key=lambda kv: abs(kv[1]), reverse=True)
+    return [{"module": module, key: value} for module, value in ranked[:limit] if value]
+
+
+def _location(stat) -> str:
+    frame = stat.traceback[-1]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def _deep_size(obj, budget: int = 200_000) -> int:
+    """Approximate memory held by ``obj``: builtin containers and app objects are
+    followed, anything else (WebSockets, tasks, library objects) is counted shallowly."""
+    seen: set[int] = set()
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < budget:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif type(item).__module__.startswith("app.") and hasattr(item, "__dict__"):
+            stack.append(item.__dict__)
+    return total
+
+
+def _holders() -> dict[str, int]:
+    """Bytes held by the long-lived in-memory structures of the services."""
+    from app.services.sync_manager import sync_manager
+    from app.ws.sync_progress import ws_manager
+
+    holders = {
+        "SyncManager._live": sync_manager._live,
+        "SyncManager.log_buffers": sync_manager.log_buffers,
+        "ws_manager.active_connections": ws_manager.active_connections,
+    }
+    # Lazily-loaded services are only measured if something already imported them
+    mover = sys.modules.get("app.services.library_mover")
+    if mover:
+        holders["LibraryMover.log_lines"] = mover.library_mover.log_lines
+    exporter = sys.modules.get("app.services.rekordbox_exporter")
+    if exporter:
+        holders["rekordbox_exporter._progress"] = exporter._progress
+    return {name: _deep_size(value) for name, value in holders.items()}
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots, summarized per module and diffable."""
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.snapshots: deque[MemorySnapshot] = deque(maxlen=MAX_SNAPSHOTS)
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def get(self, snapshot_id: int) -> MemorySnapshot | None:
+        return next((s for s in self.snapshots if s.id == snapshot_id), None)
+
+    def take_snapshot(self) -> tuple[MemorySnapshot, bool]:
+        """Take a snapshot, starting tracemalloc first if needed.
+
+        Only allocations made after tracing started are seen, so the first
+        snapshot after starting is mostly empty; take another one later and
+        diff them. Returns ``(snapshot, started)``.
+        """
+        with self._lock:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                logger.info("tracemalloc started (%d frames)", TRACEMALLOC_FRAMES)
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ])
+            traced, _peak = tracemalloc.get_traced_memory()
+            entry = MemorySnapshot(
+                id=next(self._ids), taken_at=datetime.now(timezone.utc),
+                snapshot=snapshot, traced_bytes=traced, holders=_holders(),
+            )
+            self.snapshots.append(entry)
+            return entry, started
+
+    def stop(self) -> None:
+        """Stop tracing and drop the snapshots; tracing slows every allocation down."""
+        with self._lock:
+            tracemalloc.stop()
+            self.snapshots.clear()
+
+    @staticmethod
+    def summary(entry: MemorySnapshot, limit: int = 30) -> dict:
+        modules, app_modules = _group_by_module(entry.snapshot.statistics("traceback"))
+        return {
+            "id": entry.id,
+            "taken_at": entry.taken_at.isoformat(),
+            "traced_bytes": entry.traced_bytes,
+            "holders": entry.holders,
+            "modules": _top(modules, "bytes", limit),
+            "app_modules": _top(app_modules, "bytes", limit),
+            "lines": [
+                {"location": _location(s), "bytes": s.size, "count": s.count}
+                for s in entry.snapshot.statistics("lineno")[:limit]
+            ],
+        }
+
+    @staticmethod
+    def diff(base: MemorySnapshot, target: MemorySnapshot, limit: int = 30) -> dict:
+        modules, app_modules = _group_by_module(
+            target.snapshot.compare_to(base.snapshot, "traceback"), "size_diff",
+        )
+        return {
+            "base": base.id,
+            "target": target.id,
+            "traced_bytes_diff": target.traced_bytes - base.traced_bytes,
+            "holders_diff": {
+                name: size - base.holders.get(name, 0) for name, size in target.holders.items()
+            },
+            "modules": _top(modules, "bytes_diff", limit),
+            "app_modules": _top(app_modules, "bytes_diff", limit),
+            "lines": [
+                {"location": _location(s), "bytes_diff": s.size_diff, "count_diff": s.count_diff}
+                for s in target.snapshot.compare_to(base.snapshot, "lineno")[:limit]
+            ],
+        }
+
+    @staticmethod
+    def dump(entry: MemorySnapshot) -> bytes:
+        """The snapshot in tracemalloc's own format (``tracemalloc.Snapshot.load``)."""
+        fd, path = tempfile.mkstemp(suffix=".tracemalloc")
+        os.close(fd)
+        try:
+            entry.snapshot.dump(path)
+            return Path(path).read_bytes()
+        finally:
+            os.unlink(path)
+
+
+memory_profiler = MemoryProfiler()
@@ -1,21 +1,92 @@
+import asyncio
+import json
 import logging
+import multiprocessing
 import os
 import subprocess
 import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
-from urllib.parse import unquote
 
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+from app import metrics
 from app.config import settings
 from app.database import async_session
+from app.models.audio_analysis import AudioAnalysis
 from app.models.global_settings import GlobalSetting
 from app.models.source import Source
-from app.schemas.rekordbox import RekordboxExportResult, RekordboxStatus
-from app.vendor.pyrekordbox.rbxml import RekordboxXml
+from app.models.sync_run import SyncRun
+from app.schemas.rekordbox import (
+    RekordboxBatchExportResult,
+    RekordboxExportResult,
+    RekordboxSourceExportResult,
+    RekordboxStatus,
+)
+from app.services import audio_analysis
+from app.vendor.pyrekordbox.rbxml import (
+    RekordboxXmlStream,
+    XmlStreamIndex,
+    encode_path,
+    normalize_location,
+)
 
 logger = logging.getLogger(__name__)
 
 AUDIO_EXTENSIONS = {".mp3", ".flac", ".opus", ".ogg", ".wav", ".m4a", ".aac", ".wma"}
 
+# Tag reads are I/O-bound (often on a NAS), so threads are enough. The window
+# bounds how many reads are in flight ahead of the XML insertion loop.
+METADATA_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+METADATA_WINDOW = METADATA_WORKERS * 4
+
+# Tempo/key analysis is CPU-bound NumPy work, so it runs in processes; one core
+# is left to the app. Results are saved as they arrive, in batches.
+ANALYSIS_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+ANALYSIS_SAVE_BATCH = 100
+
+# Rekordbox installations rarely appear or disappear, so the default-location
+# probes behind the status endpoint are only repeated every few minutes.
+DISCOVERY_TTL = 300.0
+
+_ws_manager = None
+# Analysis workers, started on first use and kept for later exports so each
+# one does not pay for spawning processes and re-importing NumPy
+_analysis_pool: ProcessPoolExecutor | None = None
+# source_id → {"phase", "current", "total"} for sources with an export in progress
+_progress: dict[int, dict] = {}
+# (path, size, mtime_ns) of the XML → (total_tracks, total_playlists)
+_status_cache: tuple[tuple[str, int, int], tuple[int, int]] | None = None
+# (monotonic time, paths) of the last discover_xml_paths() probe
+_discovery_cache: tuple[float, list[str]] | None = None
+
+
+def set_ws_manager(ws_manager) -> None:
+    global _ws_manager
+    _ws_manager = ws_manager
+
+
+def get_export_progress(source_id: int) -> dict | None:
+    """Return the live progress of a running export, or None if idle."""
+    return _progress.get(source_id)
+
+
+async def _report_progress(source_id: int, phase: str, current: int, total: int) -> None:
+    _progress[source_id] = {"phase": phase, "current": current, "total": total}
+    if _ws_manager:
+        await _ws_manager.broadcast(source_id, {
+            "type": "export_progress",
+            "phase": phase,
+            "current": current,
+            "total": total,
+        })
+
 
 def _get_data_dir() -> Path:
     """Derive data directory from the database URL (same dir as the SQLite file)."""
@@ -30,6 +101,7 @@ def _get_data_dir() -> Path:
 
 def discover_xml_paths() -> list[str]:
     """Scan default OS locations for existing rekordbox.xml files."""
+    global _discovery_cache
     candidates: list[str] = []
     if sys.platform == "win32":
         appdata = os.environ.get("APPDATA", "")
@@ -44,9 +116,17 @@ def discover_xml_paths() -> list[str]:
             p = home / "Library" / "Pioneer" / subdir / "rekordbox.xml"
             if p.exists():
                 candidates.append(str(p))
+    _discovery_cache = (time.monotonic(), candidates)
     return candidates
 
 
+def _cached_discover_xml_paths() -> list[str]:
+    """``discover_xml_paths()``, reusing the last probe for ``DISCOVERY_TTL`` seconds."""
+    if _discovery_cache and time.monotonic() - _discovery_cache[0] < DISCOVERY_TTL:
+        return list(_discovery_cache[1])
+    return discover_xml_paths()
+
+
 async def _get_or_auto_configure_xml_path() -> Path:
     """Resolve XML path; auto-detect Rekordbox installation and save if not yet configured."""
     async with async_session() as db:
@@ -58,7 +138,7 @@ async def _get_or_auto_configure_xml_path() -> Path:
     if custom:
         return Path(custom)
 
-    found = discover_xml_paths()
+    found = _cached_discover_xml_paths()
     if found:
         path = Path(found[0])
         async with async_session() as db:
@@ -75,14 +155,24 @@ async def _get_or_auto_configure_xml_path() -> Path:
 
 
 
-def _load_or_create_xml(xml_path: Path) -> "RekordboxXml":
-    """Load existing XML or create a new one. Recreate if corrupted."""
-    if xml_path.exists():
-        try:
-            return RekordboxXml(path=str(xml_path))
-        except Exception:
-            logger.warning("Corrupted Rekordbox XML at %s, recreating", xml_path)
-    return RekordboxXml(name="rekordbox", version="6.0.0", company="AlphaTheta")
+def _open_xml_stream(
+    xml_path: Path, playlist_names: list[str],
+) -> tuple[RekordboxXmlStream, XmlStreamIndex]:
+    """Scan the existing XML (or start a new one) without loading it into memory.
+
+    A corrupted file is moved aside to ``<name>.corrupt`` and a fresh database is
+    started, so the user's original data is never overwritten.
+    """
+    stream = RekordboxXmlStream(xml_path, name="rekordbox", version="6.0.0", company="AlphaTheta")
+    try:
+        return stream, stream.scan(playlists=playlist_names)
+    except Exception:
+        if not xml_path.exists():
+            raise
+        corrupt = xml_path.with_name(xml_path.name + ".corrupt")
+        logger.warning("Corrupted Rekordbox XML at %s, moved to %s and recreating", xml_path, corrupt)
+        os.replace(xml_path, corrupt)
+        return stream, stream.scan(playlists=playlist_names)
 
 
 def _read_metadata(path: Path) -> dict:
@@ -106,6 +196,170 @@ def _read_metadata(path: Path) -> dict:
     return meta
 
 
+async def _iter_metadata(files: list[Path]):
+    """Yield ``(path, meta)`` for each file, in order, as soon as its tags are read.
+
+    Reads run on a bounded thread pool with at most ``METADATA_WINDOW`` files in
+    flight, so the caller can insert finished tracks into the XML while the
+    remaining files are still being read.
+    """
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=METADATA_WORKERS, thread_name_prefix="rb-meta")
+    try:
+        window: deque[tuple[Path, asyncio.Future]] = deque()
+        for f in files:
+            window.append((f, loop.run_in_executor(pool, _read_metadata, f)))
+            if len(window) >= METADATA_WINDOW:
+                path, fut = window.popleft()
+                yield path, await fut
+        while window:
+            path, fut = window.popleft()
+            yield path, await fut
+    finally:
+        # Never block the event loop on reads still in flight when the
+        # consumer stops early: queued ones are dropped, running ones finish
+        # in the background
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _file_identities(files: list[Path]) -> dict[Path, tuple[str, int, int]]:
+    """Map each file to ``(file_id, size, mtime_ns)``; unreadable files are left out."""
+    identities = {}
+    for f in files:
+        try:
+            st = f.stat()
+        except OSError:
+            continue
+        identities[f] = (f"{st.st_dev}:{st.st_ino}", st.st_size, st.st_mtime_ns)
+    return identities
+
+
+async def _save_analysis(rows: list[dict]) -> None:
+    async with async_session() as db:
+        for row in rows:
+            stmt = insert(AudioAnalysis).values(**row)
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[AudioAnalysis.file_id],
+                set_={key: stmt.excluded[key] for key in ("size", "mtime_ns", "bpm", "key")},
+            ))
+        await db.commit()
+
+
+def _get_analysis_pool() -> ProcessPoolExecutor:
+    global _analysis_pool
+    if _analysis_pool is None:
+        # spawn: forking the server (event loop, DB threads) is not safe
+        _analysis_pool = ProcessPoolExecutor(
+            max_workers=ANALYSIS_WORKERS, mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _analysis_pool
+
+
+def shutdown_analysis_pool() -> None:
+    """Stop the analysis workers (app shutdown); queued analyses are dropped."""
+    global _analysis_pool
+    if _analysis_pool is not None:
+        _analysis_pool.shutdown(wait=False, cancel_futures=True)
+        _analysis_pool = None
+
+
+async def _analysis_enabled() -> bool:
+    """Off unless the ``rekordbox_analyze_audio`` setting is on, and unavailable
+    without NumPy and ffmpeg (the export then only uses BPM tags)."""
+    if not audio_analysis.is_available():
+        return False
+    async with async_session() as db:
+        row = await db.get(GlobalSetting, "rekordbox_analyze_audio")
+        return row is not None and row.value == "true"
+
+
+async def _analyze_tracks(source_id: int, files: list[Path]) -> dict[Path, tuple[float | None, str | None]]:
+    """Tempo and key of ``files``: cached estimates, the rest analyzed in a process pool.
+
+    Callers check ``_analysis_enabled()`` first.
+    """
+    if not files:
+        return {}
+
+    identities = await asyncio.to_thread(_file_identities, files)
+    cached: dict[str, AudioAnalysis] = {}
+    file_ids = [identity[0] for identity in identities.values()]
+    async with async_session() as db:
+        for i in range(0, len(file_ids), 500):
+            result = await db.execute(select(AudioAnalysis).where(AudioAnalysis.file_id.in_(file_ids[i:i + 500])))
+            cached.update((row.file_id, row) for row in result.scalars())
+
+    results: dict[Path, tuple[float | None, str | None]] = {}
+    todo = []
+    for f, (file_id, size, mtime_ns) in identities.items():
+        row = cached.get(file_id)
+        if row and row.size == size and row.mtime_ns == mtime_ns:
+            results[f] = (row.bpm, row.key)
+        else:
+            todo.append(f)
+    if not todo:
+        return results
+
+    ffmpeg = audio_analysis.find_ffmpeg()
+    loop = asyncio.get_running_loop()
+    futures: dict[asyncio.Future, Path] = {}
+
+    started = time.perf_counter()
+    pending: list[dict] = []
+    done = reported = 0
+    await _report_progress(source_id, "analyzing", 0, len(todo))
+    try:
+        pool = _get_analysis_pool()
+        for f in todo:
+            futures[loop.run_in_executor(pool, audio_analysis.analyze_file, str(f), ffmpeg)] = f
+        waiting = set(futures)
+        while waiting:
+            finished, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            for fut in finished:
+                f = futures[fut]
+                bpm, key = fut.result()
+                results[f] = (bpm, key)
+                file_id, size, mtime_ns = identities[f]
+                pending.append({"file_id": file_id, "size": size, "mtime_ns": mtime_ns, "bpm": bpm, "key": key})
+                done += 1
+            if len(pending) >= ANALYSIS_SAVE_BATCH or not waiting:
+                await _save_analysis(pending)
+                pending = []
+            if done - reported >= 10 or not waiting:
+                await _report_progress(source_id, "analyzing", done, len(todo))
+                reported = done
+    except Exception as e:
+        # A crashed worker (BrokenProcessPool) or a decoder error must not fail
+        # the export: the remaining tracks just keep their tag metadata
+        logger.warning(
+            "Audio analysis failed for source %d after %d of %d tracks, using tags only: %s",
+            source_id, done, len(todo), e,
+        )
+        if isinstance(e, BrokenProcessPool):
+            shutdown_analysis_pool()  # a broken pool takes no more work; start afresh next time
+        return results
+    finally:
+        # Drop the analyses still queued when the stage gives up or is cancelled,
+        # so the workers don't keep decoding for nothing
+        for fut in futures:
+            fut.cancel()
+    logger.info(
+        "Analyzed %d tracks for source %d in %.1fs (%d with a tempo)",
+        len(todo), source_id, time.perf_counter() - started,
+        sum(1 for f in todo if results[f][0] is not None),
+    )
+    return results
+
+
+def _scan_audio_files(folder: Path) -> dict[Path, str]:
+    """Return the sorted audio files under ``folder`` mapped to their normalized OS path."""
+    files = sorted(
+        f for f in folder.rglob("*")
+        if f.is_file() and f.suffix.lower() in AUDIO_EXTENSIONS
+    )
+    return {f: os.path.normpath(str(f.resolve())) for f in files}
+
+
 def _is_rekordbox_running() -> bool:
     """Return True if Rekordbox is currently running (best-effort, platform-specific)."""
     try:
@@ -136,145 +390,409 @@ async def _get_source(source_id: int) -> Source | None:
         return await db.get(Source, source_id)
 
 
-async def export_source(source_id: int) -> RekordboxExportResult:
-    """Export all audio files from a source to Rekordbox XML as a playlist.
+# ── Export watermark (last sync run reflected in the XML, per source) ────
 
-    - Auto-detects and saves the XML path on first use (no manual Settings step needed).
-    - Reads ID3 metadata (artist, title, album, BPM, genre) via mutagen.
-    - Non-destructive: existing playlist entries are preserved; only new tracks are appended.
+def _watermark_path(source_id: int) -> Path:
+    return Path(settings.archives_root) / f"source-{source_id}-rekordbox.json"
+
+
+def _load_watermark(source_id: int) -> dict | None:
+    path = _watermark_path(source_id)
+    if path.exists():
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            logger.warning("Corrupt export watermark at %s, ignoring", path)
+    return None
+
+
+def _save_watermark(source_id: int, run_id: int | None) -> None:
+    path = _watermark_path(source_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "run_id": run_id,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+    }), encoding="utf-8")
+
+
+async def _last_finished_run_id(source_id: int, before: int | None = None) -> int | None:
+    """Return the id of the source's latest finished sync run (optionally before a run).
+
+    Failed and cancelled runs count too: they can still have downloaded files.
     """
+    query = select(SyncRun.id).where(
+        SyncRun.source_id == source_id, SyncRun.status != "running",
+    )
+    if before is not None:
+        query = query.where(SyncRun.id < before)
+    async with async_session() as db:
+        result = await db.execute(query.order_by(SyncRun.id.desc()).limit(1))
+        return result.scalar_one_or_none()
+
+
+@dataclass
+class _SourceDelta:
+    """Files a sync run added to / removed from a source folder."""
+    run_id: int
+    added: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+
+    def merge(self, later: "_SourceDelta") -> "_SourceDelta":
+        return _SourceDelta(
+            run_id=later.run_id,
+            added=(self.added - later.removed) | later.added,
+            removed=(self.removed - later.added) | later.removed,
+        )
+
+
+@dataclass
+class _SourcePlan:
+    source: Source
+    files: dict[Path, str]  # sorted audio files → normalized OS path
+    removed: set[str] = field(default_factory=set)  # normalized OS paths to drop
+    run_id: int | None = None  # sync run the XML reflects once this plan is applied
+
+
+def _resolve_delta(delta: _SourceDelta) -> tuple[dict[Path, str], set[str]]:
+    files = sorted(
+        f for f in map(Path, delta.added)
+        if f.suffix.lower() in AUDIO_EXTENSIONS and f.is_file()
+    )
+    resolved = {f: os.path.normpath(str(f.resolve())) for f in files}
+    removed = {os.path.normpath(str(Path(p).resolve())) for p in delta.removed}
+    return resolved, removed
+
+
+async def _plan_source(
+    source_id: int, music_root: Path, delta: _SourceDelta | None = None,
+) -> _SourcePlan:
     source = await _get_source(source_id)
     if not source:
         raise FileNotFoundError(f"Source {source_id} not found")
 
-    music_root = await _get_music_root()
-    folder = music_root / source.local_folder
+    if delta is not None:
+        # Incremental export: only the files the sync touched, no folder walk
+        files, removed = await asyncio.to_thread(_resolve_delta, delta)
+        return _SourcePlan(source=source, files=files, removed=removed, run_id=delta.run_id)
 
+    run_id = await _last_finished_run_id(source_id)
+    folder = music_root / source.local_folder
     if not folder.exists():
         raise FileNotFoundError(f"Source folder does not exist: {folder}")
 
-    audio_files = sorted(
-        f for f in folder.rglob("*")
-        if f.is_file() and f.suffix.lower() in AUDIO_EXTENSIONS
-    )
-    if not audio_files:
+    await _report_progress(source_id, "scanning", 0, 0)
+    files = await asyncio.to_thread(_scan_audio_files, folder)
+    if not files:
         raise FileNotFoundError(f"No audio files found in {folder}")
-
-    xml_path = await _get_or_auto_configure_xml_path()
-    xml_path.parent.mkdir(parents=True, exist_ok=True)
-    xml = _load_or_create_xml(xml_path)
-    # pyrekordbox bug: _parse() doesn't initialize _last_id from existing tracks
-    # (only _init() does). Always sync it so add_track() doesn't collide.
-    xml._last_id = max(xml.get_track_ids(), default=0)
-
-    # Build OS-path → TrackID map for the existing collection.
-    # pyrekordbox's decode_path() URL-decodes and strips the file://localhost/ prefix.
-    # For previously-corrupt double-encoded entries (file://localhost/file://localhost/...
-    # with %2520), a second unquote() recovers the real path (e.g. %20 → space).
-    existing: dict[str, int] = {}
-    for t in xml.get_tracks():
-        try:
-            decoded = t.get("Location")  # decode_path output: OS path, may have %20 literals
-            normalized = os.path.normpath(unquote(decoded))  # second unquote heals %20→space
-            existing[normalized] = int(t.get("TrackID"))
-        except Exception:
-            pass
-
+    return _SourcePlan(source=source, files=files, run_id=run_id)
+
+
+async def _apply_source(
+    xml: RekordboxXmlStream,
+    index: XmlStreamIndex,
+    plan: _SourcePlan,
+    playlist_keys: dict[str, set[str]],
+) -> RekordboxExportResult:
+    """Add a source's new tracks and playlist entries to the pending XML changes."""
+    source, resolved = plan.source, plan.files
+    audio_files = list(resolved)
+    # OS-path → TrackID, built during the scan; keys are normalize_location() paths,
+    # which also heals double-encoded entries from older exports (%2520 → space).
+    # Files are looked up the same way add_track() indexes them.
+    existing = index.locations
+    keys = {f: normalize_location(encode_path(p)) for f, p in resolved.items()}
+
+    # Files deleted by the sync leave the collection and every playlist
+    removed_ids = xml.remove_tracks(sorted(plan.removed))
+
+    new_files = [f for f in audio_files if keys[f] not in existing]
+    tracks_skipped = len(audio_files) - len(new_files)
     tracks_added = 0
-    tracks_skipped = 0
-    all_track_ids: list[int] = []
 
-    for audio_file in audio_files:
-        os_path = os.path.normpath(str(audio_file.resolve()))
-        if os_path in existing:
-            all_track_ids.append(existing[os_path])
+    total = len(new_files)
+    done = 0
+    # Tracks without a BPM tag wait for the analysis; the rest go into the XML
+    # as their tags are read
+    untagged: list[tuple[Path, dict]] = []
+    analyze = await _analysis_enabled()
+
+    def add(audio_file: Path, meta: dict, bpm: float | None = None, key: str | None = None) -> None:
+        nonlocal tracks_added, tracks_skipped
+        try:
+            # Pass the raw OS path — pyrekordbox's encode_path() handles URI encoding
+            track = xml.add_track(resolved[audio_file])
+            for attr, val in [("Name", meta.get("Name")), ("Artist", meta.get("Artist")),
+                               ("Album", meta.get("Album")), ("Genre", meta.get("Genre")),
+                               ("AverageBpm", meta.get("Bpm") or (f"{bpm:.2f}" if bpm else None)),
+                               ("Tonality", key)]:
+                if val:
+                    track[attr] = val
+            tracks_added += 1
+        except Exception as e:
+            logger.warning("Failed to add track %s: %s", audio_file, e)
             tracks_skipped += 1
+
+    await _report_progress(source.id, "reading", done, total)
+    async for audio_file, meta in _iter_metadata(new_files):
+        if analyze and not meta.get("Bpm"):
+            untagged.append((audio_file, meta))
         else:
-            try:
-                meta = _read_metadata(audio_file)
-                # Pass the raw OS path — pyrekordbox's encode_path() handles URI encoding
-                track = xml.add_track(str(audio_file.resolve()))
-                for attr, val in [("Name", meta.get("Name")), ("Artist", meta.get("Artist")),
-                                   ("Album", meta.get("Album")), ("Genre", meta.get("Genre")),
-                                   ("AverageBpm", meta.get("Bpm"))]:
-                    if val:
-                        track[attr] = val
-                track_id = int(track.get("TrackID"))
-                existing[os_path] = track_id
-                all_track_ids.append(track_id)
-                tracks_added += 1
-            except Exception as e:
-                logger.warning("Failed to add track %s: %s", audio_file, e)
-                tracks_skipped += 1
+            add(audio_file, meta)
+        done += 1
+        if done % 25 == 0 or done == total:
+            await _report_progress(source.id, "reading", done, total)
+
+    if untagged:
+        # Only tracks without a BPM tag are decoded; uploads rarely carry one
+        analysis = await _analyze_tracks(source.id, [f for f, _ in untagged])
+        for audio_file, meta in untagged:
+            add(audio_file, meta, *analysis.get(audio_file, (None, None)))
 
-    # Non-destructive playlist update
+    all_track_ids = [existing[keys[f]] for f in audio_files if keys[f] in existing]
+
+    # Non-destructive playlist update: only keys missing from the top-level
+    # playlist are appended (the playlist is created if it doesn't exist yet).
     playlist_name = source.name
-    root_folder = xml.get_playlist()  # no args = root playlist folder
+    members = playlist_keys.setdefault(
+        playlist_name, set(str(k) for k in index.playlists.get(playlist_name, []))
+    )
+    members.difference_update(str(k) for k in removed_ids)
+    new_keys = [tid for tid in all_track_ids if str(tid) not in members]
+    members.update(str(k) for k in new_keys)
+    xml.add_playlist_tracks(playlist_name, new_keys, keytype="TrackID")
 
-    # Safe lookup: get_playlist(name) creates a spurious element when not found,
-    # so iterate direct children instead.
-    playlist_node = None
-    for p in root_folder.get_playlists():
+    return RekordboxExportResult(
+        tracks_added=tracks_added,
+        tracks_skipped=tracks_skipped,
+        playlist_updated=len(new_keys),
+        tracks_removed=len(removed_ids),
+        xml_path=str(xml.path),
+        playlist_name=playlist_name,
+        is_rekordbox_running=False,
+    )
+
+
+async def _export_batch(
+    requests: dict[int, _SourceDelta | None],
+) -> dict[int, RekordboxExportResult | Exception]:
+    """Export several sources with a single XML read and a single write.
+
+    ``requests`` maps each source to the sync delta to apply, or None for a full
+    export of the source folder.
+    """
+    results: dict[int, RekordboxExportResult | Exception] = {}
+    music_root = await _get_music_root()
+    started = time.perf_counter()
+
+    plans: list[_SourcePlan] = []
+    for source_id, delta in requests.items():
         try:
-            if p.name == playlist_name:
-                playlist_node = p
-                break
-        except ValueError:
-            pass  # skip unnamed spurious nodes
-
-    existing_playlist_ids: set[str] = set()
-    if playlist_node is None:
-        playlist_node = root_folder.add_playlist(playlist_name, keytype="TrackID")
-    else:
+            plans.append(await _plan_source(source_id, music_root, delta))
+        except Exception as e:
+            results[source_id] = e
+    if not plans:
+        return results
+
+    xml_path = await _get_or_auto_configure_xml_path()
+    xml_path.parent.mkdir(parents=True, exist_ok=True)
+    # Stream the XML instead of building the whole tree: real collections are 100+ MB.
+    names = [plan.source.name for plan in plans]
+    xml, index = await asyncio.to_thread(_open_xml_stream, xml_path, names)
+
+    playlist_keys: dict[str, set[str]] = {}
+    exported: dict[int, RekordboxExportResult] = {}
+    for plan in plans:
         try:
-            existing_playlist_ids = set(str(k) for k in playlist_node.get_tracks())
-        except Exception:
-            pass
+            exported[plan.source.id] = await _apply_source(xml, index, plan, playlist_keys)
+        except Exception as e:
+            logger.exception("Rekordbox export failed for source %d", plan.source.id)
+            results[plan.source.id] = e
+
+    changed = any(
+        r.tracks_added or r.tracks_removed or r.playlist_updated for r in exported.values()
+    )
+    if changed or not set(playlist_keys) <= index.playlist_names:
+        for source_id in exported:
+            await _report_progress(source_id, "saving", 0, 0)
+        await asyncio.to_thread(xml.save)
+
+    for plan in plans:
+        if plan.source.id in exported:
+            _save_watermark(plan.source.id, plan.run_id)
+
+    is_running = await asyncio.to_thread(_is_rekordbox_running)
+    for source_id, result in exported.items():
+        result.is_rekordbox_running = is_running
+        results[source_id] = result
+
+    mode = "delta" if all(requests[plan.source.id] is not None for plan in plans) else "full"
+    metrics.rekordbox_export_duration.observe(time.perf_counter() - started, mode=mode)
+    metrics.rekordbox_tracks.inc(sum(r.tracks_added for r in exported.values()), change="added")
+    metrics.rekordbox_tracks.inc(sum(r.tracks_removed for r in exported.values()), change="removed")
+    return results
+
+
+class _ExportQueue:
+    """Serializes Rekordbox XML writes and coalesces overlapping export requests.
+
+    Requests arriving while a batch is being written are merged into the next
+    batch, so N concurrent exports cost one XML read/write instead of N and can
+    never clobber each other's changes. Sync deltas for the same source are merged;
+    a full export request supersedes any pending delta.
+    """
 
-    playlist_updated = 0
-    for track_id in all_track_ids:
-        if str(track_id) not in existing_playlist_ids:
+    def __init__(self):
+        self._pending: dict[int, list[asyncio.Future]] = {}
+        self._requests: dict[int, _SourceDelta | None] = {}
+        self._worker: asyncio.Task | None = None
+
+    async def submit(
+        self, source_ids: list[int], deltas: dict[int, _SourceDelta] | None = None,
+    ) -> dict[int, RekordboxExportResult | Exception]:
+        loop = asyncio.get_running_loop()
+        futures: dict[int, asyncio.Future] = {}
+        for source_id in dict.fromkeys(source_ids):
+            delta = (deltas or {}).get(source_id)
+            if source_id in self._requests:
+                pending = self._requests[source_id]
+                delta = pending.merge(delta) if pending and delta else None
+            self._requests[source_id] = delta
+            fut = loop.create_future()
+            self._pending.setdefault(source_id, []).append(fut)
+            futures[source_id] = fut
+            if source_id not in _progress:
+                await _report_progress(source_id, "queued", 0, 0)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+        return {source_id: await fut for source_id, fut in futures.items()}
+
+    async def _drain(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending, {}
+            requests, self._requests = self._requests, {}
             try:
-                playlist_node.add_track(key=track_id)
-                playlist_updated += 1
+                results = await _export_batch(requests)
             except Exception as e:
-                logger.warning("Failed to add track %d to playlist: %s", track_id, e)
+                logger.exception("Rekordbox export batch failed")
+                results = {source_id: e for source_id in batch}
+            finally:
+                for source_id in batch:
+                    if source_id not in self._pending:
+                        _progress.pop(source_id, None)
+            for source_id, futures in batch.items():
+                for fut in futures:
+                    if not fut.done():
+                        fut.set_result(results.get(source_id))
 
-    xml.save(path=str(xml_path))
 
-    return RekordboxExportResult(
-        tracks_added=tracks_added,
-        tracks_skipped=tracks_skipped,
-        playlist_updated=playlist_updated,
+_export_queue = _ExportQueue()
+
+
+async def export_source(source_id: int) -> RekordboxExportResult:
+    """Export all audio files from a source to Rekordbox XML as a playlist.
+
+    - Auto-detects and saves the XML path on first use (no manual Settings step needed).
+    - Reads ID3 metadata (artist, title, album, BPM, genre) via mutagen, on a thread
+      pool so the event loop stays responsive; progress is broadcast to the source's
+      WebSocket channel as ``export_progress`` messages.
+    - Non-destructive: existing playlist entries are preserved; only new tracks are appended.
+    - Goes through the shared export queue, so concurrent exports are merged into one write.
+    """
+    result = (await _export_queue.submit([source_id]))[source_id]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+async def export_delta(
+    source_id: int, run_id: int, added: list[str], removed: list[str],
+) -> RekordboxExportResult | None:
+    """Apply the files added/removed by a sync run to the XML, without a folder walk.
+
+    The delta is only trusted if the source's export watermark is at the previous
+    finished run; otherwise some changes (for example the files of a failed or
+    cancelled run, which are not auto-exported) were never exported and a full
+    export runs instead. Returns None if there was nothing to do.
+    """
+    watermark = _load_watermark(source_id)
+    previous = await _last_finished_run_id(source_id, before=run_id)
+    if watermark is None or watermark.get("run_id") != previous:
+        logger.info("Rekordbox watermark for source %d is stale, running full export", source_id)
+        return await export_source(source_id)
+    if not added and not removed:
+        _save_watermark(source_id, run_id)
+        return None
+
+    delta = _SourceDelta(run_id=run_id, added=set(added), removed=set(removed))
+    result = (await _export_queue.submit([source_id], {source_id: delta}))[source_id]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+async def export_sources(source_ids: list[int] | None = None) -> RekordboxBatchExportResult:
+    """Export several sources (all sources if ``source_ids`` is None) in one XML write."""
+    if source_ids is None:
+        async with async_session() as db:
+            result = await db.execute(select(Source.id).order_by(Source.name))
+            source_ids = list(result.scalars().all())
+
+    results = await _export_queue.submit(source_ids) if source_ids else {}
+
+    out: list[RekordboxSourceExportResult] = []
+    for source_id in dict.fromkeys(source_ids):
+        result = results.get(source_id)
+        if isinstance(result, RekordboxExportResult):
+            out.append(RekordboxSourceExportResult(source_id=source_id, result=result))
+        else:
+            out.append(RekordboxSourceExportResult(
+                source_id=source_id, error=str(result) or repr(result),
+            ))
+    xml_path = await _get_or_auto_configure_xml_path()
+    return RekordboxBatchExportResult(
         xml_path=str(xml_path),
-        playlist_name=playlist_name,
-        is_rekordbox_running=_is_rekordbox_running(),
+        exported=sum(1 for r in out if r.result is not None),
+        failed=sum(1 for r in out if r.error is not None),
+        results=out,
     )
 
 
+def _read_xml_counts(xml_path: Path) -> tuple[bool, int, int]:
+    """Return (exists, total_tracks, total_playlists), cached by file size and mtime."""
+    global _status_cache
+    try:
+        st = xml_path.stat()
+    except OSError:
+        return False, 0, 0
+    key = (str(xml_path), st.st_size, st.st_mtime_ns)
+    if _status_cache and _status_cache[0] == key:
+        return True, *_status_cache[1]
+
+    try:
+        counts = RekordboxXmlStream(xml_path).summary()
+    except Exception:
+        logger.warning("Failed to read Rekordbox XML at %s", xml_path)
+        return True, 0, 0
+    _status_cache = (key, counts)
+    return True, *counts
+
+
 async def get_status() -> RekordboxStatus:
-    """Return the current status of the Rekordbox XML export."""
-    xml_path = await _get_or_auto_configure_xml_path()
-    total_tracks = 0
-    total_playlists = 0
+    """Return the current status of the Rekordbox XML export.
 
-    if xml_path.exists():
-        try:
-            xml = RekordboxXml(path=str(xml_path))
-            total_tracks = xml.num_tracks
-            root_folder = xml.get_playlist()  # no args = root playlist folder
-            total_playlists = sum(
-                1 for p in root_folder.get_playlists()
-                if p._element is not None and p._element.get("Name")
-            )
-        except Exception:
-            logger.warning("Failed to read Rekordbox XML at %s", xml_path)
+    The counts are streamed from the XML (no full parse) and cached until the
+    file's size or mtime changes.
+    """
+    xml_path = await _get_or_auto_configure_xml_path()
+    xml_exists, total_tracks, total_playlists = await asyncio.to_thread(_read_xml_counts, xml_path)
+    detected = await asyncio.to_thread(_cached_discover_xml_paths)
 
     return RekordboxStatus(
         platform=sys.platform,
-        xml_exists=xml_path.exists(),
+        xml_exists=xml_exists,
         xml_path=str(xml_path),
         total_tracks=total_tracks,
         total_playlists=total_playlists,
-        detected_paths=discover_xml_paths(),
+        detected_paths=detected,
+        analysis_available=audio_analysis.is_available(),
     )
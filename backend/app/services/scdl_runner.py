@@ -6,17 +6,36 @@ import re
 import subprocess
 import sys
 import threading
+import time
 from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from app import metrics
 from app.models.source import Source
+from app.services import transcode
+from app.services.sync_trace import POSTPROCESS_TID, TRACKS_TID, SyncTracer
+from app.services.track_store import share_profile, track_store
 
 logger = logging.getLogger(__name__)
 
 # Audio extensions that can be stored in the filemap (excludes thumbnails, etc.)
 _AUDIO_EXTS = {".mp3", ".flac", ".opus", ".m4a", ".ogg", ".wav"}
 
+# yt-dlp post-processor output (conversion, tagging, artwork) — marks the end of
+# a track's download and the start of its post-processing in the sync trace
+_POSTPROCESS_RE = re.compile(
+    r"^\[(ExtractAudio|Metadata|Mutagen|EmbedThumbnail|ThumbnailsConvertor|MoveFiles|Fixup\w+|FFmpeg\w*)\]"
+)
+
+# FLAC conversions run by the runner while scdl keeps downloading; queued
+# tracks beyond the workers wait as files on disk
+POSTPROCESS_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+POSTPROCESS_QUEUE_SIZE = 2 * POSTPROCESS_WORKERS
+
+# yt-dlp skipping a track listed in the download archive
+_ARCHIVED_RE = re.compile(r"^\[download\]\s+(\d+):.*has already been recorded in the archive")
+
 # Matches literal \uXXXX / \UXXXXXXXX sequences written by Windows Python when
 # stdout encoding falls back to ASCII (e.g. scdl subprocess without UTF-8 mode).
 _UNICODE_ESCAPE_RE = re.compile(r"\\u([0-9a-fA-F]{4})|\\U([0-9a-fA-F]{8})")
@@ -69,12 +88,22 @@ class SyncResult:
     tracks_added: int = 0
     tracks_removed: int = 0
     tracks_skipped: int = 0
+    # Audio files written by this run, and files scdl deleted during --sync
+    added_paths: list[str] = field(default_factory=list)
+    removed_paths: list[str] = field(default_factory=list)
+    # Tracks linked from another source's folder instead of downloaded
+    tracks_shared: int = 0
+    shared_bytes: int = 0
+    deduplicated_bytes: int = 0  # of those, hardlinked (not stored twice)
 
 
 class ScdlRunner:
     def __init__(self, music_root: str, archives_root: str):
         self.music_root = Path(music_root)
         self.archives_root = Path(archives_root)
+        # source_id → (share profile, ids of other sources' tracks added to its
+        # archive) for this sync; the profile is None when sharing is off
+        self._shared: dict[int, tuple[str | None, set[str]]] = {}
 
     # ── Path helpers ──────────────────────────────────────────────
 
@@ -87,12 +116,39 @@ class ScdlRunner:
     def _filemap_path(self, source_id: int) -> Path:
         return self.archives_root / f"source-{source_id}-filemap.json"
 
+    def _profiles_path(self, source_id: int) -> Path:
+        return self.archives_root / f"source-{source_id}-profiles.json"
+
     def get_music_folder(self, source: Source) -> Path:
         return self.music_root / source.local_folder
 
     # ── Filemap (track_id → filepath) ────────────────────────────
+    #
+    # Filemap and sync-file entries are stored relative to the source folder
+    # (music_root/local_folder), so moving the library or changing music_root
+    # needs no rewrite. Absolute entries written by older versions are still
+    # understood and are converted the next time the filemap is saved.
+
+    @staticmethod
+    def _relative_entry(folder: Path, filepath: str) -> str:
+        """Return ``filepath`` relative to ``folder``, or unchanged if it lies outside it."""
+        path = Path(filepath)
+        if not path.is_absolute():
+            return filepath
+        # scdl reports resolved paths, while music_root may contain symlinks
+        for base in (folder, folder.resolve()):
+            try:
+                return path.relative_to(base).as_posix()
+            except ValueError:
+                continue
+        return filepath
+
+    @staticmethod
+    def _resolve_entry(folder: Path, entry: str) -> str:
+        return entry if os.path.isabs(entry) else str(folder / entry)
 
     def _load_filemap(self, source_id: int) -> dict[str, str]:
+        """Raw filemap as stored (relative entries, possibly legacy absolute ones)."""
         path = self._filemap_path(source_id)
         if path.exists():
             try:
@@ -101,22 +157,93 @@ class ScdlRunner:
                 logger.warning("Corrupt filemap at %s, starting fresh", path)
         return {}
 
-    def _save_filemap(self, source_id: int, filemap: dict[str, str]) -> None:
+    def _load_profiles(self, source_id: int) -> dict[str, str]:
+        """Share profile (track_store.share_profile) of each track downloaded while sharing."""
+        path = self._profiles_path(source_id)
+        if path.exists():
+            try:
+                return json.loads(path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError):
+                logger.warning("Corrupt share profiles at %s, ignoring", path)
+        return {}
+
+    def _save_filemap(self, source_id: int, filemap: dict[str, str], profiles: dict[str, str] | None = None) -> None:
         path = self._filemap_path(source_id)
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_text(json.dumps(filemap, indent=2), encoding="utf-8")
+        # Profiles of tracks that left the filemap are dropped with them
+        if profiles is None:
+            profiles = self._load_profiles(source_id)
+        profiles = {tid: p for tid, p in profiles.items() if tid in filemap}
+        profiles_path = self._profiles_path(source_id)
+        if profiles or profiles_path.exists():
+            profiles_path.write_text(json.dumps(profiles), encoding="utf-8")
+        track_store.set_source(source_id, filemap, profiles)
+
+    def load_filemap(self, source_id: int, folder: Path) -> dict[str, str]:
+        """Return the filemap with every entry resolved to an absolute path under ``folder``."""
+        return {
+            tid: self._resolve_entry(folder, entry)
+            for tid, entry in self._load_filemap(source_id).items()
+        }
+
+    def save_filemap(
+        self, source_id: int, folder: Path, filemap: dict[str, str], profiles: dict[str, str] | None = None,
+    ) -> None:
+        """Store a filemap of absolute (or relative) paths relative to ``folder``."""
+        self._save_filemap(source_id, {
+            tid: self._relative_entry(folder, fp) for tid, fp in filemap.items()
+        }, profiles)
+
+    def migrate_filemap(self, source_id: int, folder: Path) -> int:
+        """Convert legacy absolute entries under ``folder`` to relative ones.
+
+        ``folder`` is where the entries currently point (e.g. the old location
+        before a library move). Returns the number of migrated entries; the file
+        is only written when there is something to migrate.
+        """
+        filemap = self._load_filemap(source_id)
+        relative = {tid: self._relative_entry(folder, fp) for tid, fp in filemap.items()}
+        migrated = sum(1 for tid, fp in filemap.items() if relative[tid] != fp)
+        if migrated:
+            self._save_filemap(source_id, relative)
+        return migrated
+
+    def refresh_track_store(self, folders: dict[int, Path]) -> None:
+        """Point the shared track store at the current sources (id → music folder)."""
+        track_store.refresh(folders, lambda sid: (self._load_filemap(sid), self._load_profiles(sid)))
+
+    def _load_sync_paths(self, source_id: int, folder: Path) -> set[str]:
+        """Return the (absolute) file paths listed in the scdl sync file."""
+        path = self._sync_file_path(source_id)
+        paths: set[str] = set()
+        try:
+            for line in path.read_text(encoding="utf-8").splitlines():
+                parts = line.strip().split(maxsplit=2)
+                if len(parts) == 3:
+                    paths.add(self._resolve_entry(folder, parts[2]))
+        except OSError:
+            pass
+        return paths
 
     # ── Pre-sync: regenerate archive files from disk ────────────
 
-    def prepare_sync_files(self, source_id: int) -> int:
+    def prepare_sync_files(self, source: Source, share_tracks: bool = False) -> int:
         """Regenerate archive and sync files from filemap.
 
         Only includes entries for files that exist on disk.  This makes
         the folder the source of truth: missing files are not archived,
         so scdl will re-download them.
 
+        With ``share_tracks``, tracks other sources downloaded with the same
+        share profile (format, naming and tag settings) are archived too (but
+        not put in the sync file, which scdl deletes from), so scdl skips them
+        and run_sync links them instead.
+
         Returns count of pruned (missing) filemap entries.
         """
+        source_id = source.id
+        folder = self.get_music_folder(source)
         filemap = self._load_filemap(source_id)
 
         archive_lines: list[str] = []
@@ -124,7 +251,8 @@ class ScdlRunner:
         live_filemap: dict[str, str] = {}
         pruned = 0
 
-        for track_id, filepath in filemap.items():
+        for track_id, entry in filemap.items():
+            filepath = self._resolve_entry(folder, entry)
             actual_path = filepath
             if not Path(filepath).exists():
                 # Legacy filemap entries may have \uXXXX escape sequences
@@ -135,9 +263,17 @@ class ScdlRunner:
                 else:
                     pruned += 1
                     continue
+            relative = self._relative_entry(folder, actual_path)
             archive_lines.append(f"soundcloud {track_id}")
-            sync_lines.append(f"soundcloud {track_id} {actual_path}")
-            live_filemap[track_id] = actual_path
+            # scdl runs with the source folder as working directory, so it
+            # resolves (and deletes) relative entries correctly
+            sync_lines.append(f"soundcloud {track_id} {relative}")
+            live_filemap[track_id] = relative
+
+        profile = share_profile(source) if share_tracks else None
+        shared = track_store.shared_ids(source_id, profile) - live_filemap.keys()
+        archive_lines.extend(f"soundcloud {track_id}" for track_id in shared)
+        self._shared[source_id] = (profile, shared)
 
         self.archives_root.mkdir(parents=True, exist_ok=True)
 
@@ -146,7 +282,7 @@ class ScdlRunner:
             "\n".join(archive_lines) + "\n" if archive_lines else "",
             encoding="utf-8",
         )
-        # Write sync file (scdl format: "soundcloud {id} /path/to/file")
+        # Write sync file (scdl format: "soundcloud {id} path/relative/to/folder")
         # Must use UTF-8: paths may contain Unicode chars (U+FF1A, etc.) that
         # the Windows default encoding (CP1252) cannot represent.
         self._sync_file_path(source_id).write_text(
@@ -154,8 +290,9 @@ class ScdlRunner:
             encoding="utf-8",
         )
 
-        if pruned > 0:
+        if live_filemap != filemap:
             self._save_filemap(source_id, live_filemap)
+        if pruned > 0:
             logger.info("Pruned %d missing entries from source %d", pruned, source_id)
 
         return pruned
@@ -168,14 +305,25 @@ class ScdlRunner:
             self._archive_path(source_id),
             self._sync_file_path(source_id),
             self._filemap_path(source_id),
+            self._profiles_path(source_id),
         ]:
             if path.exists():
                 path.unlink()
                 logger.info("Deleted %s", path)
+        track_store.remove_source(source_id)
 
     # ── Command building ─────────────────────────────────────────
 
-    def build_command(self, source: Source, auth_token: str | None = None) -> list[str]:
+    def build_command(
+        self, source: Source, auth_token: str | None = None, convert_flac: bool = True, album_tag: bool = True,
+    ) -> list[str]:
+        """Build the scdl command line.
+
+        With ``convert_flac=False`` a FLAC source is downloaded without
+        ``--flac``: scdl keeps (and tags) the original upload, and the caller
+        converts it. ``album_tag=False`` leaves out the playlist album tags,
+        which would tie a file to its source (for shared tracks).
+        """
         cmd = [_find_scdl(), "-l", source.url]
 
         type_flags: dict[str, list[str]] = {
@@ -187,17 +335,18 @@ class ScdlRunner:
         }
         cmd.extend(type_flags.get(source.source_type, []))
 
-        download_path = self.music_root / source.local_folder
+        # Absolute paths: scdl runs with the source folder as working directory
+        download_path = self.get_music_folder(source).absolute()
         cmd.extend(["--path", str(download_path)])
 
-        archive_file = self._archive_path(source.id)
-        sync_file = self._sync_file_path(source.id)
+        archive_file = self._archive_path(source.id).absolute()
+        sync_file = self._sync_file_path(source.id).absolute()
         cmd.extend(["--download-archive", str(archive_file)])
         cmd.extend(["--sync", str(sync_file)])
 
         format_flags: dict[str, list[str]] = {
             "mp3": ["--onlymp3"],
-            "flac": ["--flac"],
+            "flac": ["--flac"] if convert_flac else [],
             "opus": ["--opus"],
         }
         if source.audio_format in format_flags:
@@ -209,6 +358,8 @@ class ScdlRunner:
             cmd.append("--extract-artist")
         if source.name_format:
             cmd.extend(["--name-format", source.name_format])
+        if not album_tag:
+            cmd.append("--no-album-tag")
         if auth_token:
             cmd.extend(["--auth-token", auth_token])
 
@@ -223,15 +374,37 @@ class ScdlRunner:
         source: Source,
         auth_token: str | None,
         on_output: Callable[[str], Awaitable[None]],
+        tracer: SyncTracer | None = None,
     ) -> SyncResult:
-        cmd = self.build_command(source, auth_token)
+        """Run scdl for a source, streaming its output to ``on_output``.
 
-        download_path = self.music_root / source.local_folder
+        With a ``tracer``, the process spawn, time to first output and each
+        track's download and post-processing are recorded as trace spans.
+
+        FLAC sources are converted here rather than by scdl: it downloads and
+        tags the original upload, and a pool of workers fed by a bounded queue
+        converts each finished track while scdl downloads the next ones. A
+        track enters the filemap once it is converted.
+        """
+        # Without ffmpeg here, scdl converts (and fails the same way without it)
+        ffmpeg = transcode.find_ffmpeg() if source.audio_format == "flac" else None
+        profile, shared = self._shared.pop(source.id, (None, set()))
+        cmd = self.build_command(source, auth_token, convert_flac=ffmpeg is None, album_tag=profile is None)
+
+        download_path = self.get_music_folder(source)
         download_path.mkdir(parents=True, exist_ok=True)
         self.archives_root.mkdir(parents=True, exist_ok=True)
 
         # Load existing filemap to extend during sync
-        filemap = self._load_filemap(source.id)
+        filemap = self.load_filemap(source.id, download_path)
+        # scdl deletes tracks that left the source without logging them, so
+        # removals are found by diffing the sync file before and after the run.
+        synced_before = self._load_sync_paths(source.id, download_path)
+        written: dict[str, str] = {}  # track_id → audio file written by this run
+        fetched: set[str] = set()  # of those, files actually downloaded (not already on disk)
+        downloaded_ids: set[str] = set()  # track ids of the fetched files
+        archived: list[str] = []  # shared track ids scdl skipped
+        pending: dict[str, str] = {}  # track_id → original awaiting conversion
 
         # Run scdl in a thread so we work with any asyncio event loop type.
         # asyncio.create_subprocess_exec requires ProactorEventLoop on Windows,
@@ -245,25 +418,34 @@ class ScdlRunner:
         logger.debug("Launching scdl: %s", " ".join(str(c) for c in cmd))
 
         loop = asyncio.get_event_loop()
-        line_queue: asyncio.Queue[str | None] = asyncio.Queue()
+        # Lines are timestamped in the reader thread so trace spans don't include
+        # the time they spent waiting in the queue.
+        line_queue: asyncio.Queue[tuple[float, str] | None] = asyncio.Queue()
         return_code_holder: list[int] = [1]
+        exited_at: list[float] = [0.0]
 
         def _reader() -> None:
+            spawn_start = time.perf_counter()
             proc = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 env=env,
+                cwd=download_path,
             )
+            if tracer:
+                tracer.add("spawn scdl", spawn_start, time.perf_counter())
             assert proc.stdout is not None
             try:
                 for raw_line in proc.stdout:
                     line = raw_line.decode("utf-8", errors="replace").rstrip()
-                    loop.call_soon_threadsafe(line_queue.put_nowait, line)
+                    loop.call_soon_threadsafe(line_queue.put_nowait, (time.perf_counter(), line))
             finally:
                 return_code_holder[0] = proc.wait()
+                exited_at[0] = time.perf_counter()
                 loop.call_soon_threadsafe(line_queue.put_nowait, None)
 
+        spawned_at = time.perf_counter()
         _thread = threading.Thread(target=_reader, daemon=True)
         _thread.start()
 
@@ -271,46 +453,194 @@ class ScdlRunner:
         current_track_id: str | None = None
         track_id_re = re.compile(r"\[soundcloud\]\s+(\d+):")
         destination_re = re.compile(r"Destination:\s+(.+)$")
-
-        while True:
-            line = await line_queue.get()
-            if line is None:
-                break
-            lines.append(line)
-            await on_output(line)
-
-            # Track ID detection
-            m = track_id_re.search(line)
-            if m:
-                current_track_id = m.group(1)
-
-            # Filename detection — associate with current track ID.
-            # Only store audio files; thumbnails (.jpg/.png) also produce
-            # Destination: lines and must not overwrite the mp3 path.
-            m = destination_re.search(line)
-            if m and current_track_id:
-                dest = m.group(1)
-                if Path(dest).suffix.lower() in _AUDIO_EXTS:
-                    filemap[current_track_id] = dest
-
-            # Also capture "already downloaded" files (exist on disk but not in archive)
-            if "has already been downloaded" in line and current_track_id:
-                m = re.match(r"\[download\]\s+(.+?)\s+has already been downloaded", line)
+        # Trace state of the current track: [track_id, start, download start, post-process start]
+        track_span: list | None = None
+
+        def _end_track_span(end: float) -> None:
+            if tracer is None or track_span is None:
+                return
+            track_id, start, download_start, post_start = track_span
+            tracer.add(f"track {track_id}", start, end, tid=TRACKS_TID, cat="track", track_id=track_id)
+            if download_start is not None:
+                tracer.add("download", download_start, post_start or end, tid=TRACKS_TID, cat="download")
+            if post_start is not None:
+                tracer.add("post-process", post_start, end, tid=TRACKS_TID, cat="postprocess")
+
+        post_queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue(POSTPROCESS_QUEUE_SIZE)
+
+        async def _queue_conversion(track_id: str | None) -> None:
+            original = pending.pop(track_id, None) if track_id else None
+            if original:
+                # Waits while the workers are behind; scdl keeps downloading meanwhile
+                await post_queue.put((track_id, original))
+
+        async def _postprocess_worker() -> None:
+            while (item := await post_queue.get()) is not None:
+                track_id, original = item
+                start = time.perf_counter()
+                try:
+                    final = str(await asyncio.to_thread(transcode.to_flac, Path(original), ffmpeg))
+                    message = f"[FLAC] Converted {original}"
+                except Exception as e:
+                    logger.warning("Could not convert %s to FLAC: %s", original, e)
+                    final = original
+                    message = f"[FLAC] Could not convert {original}, keeping the original: {e}"
+                if tracer:
+                    tracer.add(
+                        f"convert {track_id}", start, time.perf_counter(),
+                        tid=POSTPROCESS_TID, cat="postprocess", track_id=track_id,
+                    )
+                filemap[track_id] = final
+                written[track_id] = final
+                if original in fetched:
+                    fetched.discard(original)
+                    fetched.add(final)
+                lines.append(message)
+                await on_output(message)
+
+        workers = [asyncio.create_task(_postprocess_worker()) for _ in range(POSTPROCESS_WORKERS if ffmpeg else 0)]
+        try:
+            while True:
+                item = await line_queue.get()
+                if item is None:
+                    break
+                ts, line = item
+                if not lines:
+                    metrics.scdl_first_output.observe(ts - spawned_at)
+                    if tracer:
+                        tracer.add("time to first output", spawned_at, ts)
+                lines.append(line)
+                await on_output(line)
+
+                # Track ID detection
+                m = track_id_re.search(line)
                 if m:
+                    if m.group(1) != current_track_id:
+                        # scdl is done with the previous track, post-processing included
+                        await _queue_conversion(current_track_id)
+                        _end_track_span(ts)
+                        track_span = [m.group(1), ts, None, None]
+                    current_track_id = m.group(1)
+                elif track_span is not None:
+                    if track_span[2] is None and "Destination:" in line:
+                        track_span[2] = ts
+                    elif track_span[3] is None and _POSTPROCESS_RE.match(line):
+                        track_span[3] = ts
+
+                # Filename detection — associate with current track ID.
+                # Only store audio files; thumbnails (.jpg/.png) also produce
+                # Destination: lines and must not overwrite the mp3 path.
+                m = destination_re.search(line)
+                if m and current_track_id:
                     dest = m.group(1)
-                    if Path(dest).suffix.lower() in _AUDIO_EXTS:
+                    if ffmpeg and transcode.needs_flac(dest):
+                        pending[current_track_id] = dest
+                        fetched.add(dest)
+                        downloaded_ids.add(current_track_id)
+                    elif Path(dest).suffix.lower() in _AUDIO_EXTS:
                         filemap[current_track_id] = dest
+                        written[current_track_id] = dest
+                        fetched.add(dest)
+                        downloaded_ids.add(current_track_id)
+
+                m = _ARCHIVED_RE.match(line)
+                if m and m.group(1) in shared:
+                    archived.append(m.group(1))
+
+                # Also capture "already downloaded" files (exist on disk but not in archive)
+                if "has already been downloaded" in line and current_track_id:
+                    m = re.match(r"\[download\]\s+(.+?)\s+has already been downloaded", line)
+                    if m:
+                        dest = m.group(1)
+                        if ffmpeg and transcode.needs_flac(dest):
+                            pending[current_track_id] = dest
+                        elif Path(dest).suffix.lower() in _AUDIO_EXTS:
+                            filemap[current_track_id] = dest
+                            written[current_track_id] = dest
+
+            # scdl has exited: convert the last track and wait for the workers
+            for track_id in list(pending):
+                await _queue_conversion(track_id)
+            for _ in workers:
+                await post_queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
 
         _thread.join(timeout=10)
         return_code = return_code_holder[0]
+        if tracer:
+            _end_track_span(exited_at[0] or time.perf_counter())
+            tracer.add("scdl", spawned_at, exited_at[0] or time.perf_counter(), return_code=return_code)
+
+        linked = None
+        if archived:
+            link_start = time.perf_counter()
+            linked = await asyncio.to_thread(
+                track_store.link_into, source.id, profile, download_path, list(dict.fromkeys(archived)),
+            )
+            filemap.update(linked.files)
+            written.update(linked.files)
+            if tracer:
+                tracer.add("link shared tracks", link_start, time.perf_counter(), tracks=len(linked.files))
+            messages = []
+            if linked.files:
+                messages.append(
+                    f"[dedup] {len(linked.files)} tracks taken from other sources instead of downloaded "
+                    f"({linked.hardlinked} hardlinked, {linked.copied} copied, {linked.bytes / 1e6:.1f} MB)"
+                )
+            if linked.missing:
+                messages.append(
+                    f"[dedup] {len(linked.missing)} tracks shared with other sources were not found "
+                    "on disk and will be downloaded on the next sync"
+                )
+            for message in messages:
+                lines.append(message)
+                await on_output(message)
+
+        # Tracks downloaded now are shareable only if made with the share profile;
+        # linked ones are identical to a file that was
+        profiles = self._load_profiles(source.id)
+        for track_id in downloaded_ids:
+            if profile:
+                profiles[track_id] = profile
+            else:
+                profiles.pop(track_id, None)
+        if linked:
+            profiles.update(dict.fromkeys(linked.files, profile))
 
         # Persist updated filemap
-        self._save_filemap(source.id, filemap)
+        save_start = time.perf_counter()
+        self.save_filemap(source.id, download_path, filemap, profiles)
+        if tracer:
+            tracer.add("save filemap", save_start, time.perf_counter(), entries=len(filemap))
 
         added = sum(1 for l in lines if "Destination:" in l)
         skipped = sum(1 for l in lines if "has already been recorded in the archive" in l
                       or "has already been downloaded" in l)
         removed = sum(1 for l in lines if "Removing" in l)
+        if linked:
+            added += len(linked.files)
+            skipped -= len(linked.files)
+        removed_paths = sorted(
+            p for p in synced_before - self._load_sync_paths(source.id, download_path)
+            if not Path(p).exists()
+        )
+
+        metrics.scdl_tracks.inc(added, result="added")
+        metrics.scdl_tracks.inc(removed, result="removed")
+        metrics.scdl_tracks.inc(skipped, result="skipped")
+        downloaded = 0
+        for path in fetched:
+            try:
+                downloaded += os.path.getsize(path)
+            except OSError:
+                pass
+        metrics.scdl_downloaded_bytes.inc(downloaded)
+        if linked:
+            metrics.scdl_tracks.inc(len(linked.files), result="shared")
+            metrics.scdl_shared_bytes.inc(linked.bytes)
 
         return SyncResult(
             success=return_code == 0,
@@ -319,4 +649,9 @@ class ScdlRunner:
             tracks_added=added,
             tracks_removed=removed,
             tracks_skipped=skipped,
+            added_paths=list(dict.fromkeys(written.values())),
+            removed_paths=removed_paths,
+            tracks_shared=len(linked.files) if linked else 0,
+            shared_bytes=linked.bytes if linked else 0,
+            deduplicated_bytes=linked.hardlinked_bytes if linked else 0,
         )
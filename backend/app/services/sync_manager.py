@@ -1,6 +1,8 @@
 import asyncio
+import json
 import logging
 import re
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -9,11 +11,15 @@ from sqlalchemy import select
 
 logger = logging.getLogger(__name__)
 
+from app import metrics
 from app.database import async_session
 from app.models.global_settings import GlobalSetting
 from app.models.source import Source
 from app.models.sync_run import SyncRun
+from app.models.sync_trace import SyncTrace
+from app.services import library_stats, log_search
 from app.services.scdl_runner import ScdlRunner
+from app.services.sync_trace import SyncTracer
 from app.config import settings
 
 
@@ -36,6 +42,10 @@ class SyncManager:
         self._semaphore = asyncio.Semaphore(self._max_concurrent)
         self._runner = ScdlRunner(settings.music_root, settings.archives_root)
         self._ws_manager = None
+        # Post-sync Rekordbox exports run detached so they don't hold a sync slot
+        self._export_tasks: set[asyncio.Task] = set()
+        metrics.syncs_running.set_function(lambda: len(self.active_tasks) - len(self.queued_sources))
+        metrics.syncs_queued.set_function(lambda: len(self.queued_sources))
 
     @property
     def runner(self) -> ScdlRunner:
@@ -124,6 +134,7 @@ class SyncManager:
     async def _run_sync(self, source_id: int):
         # Mark as queued while waiting for semaphore
         self.queued_sources.append(source_id)
+        queued_at = time.monotonic()
         if self._ws_manager:
             await self._ws_manager.broadcast(source_id, {
                 "type": "status",
@@ -135,6 +146,7 @@ class SyncManager:
                 # Transition from queued to running
                 if source_id in self.queued_sources:
                     self.queued_sources.remove(source_id)
+                metrics.sync_queue_wait.observe(time.monotonic() - queued_at)
 
                 await self._do_sync(source_id)
         except asyncio.CancelledError:
@@ -153,6 +165,8 @@ class SyncManager:
             self.log_buffers.pop(source_id, None)
 
     async def _do_sync(self, source_id: int):
+        tracer = SyncTracer()
+        setup_start = time.perf_counter()
         async with async_session() as db:
             source = await db.get(Source, source_id)
             if not source:
@@ -168,11 +182,21 @@ class SyncManager:
             current_music_root = music_root_row.value if music_root_row and music_root_row.value else settings.music_root
             self._runner.music_root = Path(current_music_root)
 
+            share_row = await db.get(GlobalSetting, "share_tracks_across_sources")
+            share_tracks = share_row is not None and share_row.value == "true"
+            if share_tracks:
+                folders = {
+                    sid: self._runner.music_root / local_folder
+                    for sid, local_folder in (await db.execute(select(Source.id, Source.local_folder))).all()
+                }
+
             # Create sync run
             run = SyncRun(source_id=source_id, status="running")
             db.add(run)
             await db.commit()
             await db.refresh(run)
+            run_started = time.monotonic()
+            tracer.add("db setup", setup_start, time.perf_counter())
 
             # Reset live state for this sync (clears previous run's data)
             self._live[source_id] = SyncLiveState(status="running")
@@ -221,11 +245,15 @@ class SyncManager:
                             "total": total_items,
                         })
 
+            written: list[str] = []
             try:
                 # Pre-sync: regenerate archive/sync files from disk state.
                 # Inside the try block so any exception (e.g. encoding error)
                 # is caught and the source is properly marked as failed.
-                pruned = self._runner.prepare_sync_files(source.id)
+                with tracer.span("prepare sync files"):
+                    if share_tracks:
+                        await asyncio.to_thread(self._runner.refresh_track_store, folders)
+                    pruned = self._runner.prepare_sync_files(source, share_tracks)
                 if pruned > 0:
                     prune_msg = f"[pre-sync] {pruned} missing files will be re-downloaded"
                     self.log_buffers.setdefault(source_id, []).append(prune_msg)
@@ -242,7 +270,9 @@ class SyncManager:
                         "status": "running",
                     })
 
-                result = await self._runner.run_sync(source, auth_token, on_output)
+                with tracer.span("run scdl"):
+                    result = await self._runner.run_sync(source, auth_token, on_output, tracer)
+                written = result.added_paths
 
                 run.status = "completed" if result.success else "failed"
                 run.finished_at = datetime.now(timezone.utc)
@@ -253,7 +283,13 @@ class SyncManager:
                 if not result.success:
                     run.error_message = f"Process exited with code {result.return_code}"
 
-                await db.commit()
+                with tracer.span("commit"):
+                    await log_search.index_run(db, run.id, result.output)
+                    if result.tracks_shared:
+                        await library_stats.record_shared(
+                            db, result.tracks_shared, result.shared_bytes, result.deduplicated_bytes,
+                        )
+                    await db.commit()
 
                 # Update live state with final result
                 self._live[source_id].status = run.status
@@ -277,6 +313,15 @@ class SyncManager:
                         msg["error"] = run.error_message
                     await self._ws_manager.broadcast(source_id, msg)
 
+                if result.success:
+                    auto_export_row = await db.get(GlobalSetting, "rekordbox_auto_export")
+                    if auto_export_row and auto_export_row.value == "true":
+                        task = asyncio.create_task(self._auto_export(
+                            source_id, run.id, result.added_paths, result.removed_paths,
+                        ))
+                        self._export_tasks.add(task)
+                        task.add_done_callback(self._export_tasks.discard)
+
             except asyncio.CancelledError:
                 run.status = "cancelled"
                 run.finished_at = datetime.now(timezone.utc)
@@ -303,9 +348,50 @@ class SyncManager:
                         "error": error_msg,
                     })
             finally:
+                metrics.sync_duration.observe(time.monotonic() - run_started, status=run.status)
+                metrics.syncs_total.inc(status=run.status)
+                await self._save_trace(run.id, source.name, tracer)
+                await self._update_stats(db, run, source, written)
                 self.active_tasks.pop(source_id, None)
                 self.log_buffers.pop(source_id, None)
                 # _live[source_id] intentionally kept so polling can read final state
 
+    @staticmethod
+    async def _save_trace(run_id: int, source_name: str, tracer: SyncTracer) -> None:
+        """Store the run's spans as Chrome trace JSON; a failure only loses the trace."""
+        try:
+            trace_json = json.dumps(tracer.to_chrome(f"Sync run #{run_id} ({source_name})"))
+            async with async_session() as db:
+                db.add(SyncTrace(run_id=run_id, trace_json=trace_json))
+                await db.commit()
+        except Exception as e:
+            logger.warning("Could not save trace for sync run %d: %s", run_id, e)
+
+    async def _update_stats(self, db, run: SyncRun, source: Source, written: list[str]) -> None:
+        """Roll the run and the source's file changes into the statistics; a failure only skews them."""
+        try:
+            await library_stats.record_run(db, run)
+            await db.commit()
+            folder = self._runner.get_music_folder(source)
+            filemap = await asyncio.to_thread(self._runner.load_filemap, source.id, folder)
+            await library_stats.refresh_source(source.id, folder, filemap.values(), written)
+        except Exception as e:
+            logger.warning("Could not update statistics for sync run %d: %s", run.id, e)
+
+    async def _auto_export(
+        self, source_id: int, run_id: int, added: list[str], removed: list[str],
+    ) -> None:
+        from app.services.rekordbox_exporter import export_delta
+        try:
+            result = await export_delta(source_id, run_id, added, removed)
+        except Exception as e:
+            logger.warning("Auto-export to Rekordbox failed for source %d: %s", source_id, e)
+            return
+        if result:
+            logger.info(
+                "Auto-exported source %d to Rekordbox: %d added, %d removed",
+                source_id, result.tracks_added, result.tracks_removed,
+            )
+
 
 sync_manager = SyncManager()
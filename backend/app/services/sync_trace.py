@@ -0,0 +1,67 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# A run with thousands of tracks stays well below this; it only guards the DB
+# row against runaway output.
+MAX_EVENTS = 50_000
+
+# Chrome trace "threads" used to lay the timeline out in rows
+PHASES_TID = 1
+TRACKS_TID = 2
+POSTPROCESS_TID = 3
+_THREAD_NAMES = {PHASES_TID: "Sync phases", TRACKS_TID: "Tracks", POSTPROCESS_TID: "Post-processing"}
+
+
+class SyncTracer:
+    """Collects lightweight timing spans for one sync run.
+
+    Spans are stored as Chrome trace "complete" events (microseconds relative
+    to the start of the run), so ``to_chrome()`` loads directly in
+    chrome://tracing or Perfetto. Recording is a list append, cheap enough to
+    leave on for every run; it may also be called from the scdl reader thread.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.events: list[dict] = []
+
+    def add(
+        self, name: str, start: float, end: float,
+        tid: int = PHASES_TID, cat: str = "sync", **args,
+    ) -> None:
+        """Record a span between two ``time.perf_counter()`` timestamps."""
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6),
+            "dur": max(round((end - start) * 1e6), 0),
+            "pid": 1,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            if len(self.events) < MAX_EVENTS:
+                self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, tid: int = PHASES_TID, cat: str = "sync", **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter(), tid=tid, cat=cat, **args)
+
+    def to_chrome(self, process_name: str) -> dict:
+        """Return the trace in Chrome's JSON object format."""
+        metadata = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": process_name}}]
+        metadata += [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+            for tid, name in _THREAD_NAMES.items()
+        ]
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e["ts"])
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
@@ -0,0 +1,187 @@
+import errno
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.services.file_copy import copy_file
+
+logger = logging.getLogger(__name__)
+
+# Formats whose files are interchangeable between sources; other settings
+# (original format) can't be matched to an extension before downloading
+SHAREABLE_FORMATS = {"mp3": ".mp3", "flac": ".flac", "opus": ".opus"}
+
+# os.link failures that mean "not here" rather than a real error
+_NO_HARDLINK_ERRNOS = {
+    errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOSYS, errno.EOPNOTSUPP,
+    getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+}
+
+
+def share_profile(source) -> str | None:
+    """Key of the settings that shape a downloaded file, or None if it can't be shared.
+
+    Two sources only get identical files for a track (name, tags and cover) when
+    these match; scdl names playlist tracks with its playlist name format. Shared
+    downloads are made without the per-playlist album tag (``--no-album-tag``).
+    """
+    if source.audio_format not in SHAREABLE_FORMATS:
+        return None
+    return json.dumps([
+        source.audio_format,
+        source.name_format or "",
+        bool(source.original_art),
+        bool(source.extract_artist),
+        source.source_type == "playlist",
+    ])
+
+
+@dataclass
+class LinkResult:
+    # track_id → audio file now in the source folder
+    files: dict[str, str] = field(default_factory=dict)
+    hardlinked: int = 0
+    copied: int = 0
+    bytes: int = 0  # size of the linked tracks: what was not downloaded
+    hardlinked_bytes: int = 0  # of those, disk space not used twice
+    missing: list[str] = field(default_factory=list)  # shared ids with no usable file left
+
+
+class TrackStore:
+    """Global track id → file index over the filemaps of all sources.
+
+    Tracks another source already has, downloaded with the same share profile,
+    are added to a source's download archive, so scdl skips them; the ones it
+    reports as skipped are then hardlinked (or copied, across devices) into the
+    source folder from the other source instead of being downloaded again.
+    Only tracks with a recorded profile are shared: files downloaded with
+    album tags or other settings stay with their source.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._folders: dict[int, Path] = {}
+        self._entries: dict[int, dict[str, str]] = {}  # source_id → filemap (raw entries)
+        self._profiles: dict[int, dict[str, str]] = {}  # source_id → track_id → share profile
+        self._owners: dict[str, set[int]] = defaultdict(set)  # track_id → source ids
+
+    def refresh(
+        self,
+        folders: dict[int, Path],
+        load_source: Callable[[int], tuple[dict[str, str], dict[str, str]]],
+    ) -> None:
+        """Track the current sources: load (filemap, profiles) of new ones, forget deleted ones."""
+        with self._lock:
+            self._folders = dict(folders)
+            known = set(self._entries)
+        for source_id in known - folders.keys():
+            self.remove_source(source_id)
+        for source_id in folders.keys() - known:
+            self.set_source(source_id, *load_source(source_id))
+
+    def set_source(self, source_id: int, filemap: dict[str, str], profiles: dict[str, str]) -> None:
+        """Index a source's tracks; only those with a share profile can be shared."""
+        with self._lock:
+            for track_id in self._profiles.get(source_id, {}):
+                self._owners[track_id].discard(source_id)
+            self._entries[source_id] = dict(filemap)
+            self._profiles[source_id] = {tid: p for tid, p in profiles.items() if tid in filemap}
+            for track_id in self._profiles[source_id]:
+                self._owners[track_id].add(source_id)
+
+    def remove_source(self, source_id: int) -> None:
+        with self._lock:
+            self._entries.pop(source_id, None)
+            for track_id in self._profiles.pop(source_id, {}):
+                owners = self._owners.get(track_id)
+                if owners is not None:
+                    owners.discard(source_id)
+                    if not owners:
+                        del self._owners[track_id]
+
+    def _path(self, source_id: int, entry: str) -> Path | None:
+        if os.path.isabs(entry):
+            return Path(entry)
+        folder = self._folders.get(source_id)
+        return folder / entry if folder else None
+
+    def shared_ids(self, source_id: int, profile: str | None) -> set[str]:
+        """Ids of tracks other sources downloaded with share profile ``profile``.
+
+        The source's own entries are not consulted: the caller knows which of
+        its files still exist.
+        """
+        if profile is None:
+            return set()
+        with self._lock:
+            return {
+                track_id
+                for track_id, owners in self._owners.items()
+                if any(
+                    owner != source_id and self._profiles[owner][track_id] == profile
+                    for owner in owners
+                )
+            }
+
+    def _candidates(self, source_id: int, track_id: str, profile: str) -> list[tuple[int, Path]]:
+        with self._lock:
+            return [
+                (owner, path)
+                for owner in self._owners.get(track_id, ())
+                if owner != source_id and self._profiles[owner][track_id] == profile
+                and (path := self._path(owner, self._entries[owner][track_id])) is not None
+            ]
+
+    def _forget(self, source_id: int, track_id: str) -> None:
+        """Drop an entry whose file is gone; the owner's next sync prunes its filemap too."""
+        with self._lock:
+            self._entries.get(source_id, {}).pop(track_id, None)
+            if self._profiles.get(source_id, {}).pop(track_id, None) is not None:
+                self._owners[track_id].discard(source_id)
+
+    def link_into(self, source_id: int, profile: str | None, folder: Path, track_ids: list[str]) -> LinkResult:
+        """Give ``folder`` a file for each of ``track_ids`` from another source with ``profile``."""
+        result = LinkResult()
+        if profile is None:
+            return result
+        for track_id in track_ids:
+            for owner, src in self._candidates(source_id, track_id, profile):
+                try:
+                    size = src.stat().st_size
+                except OSError:
+                    self._forget(owner, track_id)
+                    continue
+                dst = folder / src.name
+                try:
+                    if dst.exists():
+                        if dst.stat().st_size != size:
+                            continue
+                    else:
+                        dst.parent.mkdir(parents=True, exist_ok=True)
+                        try:
+                            os.link(src, dst)
+                            result.hardlinked += 1
+                            result.hardlinked_bytes += size
+                        except OSError as e:
+                            if e.errno not in _NO_HARDLINK_ERRNOS:
+                                raise
+                            # copy_file_range reflinks on copy-on-write filesystems
+                            copy_file(src, dst)
+                            result.copied += 1
+                except OSError as e:
+                    logger.warning("Could not link %s into %s: %s", src, folder, e)
+                    continue
+                result.files[track_id] = str(dst)
+                result.bytes += size
+                break
+            else:
+                result.missing.append(track_id)
+        return result
+
+
+track_store = TrackStore()
@@ -0,0 +1,104 @@
+import logging
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Original uploads that ``scdl --flac`` recodes (yt-dlp "aiff>flac/alac>flac/wav>flac")
+FLAC_SOURCE_EXTS = {".aiff", ".alac", ".wav"}
+
+# Tags scdl writes to the original, as Vorbis comments (the reverse of its mapping)
+_ID3_TO_VORBIS = {
+    "TIT2": "title",
+    "TPE1": "artist",
+    "TALB": "album",
+    "TPE2": "albumartist",
+    "TCON": "genre",
+    "TRCK": "tracknumber",
+    "TPOS": "discnumber",
+    "TCOM": "composer",
+    "TDRC": "date",
+    "COMM": "comment",
+}
+_MP4_TO_VORBIS = {
+    "\xa9nam": "title",
+    "\xa9ART": "artist",
+    "\xa9alb": "album",
+    "aART": "albumartist",
+    "\xa9gen": "genre",
+    "\xa9wrt": "composer",
+    "\xa9day": "date",
+    "\xa9cmt": "comment",
+}
+_MP4_URL_ATOM = "----:com.apple.iTunes:WWWAUDIOFILE"
+
+
+def find_ffmpeg() -> str | None:
+    return shutil.which("ffmpeg")
+
+
+def needs_flac(path: str) -> bool:
+    return Path(path).suffix.lower() in FLAC_SOURCE_EXTS
+
+
+def to_flac(src: Path, ffmpeg: str) -> Path:
+    """Convert ``src`` to a FLAC file next to it, carry its tags over and delete it."""
+    dst = src.with_suffix(".flac")
+    tmp = src.with_suffix(".temp.flac")
+    try:
+        subprocess.run(
+            [ffmpeg, "-y", "-nostdin", "-loglevel", "error", "-i", str(src),
+             "-map", "0:a", "-map_metadata", "-1", "-c:a", "flac", str(tmp)],
+            check=True, capture_output=True,
+        )
+        _copy_tags(src, tmp)
+        os.replace(tmp, dst)
+    except subprocess.CalledProcessError as e:
+        tmp.unlink(missing_ok=True)
+        error = e.stderr.decode("utf-8", errors="replace").strip().splitlines()
+        raise RuntimeError(error[-1] if error else f"ffmpeg exited with code {e.returncode}") from e
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    src.unlink()
+    return dst
+
+
+def _copy_tags(src: Path, dst: Path) -> None:
+    from mutagen import File as MutagenFile
+    from mutagen.flac import FLAC, Picture
+    from mutagen.id3 import ID3
+    from mutagen.mp4 import MP4Cover, MP4Tags
+
+    tags = getattr(MutagenFile(src), "tags", None)
+    flac = FLAC(dst)
+    pictures: list[tuple[bytes, str]] = []
+    if isinstance(tags, ID3):
+        for frame_id, key in _ID3_TO_VORBIS.items():
+            values = [str(text) for frame in tags.getall(frame_id) for text in frame.text]
+            if values:
+                flac[key] = values
+        for frame in tags.getall("WOAF"):
+            flac["WWWAUDIOFILE"] = frame.url
+        pictures = [(frame.data, frame.mime) for frame in tags.getall("APIC")]
+    elif isinstance(tags, MP4Tags):
+        for atom, key in _MP4_TO_VORBIS.items():
+            if atom in tags:
+                flac[key] = [str(value) for value in tags[atom]]
+        if "trkn" in tags:
+            flac["tracknumber"] = str(tags["trkn"][0][0])
+        if _MP4_URL_ATOM in tags:
+            flac["WWWAUDIOFILE"] = bytes(tags[_MP4_URL_ATOM][0]).decode("utf-8", errors="replace")
+        pictures = [
+            (bytes(cover), "image/png" if cover.imageformat == MP4Cover.FORMAT_PNG else "image/jpeg")
+            for cover in tags.get("covr", [])
+        ]
+    for data, mime in pictures:
+        picture = Picture()
+        picture.data = data
+        picture.mime = mime
+        picture.type = 3  # front cover
+        flac.add_picture(picture)
+    flac.save()
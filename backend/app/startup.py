@@ -0,0 +1,52 @@
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Printed on stdout (with the timing report as JSON) once the server accepts
+# connections; the desktop shell waits for it instead of polling /api/health.
+READY_MARKER = "SCDL_WEB_READY"
+
+
+class StartupTimer:
+    """Records how long each startup phase takes, from the first app import on."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: dict[str, float] = {}
+        self.ready_after: float | None = None
+
+    def mark(self, name: str) -> None:
+        """Close a phase that ran since the previous mark."""
+        now = time.perf_counter()
+        self.phases[name] = now - self._last
+        self._last = now
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+            self._last = time.perf_counter()
+
+    def ready(self) -> None:
+        self.mark("bind")
+        self.ready_after = self._last - self.started
+
+    def summary(self) -> str:
+        parts = [f"{name} {secs * 1000:.0f}ms" for name, secs in self.phases.items()]
+        total = self.ready_after if self.ready_after is not None else self._last - self.started
+        return f"ready in {total * 1000:.0f}ms ({', '.join(parts)})"
+
+    def report(self) -> dict:
+        return {
+            "ready_ms": round((self.ready_after or 0.0) * 1000, 1),
+            "phases_ms": {name: round(secs * 1000, 1) for name, secs in self.phases.items()},
+        }
+
+
+startup_timer = StartupTimer()
@@ -1,10 +1,17 @@
+import time
+
 from fastapi import WebSocket
 
+from app import metrics
+
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: dict[int, list[WebSocket]] = {}
         self._get_log_buffer = None
+        metrics.ws_connections.set_function(
+            lambda: sum(len(conns) for conns in self.active_connections.values())
+        )
 
     def set_log_buffer_provider(self, provider):
         """Set a callable that returns the log buffer for a source_id."""
@@ -31,10 +38,13 @@ class ConnectionManager:
 
     async def broadcast(self, source_id: int, message: dict):
         for conn in self.active_connections.get(source_id, []):
+            start = time.perf_counter()
             try:
                 await conn.send_json(message)
+                metrics.ws_messages.inc()
             except Exception:
-                pass
+                metrics.ws_send_errors.inc()
+            metrics.ws_send_seconds.observe(time.perf_counter() - start)
 
 
 ws_manager = ConnectionManager()
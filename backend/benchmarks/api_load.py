@@ -0,0 +1,245 @@
+"""Load-test the HTTP API and WebSockets of a running (or freshly started) backend.
+
+Concurrent workers hammer the endpoints the UI polls, with a weighted mix:
+``/api/sources``, ``/api/history`` (random pages and sources), ``/api/sync/status``
+and ``/api/sync/{id}/live``, while WebSocket clients keep connecting to
+``/ws/sync/{id}``, holding the connection and reconnecting. Reports p50/p95/p99
+latency, throughput and error rate per endpoint.
+
+With ``--data-dir`` (see ``benchmarks.synthetic_data``) a uvicorn backend is
+started on that data and stopped afterwards; otherwise ``--url`` is used. Needs
+``httpx`` (``pip install httpx``). Run from the backend directory:
+
+    python -m benchmarks.api_load --data-dir DIR [--duration 30] [--concurrency 32]
+                                  [--ws-clients 50] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+# endpoint name → relative weight in the request mix (roughly what open UI tabs poll)
+MIX = {
+    "GET /api/sources": 2,
+    "GET /api/history": 3,
+    "GET /api/sync/status": 4,
+    "GET /api/sync/{id}/live": 4,
+}
+
+
+class Stats:
+    """Latency samples and error counts per endpoint."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.error_samples: dict[str, str] = {}
+        self.ws_messages = 0
+
+    def record(self, name: str, seconds: float, error: str | None = None) -> None:
+        self.latencies[name].append(seconds)
+        if error:
+            self.errors[name] += 1
+            self.error_samples.setdefault(name, error)
+
+    def report(self, elapsed: float) -> dict:
+        out = {}
+        for name in sorted(self.latencies):
+            samples = sorted(self.latencies[name])
+            count = len(samples)
+            out[name] = {
+                "requests": count,
+                "per_second": round(count / elapsed, 1),
+                "errors": self.errors[name],
+                "error_rate": round(self.errors[name] / count, 4),
+                "p50_ms": _percentile(samples, 50),
+                "p95_ms": _percentile(samples, 95),
+                "p99_ms": _percentile(samples, 99),
+                "max_ms": round(samples[-1] * 1000, 1),
+            }
+            if name in self.error_samples:
+                out[name]["first_error"] = self.error_samples[name]
+        return out
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile, in milliseconds."""
+    index = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return round(sorted_samples[index] * 1000, 1)
+
+
+def _request_for(name: str, source_ids: list[int], rng: random.Random) -> tuple[str, dict]:
+    if name == "GET /api/history":
+        params = {"limit": 50, "offset": rng.choice([0, 0, 0, 50, 500])}
+        if rng.random() < 0.5:
+            params["source_id"] = rng.choice(source_ids)
+        return "/api/history", params
+    if name == "GET /api/sync/{id}/live":
+        return f"/api/sync/{rng.choice(source_ids)}/live", {"cursor": 0}
+    return name.split(" ", 1)[1], {}
+
+
+async def http_worker(client, stats: Stats, source_ids: list[int], deadline: float, seed: int) -> None:
+    rng = random.Random(seed)
+    names, weights = list(MIX), list(MIX.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        path, params = _request_for(name, source_ids, rng)
+        start = time.perf_counter()
+        error = None
+        try:
+            response = await client.get(path, params=params)
+            await response.aread()
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        stats.record(name, time.perf_counter() - start, error)
+
+
+async def ws_client(ws_url: str, stats: Stats, source_ids: list[int], deadline: float,
+                    hold: float, seed: int) -> None:
+    import websockets
+
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        url = f"{ws_url}/ws/sync/{rng.choice(source_ids)}"
+        start = time.perf_counter()
+        try:
+            async with websockets.connect(url, open_timeout=10) as ws:
+                stats.record("WS connect /ws/sync/{id}", time.perf_counter() - start)
+                until = min(deadline, time.perf_counter() + rng.uniform(hold / 2, hold * 1.5))
+                while (remaining := until - time.perf_counter()) > 0:
+                    try:
+                        await asyncio.wait_for(ws.recv(), timeout=remaining)
+                        stats.ws_messages += 1
+                    except asyncio.TimeoutError:
+                        break
+        except Exception as e:
+            stats.record("WS connect /ws/sync/{id}", time.perf_counter() - start, f"{type(e).__name__}: {e}")
+            await asyncio.sleep(0.1)
+
+
+async def run_load(base_url: str, args) -> dict:
+    try:
+        import httpx
+    except ImportError:
+        sys.exit("benchmarks.api_load needs httpx: pip install httpx")
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        sources = (await client.get("/api/sources")).json()
+        source_ids = [s["id"] for s in sources] or [1]
+
+        stats = Stats()
+        start = time.perf_counter()
+        deadline = start + args.duration
+        ws_url = "ws" + base_url[len("http"):]
+        tasks = [
+            http_worker(client, stats, source_ids, deadline, seed=i)
+            for i in range(args.concurrency)
+        ] + [
+            ws_client(ws_url, stats, source_ids, deadline, args.ws_hold, seed=10_000 + i)
+            for i in range(args.ws_clients)
+        ]
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    total = sum(len(v) for v in stats.latencies.values())
+    return {
+        "sources": len(source_ids),
+        "seconds": round(elapsed, 1),
+        "requests": total,
+        "per_second": round(total / elapsed, 1),
+        "ws_messages": stats.ws_messages,
+        "endpoints": stats.report(elapsed),
+    }
+
+
+# ── Backend process ──────────────────────────────────────────────
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_backend(data_dir: Path, port: int) -> subprocess.Popen:
+    """Start ``app.serve`` on the generated data and wait for its readiness line."""
+    from benchmarks.synthetic_data import environment
+
+    from app.startup import READY_MARKER
+
+    env = {**os.environ, **environment(data_dir), "PYTHONUNBUFFERED": "1"}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--port", str(port)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        if line.startswith(READY_MARKER):
+            print(f"Backend ready: {line[len(READY_MARKER):].strip()}", file=sys.stderr)
+            return proc
+    proc.wait()
+    raise RuntimeError(f"Backend exited with code {proc.returncode} before becoming ready")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--data-dir", type=Path, help="Start a backend on this generated data directory")
+    target.add_argument("--url", default="http://127.0.0.1:8000", help="Load-test this running backend")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent HTTP workers")
+    parser.add_argument("--ws-clients", type=int, default=50, help="Concurrent WebSocket clients")
+    parser.add_argument("--ws-hold", type=float, default=2.0, help="Average seconds a WebSocket stays open")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    args = parser.parse_args()
+
+    proc = None
+    base_url = args.url.rstrip("/")
+    if args.data_dir:
+        port = _free_port()
+        proc = start_backend(args.data_dir, port)
+        base_url = f"http://127.0.0.1:{port}"
+    try:
+        print(
+            f"Load testing {base_url} for {args.duration:.0f}s "
+            f"({args.concurrency} HTTP workers, {args.ws_clients} WebSocket clients)...",
+            file=sys.stderr,
+        )
+        result = asyncio.run(run_load(base_url, args))
+    finally:
+        if proc:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    print(f"{result['requests']} requests in {result['seconds']}s ({result['per_second']}/s)")
+    columns = ["requests", "per_second", "error_rate", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    print(f"{'endpoint':<28}" + "".join(f"{c:>12}" for c in columns))
+    for name, row in result["endpoints"].items():
+        print(f"{name:<28}" + "".join(f"{row[c]:>12}" for c in columns))
+    if args.json:
+        report = {"args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()}, **result}
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Stand-in for the scdl executable, used by the sync pipeline benchmark.
+
+Accepts the command line ScdlRunner builds and prints scdl/yt-dlp style output
+while writing real files into ``--path``. It honours ``--download-archive``
+(already archived tracks are skipped) and rewrites the ``--sync`` file like scdl.
+Configured through environment variables, since ScdlRunner passes its own:
+
+    FAKE_SCDL_TRACKS            tracks in the "playlist" (default 50)
+    FAKE_SCDL_FILE_BYTES        size of each written audio file (default 65536)
+    FAKE_SCDL_DOWNLOAD_SECONDS  simulated download time per track (default 0)
+    FAKE_SCDL_POSTPROCESS_SECONDS  simulated conversion/tagging time per track (default 0)
+    FAKE_SCDL_ORIGINAL_EXT      extension of the original upload (e.g. .aiff), written
+                                when no format flag is passed, as scdl does for FLAC
+                                sources the runner converts itself
+    FAKE_SCDL_REPLAY            replay a recorded scdl log instead; ``{path}`` in
+                                it is replaced by ``--path`` and every audio
+                                ``Destination:`` line creates its file
+    FAKE_SCDL_LINE_SECONDS      delay between replayed lines (default 0)
+"""
+
+import os
+import re
+import sys
+import time
+import zlib
+
+AUDIO_EXTS = {".mp3", ".flac", ".opus", ".m4a", ".ogg", ".wav"}
+_DESTINATION_RE = re.compile(r"Destination:\s+(.+)$")
+
+
+def _arg(argv: list[str], flag: str) -> str | None:
+    if flag in argv:
+        i = argv.index(flag)
+        if i + 1 < len(argv):
+            return argv[i + 1]
+    return None
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name) or default)
+
+
+def _write_file(path: str, size: int) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        # Repeating a short random block keeps large runs from being CPU bound
+        block = os.urandom(min(size, 4096)) or b""
+        remaining = size
+        while remaining > 0:
+            f.write(block[:remaining])
+            remaining -= len(block)
+
+
+def _emit(line: str) -> None:
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+
+def replay(log_path: str, path: str, file_bytes: int) -> None:
+    delay = _env_float("FAKE_SCDL_LINE_SECONDS", 0)
+    with open(log_path, encoding="utf-8") as f:
+        for raw in f:
+            line = raw.rstrip("\n").replace("{path}", path)
+            m = _DESTINATION_RE.search(line)
+            if m and os.path.splitext(m.group(1))[1].lower() in AUDIO_EXTS:
+                _write_file(m.group(1), file_bytes)
+            _emit(line)
+            if delay:
+                time.sleep(delay)
+
+
+def synthesize(argv: list[str], path: str, file_bytes: int) -> None:
+    url = _arg(argv, "-l") or "https://soundcloud.com/bench"
+    archive_file = _arg(argv, "--download-archive")
+    sync_file = _arg(argv, "--sync")
+    num_tracks = int(os.environ.get("FAKE_SCDL_TRACKS") or 50)
+    download_seconds = _env_float("FAKE_SCDL_DOWNLOAD_SECONDS", 0)
+    post_seconds = _env_float("FAKE_SCDL_POSTPROCESS_SECONDS", 0)
+    ext = ".flac" if "--flac" in argv else ".opus" if "--opus" in argv else ".mp3"
+    if not {"--flac", "--opus", "--onlymp3"} & set(argv):
+        ext = os.environ.get("FAKE_SCDL_ORIGINAL_EXT") or ext
+
+    archived: set[str] = set()
+    if archive_file and os.path.exists(archive_file):
+        with open(archive_file, encoding="utf-8") as f:
+            archived = {line.split()[-1] for line in f if line.strip()}
+
+    # Stable per-source IDs, so a second run sees its own tracks as archived
+    base = zlib.crc32(url.encode()) % 100_000 * 100_000
+    name = url.rstrip("/").rsplit("/", 1)[-1]
+    _emit(f"[soundcloud:set] Extracting URL: {url}")
+    _emit(f"[download] Downloading playlist: {name}")
+
+    synced: list[str] = []
+    new_ids: list[str] = []
+    for i in range(num_tracks):
+        track_id = str(base + i)
+        filename = f"Bench Artist {i % 37} - Track {i:05d}{ext}"
+        _emit(f"[download] Downloading item {i + 1} of {num_tracks}")
+        if track_id in archived:
+            _emit(f"[download] {track_id}: has already been recorded in the archive")
+            synced.append(f"soundcloud {track_id} {filename}")
+            continue
+        _emit(f"[soundcloud] {track_id}: Downloading info JSON")
+        _emit(f"[info] {track_id}: Downloading 1 format(s): hls_mp3_1_0")
+        dest = os.path.join(path, filename)
+        _emit(f"[download] Destination: {dest}")
+        if download_seconds:
+            time.sleep(download_seconds)
+        _write_file(dest, file_bytes)
+        _emit(f"[download] 100% of {file_bytes / 1e6:.2f}MiB in 00:00:00")
+        _emit(f"[ExtractAudio] Not converting audio {dest}; the file is already in a common audio format")
+        if post_seconds:
+            time.sleep(post_seconds)
+        _emit(f'[Metadata] Adding metadata to "{dest}"')
+        synced.append(f"soundcloud {track_id} {filename}")
+        new_ids.append(track_id)
+
+    if archive_file and new_ids:
+        with open(archive_file, "a", encoding="utf-8") as f:
+            f.writelines(f"soundcloud {tid}\n" for tid in new_ids)
+    if sync_file:
+        with open(sync_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(synced) + ("\n" if synced else ""))
+    _emit(f"[download] Finished downloading playlist: {name}")
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    path = _arg(argv, "--path") or os.getcwd()
+    file_bytes = int(os.environ.get("FAKE_SCDL_FILE_BYTES") or 65536)
+    os.makedirs(path, exist_ok=True)
+    log_path = os.environ.get("FAKE_SCDL_REPLAY")
+    if log_path:
+        replay(log_path, path, file_bytes)
+    else:
+        synthesize(argv, path, file_bytes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
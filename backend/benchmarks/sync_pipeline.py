@@ -0,0 +1,361 @@
+"""Benchmark the sync pipeline end to end, against a fake scdl.
+
+Runs in a scratch directory with its own SQLite database, music root and archives
+root, so it never touches real data. Measures:
+
+- sync: N sources synced concurrently through SyncManager and ScdlRunner, with
+  WebSocket clients attached, once downloading every track and once more with
+  everything already archived (resync)
+- prepare_sync_files and list_tracks on a source with 100k files
+- a full Rekordbox export of new files into a 50k-track XML
+
+The fake scdl (benchmarks/fake_scdl.py) writes real files; set its FAKE_SCDL_*
+variables to replay a recorded log or simulate slow downloads. Run from the
+backend directory:
+
+    python -m benchmarks.sync_pipeline [--sources 4] [--tracks 200] [--json out.json]
+                                       [--compare baseline.json] [--only sync,list]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+FAKE_SCDL = Path(__file__).resolve().parent / "fake_scdl.py"
+SECTIONS = ("sync", "prepare", "list", "export")
+
+
+class _CountingClient:
+    """Stands in for a WebSocket: accepts every message and counts it."""
+
+    def __init__(self):
+        self.messages = 0
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_json(self, message: dict) -> None:
+        self.messages += 1
+
+
+def _install_fake_scdl(bin_dir: Path) -> str:
+    """Write a launcher that runs fake_scdl.py with this interpreter."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    if sys.platform == "win32":
+        launcher = bin_dir / "scdl.cmd"
+        launcher.write_text(f'@"{sys.executable}" "{FAKE_SCDL}" %*\r\n', encoding="utf-8")
+    else:
+        launcher = bin_dir / "scdl"
+        launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_SCDL}" "$@"\n', encoding="utf-8")
+        launcher.chmod(launcher.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return str(launcher)
+
+
+async def _add_source(name: str, folder: str) -> int:
+    from app.database import async_session
+    from app.models.source import Source
+
+    async with async_session() as db:
+        source = Source(
+            name=name, url=f"https://soundcloud.com/bench/sets/{name}",
+            source_type="playlist", local_folder=folder,
+        )
+        db.add(source)
+        await db.commit()
+        return source.id
+
+
+async def _timed_async(func, repeat: int, setup=None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        await func()
+        best = min(best, time.perf_counter() - start)
+    return round(best, 3)
+
+
+# ── Sync ──────────────────────────────────────────────────────────
+
+
+async def _sync_round(source_ids: list[int], clients: list[_CountingClient]) -> dict:
+    from sqlalchemy import func, select
+
+    from app.database import async_session
+    from app.models.sync_run import SyncRun
+    from app.services.sync_manager import sync_manager
+
+    sent_before = sum(c.messages for c in clients)
+    start = time.perf_counter()
+    for source_id in source_ids:
+        await sync_manager.start_sync(source_id)
+    await asyncio.gather(*list(sync_manager.active_tasks.values()))
+    elapsed = time.perf_counter() - start
+
+    async with async_session() as db:
+        rows = await db.execute(
+            select(SyncRun.status, func.count(), func.sum(SyncRun.tracks_added),
+                   func.sum(SyncRun.tracks_skipped))
+            .where(SyncRun.id.in_(
+                select(func.max(SyncRun.id)).where(SyncRun.source_id.in_(source_ids))
+                .group_by(SyncRun.source_id)
+            ))
+            .group_by(SyncRun.status)
+        )
+        rows = rows.all()
+    statuses = {status: count for status, count, *_ in rows}
+    added = sum(r[2] or 0 for r in rows)
+    skipped = sum(r[3] or 0 for r in rows)
+    lines = sum(len(sync_manager.get_live_state(sid).logs) for sid in source_ids)
+    messages = sum(c.messages for c in clients) - sent_before
+    return {
+        "seconds": round(elapsed, 3),
+        "statuses": statuses,
+        "tracks_added": added,
+        "tracks_skipped": skipped,
+        "tracks_per_second": round((added + skipped) / elapsed, 1),
+        "lines": lines,
+        "lines_per_second": round(lines / elapsed, 1),
+        "ws_messages": messages,
+        "ws_messages_per_second": round(messages / elapsed, 1),
+    }
+
+
+async def bench_sync(args) -> dict:
+    from app.services.sync_manager import sync_manager
+    from app.ws.sync_progress import ws_manager
+
+    os.environ.setdefault("FAKE_SCDL_TRACKS", str(args.tracks))
+    source_ids = [
+        await _add_source(f"sync-{i}", f"bench/sync-{i}") for i in range(args.sources)
+    ]
+    clients = []
+    for source_id in source_ids:
+        for _ in range(args.clients):
+            client = _CountingClient()
+            await ws_manager.connect(source_id, client)
+            clients.append(client)
+    sync_manager.set_ws_manager(ws_manager)
+    sync_manager.update_max_concurrent(args.concurrency)
+
+    download = await _sync_round(source_ids, clients)
+    resync = await _sync_round(source_ids, clients)
+    return {
+        "sources": args.sources,
+        "tracks_per_source": int(os.environ["FAKE_SCDL_TRACKS"]),
+        "concurrency": args.concurrency,
+        "clients_per_source": args.clients,
+        "download": download,
+        "resync": resync,
+    }
+
+
+# ── prepare_sync_files / list_tracks on a large source ───────────
+
+
+async def _large_source(music_root: Path, num_files: int) -> int:
+    """A source with ``num_files`` empty audio files, all in its filemap; 1% are missing."""
+    from app.services.sync_manager import sync_manager
+
+    source_id = await _add_source("large", "bench/large")
+    folder = music_root / "bench" / "large"
+    folder.mkdir(parents=True, exist_ok=True)
+    filemap = {}
+    for i in range(num_files):
+        path = folder / f"Artist {i % 500} - Track {i:06d}.mp3"
+        if i % 100 != 99:
+            path.touch()
+        filemap[str(10_000_000 + i)] = str(path)
+    sync_manager.runner.save_filemap(source_id, folder, filemap)
+    return source_id
+
+
+async def bench_prepare(source_id: int, args) -> dict:
+    from app.database import async_session
+    from app.models.source import Source
+    from app.services.sync_manager import sync_manager
+
+    runner = sync_manager.runner
+    async with async_session() as db:
+        source = await db.get(Source, source_id)
+    filemap = runner._load_filemap(source_id)
+
+    def restore():
+        runner._save_filemap(source_id, filemap)
+
+    async def prepare():
+        await asyncio.to_thread(runner.prepare_sync_files, source)
+
+    return {
+        "entries": len(filemap),
+        "seconds": await _timed_async(prepare, args.repeat, setup=restore),
+    }
+
+
+async def bench_list(source_id: int, args) -> dict:
+    from app.database import async_session
+    from app.routers.sources import list_tracks
+
+    tracks = []
+
+    async def run():
+        nonlocal tracks
+        async with async_session() as db:
+            tracks = await list_tracks(source_id, db)
+
+    seconds = await _timed_async(run, args.repeat)
+    return {"tracks": len(tracks), "seconds": seconds}
+
+
+# ── Rekordbox export ─────────────────────────────────────────────
+
+
+async def bench_export(scratch: Path, args) -> dict:
+    from benchmarks.xml_backends import generate
+
+    from app.database import async_session
+    from app.models.global_settings import GlobalSetting
+    from app.services import rekordbox_exporter
+
+    xml_path = scratch / "rekordbox.xml"
+    template = scratch / "rekordbox-template.xml"
+    print(f"Generating a {args.xml_tracks}-track Rekordbox XML...", file=sys.stderr)
+    generate(template, args.xml_tracks)
+    async with async_session() as db:
+        db.add(GlobalSetting(key="rekordbox_xml_path", value=str(xml_path)))
+        await db.commit()
+
+    source_id = await _add_source("export", "bench/export")
+    folder = Path(os.environ["MUSIC_ROOT"]) / "bench" / "export"
+    folder.mkdir(parents=True, exist_ok=True)
+    for i in range(args.export_files):
+        (folder / f"Export Artist {i % 50} - Track {i:05d}.mp3").write_bytes(b"\0" * 1024)
+
+    def reset():
+        shutil.copyfile(template, xml_path)
+
+    result = None
+
+    async def export():
+        nonlocal result
+        result = await rekordbox_exporter.export_source(source_id)
+
+    full = await _timed_async(export, args.repeat, setup=reset)
+    added = result.tracks_added
+    # Second export over the updated XML: every file is already present
+    unchanged = await _timed_async(export, args.repeat)
+    return {
+        "xml_tracks": args.xml_tracks,
+        "files": args.export_files,
+        "tracks_added": added,
+        "seconds": full,
+        "unchanged_seconds": unchanged,
+    }
+
+
+# ── Driver ───────────────────────────────────────────────────────
+
+
+async def run(args, scratch: Path) -> dict:
+    from app.database import init_db
+    from app.services import scdl_runner
+
+    await init_db()
+    launcher = _install_fake_scdl(scratch / "bin")
+    scdl_runner._find_scdl = lambda: launcher
+
+    results: dict = {}
+    if "sync" in args.only:
+        print(f"Syncing {args.sources} sources x {args.tracks} tracks...", file=sys.stderr)
+        results["sync"] = await bench_sync(args)
+    if "prepare" in args.only or "list" in args.only:
+        print(f"Creating {args.list_files} files...", file=sys.stderr)
+        source_id = await _large_source(Path(os.environ["MUSIC_ROOT"]), args.list_files)
+        if "prepare" in args.only:
+            results["prepare_sync_files"] = await bench_prepare(source_id, args)
+        if "list" in args.only:
+            results["list_tracks"] = await bench_list(source_id, args)
+    if "export" in args.only:
+        results["rekordbox_export"] = await bench_export(scratch, args)
+    return results
+
+
+def _flatten(data: dict, prefix: str = "") -> dict[str, float]:
+    out = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            out.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            out[name] = value
+    return out
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Print timing and throughput metrics side by side with a previous report."""
+    current = _flatten(report["results"])
+    previous = _flatten(baseline.get("results", {}))
+    print(f"\n{'metric':<44}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, value in current.items():
+        if not name.endswith(("seconds", "_per_second")) or name not in previous:
+            continue
+        old = previous[name]
+        change = f"{(value - old) / old * 100:+.0f}%" if old else "n/a"
+        print(f"{name:<44}{old:>12}{value:>12}{change:>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--tracks", type=int, default=200, help="Tracks per source (FAKE_SCDL_TRACKS wins)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max concurrent syncs")
+    parser.add_argument("--clients", type=int, default=2, help="WebSocket clients per source")
+    parser.add_argument("--list-files", type=int, default=100_000)
+    parser.add_argument("--xml-tracks", type=int, default=50_000)
+    parser.add_argument("--export-files", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default=",".join(SECTIONS), help=f"Comma-separated subset of {', '.join(SECTIONS)}")
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    parser.add_argument("--compare", type=Path, help="Compare with a previous --json report")
+    args = parser.parse_args()
+    args.only = {s.strip() for s in args.only.split(",") if s.strip()}
+    if unknown := args.only - set(SECTIONS):
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix="scdl-bench-") as tmp:
+        scratch = Path(tmp)
+        # Must be set before the first app import: settings and the engine read them
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{(scratch / 'bench.db').as_posix()}"
+        os.environ["MUSIC_ROOT"] = str(scratch / "music")
+        os.environ["ARCHIVES_ROOT"] = str(scratch / "archives")
+        results = asyncio.run(run(args, scratch))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "args": {k: sorted(v) if isinstance(v, set) else v for k, v in vars(args).items()
+                 if k not in ("json", "compare")},
+        "results": results,
+    }
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text(encoding="utf-8")))
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Generate a synthetic scdl-web installation at production scale.
+
+Creates a data directory with the same layout as a real install: a SQLite
+database with sources and sync history (~300 sources and ~200k runs by
+default), per-source archive/sync/filemap files and a music tree of small
+audio files. Point the backend at it with the printed environment variables,
+or pass ``--data-dir`` to ``benchmarks.api_load``. Run from the backend directory:
+
+    python -m benchmarks.synthetic_data DIR [--sources 300] [--runs 200000]
+                                            [--tracks 50] [--log-lines 10] [--no-files]
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+SOURCE_TYPES = ["playlist", "likes", "artist_tracks", "artist_all", "user_reposts"]
+BATCH = 5000
+
+
+def data_paths(data_dir: Path) -> dict[str, Path]:
+    return {
+        "db": data_dir / "db" / "scdl-web.db",
+        "music": data_dir / "music",
+        "archives": data_dir / "archives",
+    }
+
+
+def environment(data_dir: Path) -> dict[str, str]:
+    """Backend settings (as environment variables) for a generated data directory."""
+    paths = data_paths(data_dir.resolve())
+    return {
+        "DATABASE_URL": f"sqlite+aiosqlite:///{paths['db'].as_posix()}",
+        "MUSIC_ROOT": str(paths["music"]),
+        "ARCHIVES_ROOT": str(paths["archives"]),
+    }
+
+
+def _create_schema(db_path: Path) -> None:
+    from sqlalchemy import create_engine
+
+    from app.models import Base
+
+    engine = create_engine(f"sqlite:///{db_path.as_posix()}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+
+def _ts(value: datetime) -> str:
+    """Format like SQLAlchemy's SQLite DateTime type stores values."""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _track_name(source_index: int, track: int) -> str:
+    return f"Artist {(source_index * 7 + track) % 997} - Track {track:05d}.mp3"
+
+
+def _log(rng: random.Random, source_index: int, lines: int, status: str) -> str:
+    out = [f"[soundcloud:set] Extracting URL: https://soundcloud.com/synthetic/sets/{source_index}"]
+    for i in range(max(lines - 2, 0)):
+        track_id = 100_000_000 + source_index * 10_000 + rng.randrange(5000)
+        if rng.random() < 0.8:
+            out.append(f"[download] {track_id}: has already been recorded in the archive")
+        else:
+            out.append(f"[download] Destination: {_track_name(source_index, i)}")
+    out.append("ERROR: Unable to download JSON metadata: HTTP Error 429" if status == "failed"
+               else "[download] Finished downloading playlist")
+    return "\n".join(out)
+
+
+def generate_database(db_path: Path, args, rng: random.Random) -> None:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    if db_path.exists():
+        db_path.unlink()
+    _create_schema(db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    conn.executemany(
+        "INSERT INTO sources (id, name, url, source_type, local_folder, audio_format,"
+        " sync_enabled, original_art, extract_artist, created_at, updated_at)"
+        " VALUES (?, ?, ?, ?, ?, 'mp3', ?, 1, 0, ?, ?)",
+        [
+            (i, f"Synthetic Source {i:04d}", f"https://soundcloud.com/synthetic/sets/{i}",
+             SOURCE_TYPES[i % len(SOURCE_TYPES)], f"synthetic/source-{i:04d}",
+             int(i % 10 != 0), _ts(now - timedelta(days=400)), _ts(now))
+            for i in range(1, args.sources + 1)
+        ],
+    )
+
+    # Runs are spread over the last year, oldest first, like a long-lived install
+    span = timedelta(days=365).total_seconds()
+    batch = []
+    for n in range(args.runs):
+        source_id = rng.randint(1, args.sources)
+        started = now - timedelta(seconds=span * (1 - n / args.runs))
+        status = rng.choices(["completed", "failed", "cancelled"], weights=[90, 8, 2])[0]
+        added = rng.randrange(5) if status == "completed" else 0
+        batch.append((
+            source_id, status, _ts(started), _ts(started + timedelta(seconds=rng.uniform(5, 600))),
+            added, rng.randrange(2) if status == "completed" else 0, rng.randrange(args.tracks + 1),
+            "Process exited with code 1" if status == "failed" else None,
+            _log(rng, source_id, args.log_lines, status),
+        ))
+        if len(batch) >= BATCH:
+            _insert_runs(conn, batch)
+            batch = []
+    if batch:
+        _insert_runs(conn, batch)
+
+    # A few sources whose last run never finished (shown as "interrupted")
+    conn.executemany(
+        "INSERT INTO sync_runs (source_id, status, started_at, tracks_added, tracks_removed,"
+        " tracks_skipped) VALUES (?, 'running', ?, 0, 0, 0)",
+        [(i, _ts(now)) for i in range(1, args.sources + 1, 50)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _insert_runs(conn: sqlite3.Connection, rows: list[tuple]) -> None:
+    conn.executemany(
+        "INSERT INTO sync_runs (source_id, status, started_at, finished_at, tracks_added,"
+        " tracks_removed, tracks_skipped, error_message, log_output)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def generate_files(paths: dict[str, Path], args) -> int:
+    """Write each source's music folder, filemap, archive and sync file."""
+    paths["archives"].mkdir(parents=True, exist_ok=True)
+    payload = b"\0" * args.file_bytes
+    written = 0
+    for i in range(1, args.sources + 1):
+        folder = paths["music"] / "synthetic" / f"source-{i:04d}"
+        if not args.no_files:
+            folder.mkdir(parents=True, exist_ok=True)
+        filemap: dict[str, str] = {}
+        for t in range(args.tracks):
+            name = _track_name(i, t)
+            filemap[str(100_000_000 + i * 10_000 + t)] = name
+            if not args.no_files:
+                (folder / name).write_bytes(payload)
+                written += 1
+        archives = paths["archives"]
+        (archives / f"source-{i}-filemap.json").write_text(json.dumps(filemap, indent=2), encoding="utf-8")
+        (archives / f"source-{i}-archive.txt").write_text(
+            "".join(f"soundcloud {tid}\n" for tid in filemap), encoding="utf-8",
+        )
+        (archives / f"source-{i}-sync.txt").write_text(
+            "".join(f"soundcloud {tid} {name}\n" for tid, name in filemap.items()), encoding="utf-8",
+        )
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("data_dir", type=Path)
+    parser.add_argument("--sources", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=200_000)
+    parser.add_argument("--tracks", type=int, default=50, help="Tracks (files and filemap entries) per source")
+    parser.add_argument("--log-lines", type=int, default=10, help="Log lines stored per sync run")
+    parser.add_argument("--file-bytes", type=int, default=0, help="Size of each generated audio file")
+    parser.add_argument("--no-files", action="store_true", help="Only write filemaps, no music tree")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    paths = data_paths(args.data_dir)
+    start = time.perf_counter()
+    print(f"Writing {args.sources} sources and {args.runs} sync runs...", file=sys.stderr)
+    generate_database(paths["db"], args, rng)
+    print(f"Writing filemaps and {'no' if args.no_files else args.sources * args.tracks} files...", file=sys.stderr)
+    generate_files(paths, args)
+    print(
+        f"Done in {time.perf_counter() - start:.1f}s, database "
+        f"{paths['db'].stat().st_size / 1e6:.0f} MB. Backend environment:",
+        file=sys.stderr,
+    )
+    for key, value in environment(args.data_dir).items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
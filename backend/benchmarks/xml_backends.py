@@ -0,0 +1,128 @@
+"""Compare the lxml and stdlib XML backends of the vendored pyrekordbox.
+
+Generates a Rekordbox collection (50k tracks by default), then times parsing and
+saving with each backend in a separate interpreter, since the backend is chosen at
+import time. Run from the backend directory:
+
+    python -m benchmarks.xml_backends [--tracks 50000] [--repeat 3] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+def generate(path: Path, num_tracks: int) -> None:
+    from app.vendor.pyrekordbox.rbxml import RekordboxXml
+
+    db = RekordboxXml(name="rekordbox", version="6.0.0", company="AlphaTheta")
+    for i in range(num_tracks):
+        track = db.add_track(
+            f"/Music/Artist {i % 500}/Album {i % 50}/{i:06d} - Track & Title {i}.mp3",
+            Name=f"Track & Title {i}",
+            Artist=f"Artist {i % 500}",
+            Album=f"Album {i % 50}",
+            Genre="House",
+            AverageBpm=f"{120 + i % 10}.00",
+        )
+        if i % 10 == 0:
+            track.add_tempo(0.025, 120.0 + i % 10, "4/4", 1)
+            track.add_mark(Name="Intro", Type="cue", Start=0.025, Num=0)
+    folder = db.add_playlist_folder("Sources")
+    for p in range(20):
+        playlist = folder.add_playlist(f"Source {p}")
+        playlist.add_tracks(range(p + 1, num_tracks + 1, 20))
+    db.save(path)
+
+
+def _timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return round(best, 3)
+
+
+def run_backend(path: Path, repeat: int) -> dict:
+    """Time the XML operations with the backend selected by the environment."""
+    from app.vendor.pyrekordbox import xmlbackend
+    from app.vendor.pyrekordbox.rbxml import RekordboxXml, RekordboxXmlStream
+
+    out = Path(tempfile.mkdtemp()) / "out.xml"
+    db = RekordboxXml(path)
+
+    def stream_export():
+        stream = RekordboxXmlStream(path)
+        index = stream.scan(playlists=["New"])
+        track = stream.add_track("/Music/new.mp3", TrackID=index.last_id + 1)
+        stream.add_playlist_tracks("New", [track.TrackID])
+        stream.save(out)
+
+    results = {
+        "backend": xmlbackend.BACKEND,
+        "parse": _timed(lambda: RekordboxXml(path), repeat),
+        "save": _timed(lambda: db.save(out), repeat),
+        "stream_scan": _timed(lambda: RekordboxXmlStream(path).scan(), repeat),
+        "stream_summary": _timed(lambda: RekordboxXmlStream(path).summary(), repeat),
+        "stream_export": _timed(stream_export, repeat),
+    }
+    db.save(out)
+    results["output_bytes"] = out.stat().st_size
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    parser.add_argument("--xml", type=Path, help=argparse.SUPPRESS)  # child process
+    args = parser.parse_args()
+
+    if args.xml:
+        print(json.dumps(run_backend(args.xml, args.repeat)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "collection.xml"
+        print(f"Generating {args.tracks} tracks...", file=sys.stderr)
+        generate(path, args.tracks)
+        size_mb = path.stat().st_size / 1e6
+
+        results = []
+        for backend in ("stdlib", "lxml"):
+            env = {**os.environ, "PYREKORDBOX_XML_BACKEND": backend}
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.xml_backends", "--xml", str(path),
+                 "--repeat", str(args.repeat)],
+                cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                print(f"{backend}: unavailable ({proc.stderr.strip().splitlines()[-1]})", file=sys.stderr)
+                continue
+            results.append(json.loads(proc.stdout))
+
+    report = {"tracks": args.tracks, "file_mb": round(size_mb, 1), "results": results}
+    print(f"{args.tracks} tracks, {size_mb:.1f} MB (best of {args.repeat}, seconds)")
+    columns = ["parse", "save", "stream_scan", "stream_summary", "stream_export"]
+    print(f"{'backend':<8}" + "".join(f"{c:>16}" for c in columns))
+    for r in results:
+        print(f"{r['backend']:<8}" + "".join(f"{r[c]:>16}" for c in columns))
+    if len({r["output_bytes"] for r in results}) > 1:
+        print("WARNING: backends wrote files of different sizes", file=sys.stderr)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import asyncio
+import os
+import tempfile
+
+# Point the settings at a throwaway data directory before the app is imported
+_data_dir = tempfile.mkdtemp(prefix="scdl-web-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_data_dir}/scdl-web.db"
+os.environ["MUSIC_ROOT"] = os.path.join(_data_dir, "music")
+os.environ["ARCHIVES_ROOT"] = os.path.join(_data_dir, "archives")
+
+
+def run(coro):
+    """Run a coroutine on a fresh event loop, releasing the engine's connections after."""
+    from app.database import engine
+
+    async def wrapper():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(wrapper())
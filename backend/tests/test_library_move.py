@@ -0,0 +1,293 @@
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.database import async_session, init_db
+from app.models.global_settings import GlobalSetting
+from app.models.source import Source
+from app.services import file_copy
+from app.services import library_mover as library_mover_module
+from app.services.library_mover import LibraryMover
+from app.services.move_journal import JOURNAL_NAME, MoveJournal
+from tests.conftest import run
+
+BACKEND = Path(__file__).resolve().parents[1]
+NUM_FILES = 12
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    """A source with NUM_FILES tracks under ``old``, to be moved to ``new`` as if across devices."""
+    old_root, new_root, archives = tmp_path / "old", tmp_path / "new", tmp_path / "archives"
+    for i in range(NUM_FILES):
+        path = old_root / "mix" / f"disc{i % 3}" / f"track{i:02}.mp3"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(os.urandom(4096 + i))
+
+    async def setup():
+        await init_db()
+        async with async_session() as db:
+            await db.execute(delete(Source))
+            await db.execute(delete(GlobalSetting).where(GlobalSetting.key == "music_root"))
+            db.add(Source(name="Mix", url="https://soundcloud.com/u/sets/mix",
+                          source_type="playlist", local_folder="mix"))
+            await db.commit()
+
+    run(setup())
+    monkeypatch.setattr(LibraryMover, "_is_same_filesystem", staticmethod(lambda a, b: False))
+    return old_root, new_root, archives
+
+
+def _files(root: Path) -> dict[str, bytes]:
+    return {str(p.relative_to(root)): p.read_bytes() for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+def _music_root() -> str | None:
+    async def get():
+        async with async_session() as db:
+            row = await db.get(GlobalSetting, "music_root")
+            return row.value if row else None
+    return run(get())
+
+
+def _count_copies(monkeypatch) -> list[Path]:
+    copied: list[Path] = []
+    real_copy = file_copy.copy_file
+
+    def counting_copy(src, dst, *args, **kwargs):
+        copied.append(src)
+        return real_copy(src, dst, *args, **kwargs)
+
+    monkeypatch.setattr(file_copy, "copy_file", counting_copy)
+    return copied
+
+
+def test_journal_round_trip(tmp_path):
+    src, dst = tmp_path / "a.mp3", tmp_path / "b.mp3"
+    src.write_bytes(b"audio")
+    file_copy.copy_file(src, dst)
+    st, src_st = dst.stat(), src.stat()
+
+    journal = MoveJournal.for_archives(tmp_path)
+    journal.start(tmp_path / "old", tmp_path / "new", [1, 2], same_fs=False, verify_checksums=True)
+    journal.record_copy(src, st.st_size, st.st_mtime_ns, src_st.st_mtime_ns, "digest")
+    journal.set_phase("rewrite")
+    journal.record_rewrite(1)
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as fh:
+        fh.write('{"type": "phase", "pha')  # torn by a crash mid-write
+
+    loaded = MoveJournal.load(tmp_path)
+    assert loaded.old_root == tmp_path / "old" and loaded.new_root == tmp_path / "new"
+    assert loaded.source_ids == [1, 2] and not loaded.same_fs and loaded.verify_checksums
+    assert loaded.phase == "rewrite"
+    assert loaded.phase_reached("copy") and loaded.phase_reached("rewrite")
+    assert not loaded.phase_reached("cleanup")
+    assert loaded.rewritten == {1}
+    assert loaded.copied[str(src)]["digest"] == "digest"
+    assert not loaded.failed
+
+
+def test_is_copied_matches_size_and_mtime(tmp_path):
+    src, dst = tmp_path / "a.mp3", tmp_path / "b.mp3"
+    src.write_bytes(b"audio")
+    journal = MoveJournal.for_archives(tmp_path)
+    assert not journal.is_copied(src, dst)
+
+    file_copy.copy_file(src, dst)
+    st = dst.stat()
+    journal.record_copy(src, st.st_size, st.st_mtime_ns, src.stat().st_mtime_ns, None)
+    assert journal.is_copied(src, dst)
+
+    # The copy was truncated or touched after it was journaled
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert not journal.is_copied(src, dst)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert journal.is_copied(src, dst)
+
+    # The original was rewritten after it was copied
+    src.write_bytes(b"new audio")
+    assert not journal.is_copied(src, dst)
+
+    dst.unlink()
+    assert not journal.is_copied(src, dst)
+    journal.discard()
+
+
+def test_move_resumes_after_kill_mid_copy(library, monkeypatch):
+    old_root, new_root, archives = library
+    expected = _files(old_root)
+    # Copy slowly in a separate process and SIGKILL it once a few copies are journaled
+    child = subprocess.Popen([sys.executable, "-c", textwrap.dedent(f"""
+        import asyncio, time
+        from pathlib import Path
+        from app.services import file_copy
+        from app.services.library_mover import LibraryMover
+
+        real_copy = file_copy.copy_file
+        def slow_copy(*args, **kwargs):
+            time.sleep(0.2)
+            return real_copy(*args, **kwargs)
+        file_copy.copy_file = slow_copy
+        LibraryMover._is_same_filesystem = staticmethod(lambda a, b: False)
+
+        async def main():
+            mover = LibraryMover()
+            mover.start_move(Path({str(old_root)!r}), Path({str(new_root)!r}), Path({str(archives)!r}))
+            await mover._task
+        asyncio.run(main())
+    """)], cwd=BACKEND, env=os.environ)
+    journal_path = archives / JOURNAL_NAME
+    deadline = time.monotonic() + 30
+    try:
+        while time.monotonic() < deadline:
+            if journal_path.exists() and journal_path.read_text().count('"copied"') >= 3:
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("the move never journaled a copy")
+    finally:
+        child.send_signal(signal.SIGKILL)
+        child.wait()
+
+    journal = MoveJournal.load(archives)
+    assert journal.phase == "copy" and not journal.failed
+    done = set(journal.copied)
+    assert 3 <= len(done) < NUM_FILES
+    assert _files(old_root) == expected  # originals untouched
+
+    copies = _count_copies(monkeypatch)
+    mover = LibraryMover()
+
+    async def resume():
+        assert mover.resume_interrupted(archives)
+        await mover._task
+    run(resume())
+
+    assert mover.status == "completed", mover.log_lines
+    assert _files(new_root) == expected
+    assert not any(p.is_file() for p in old_root.rglob("*"))
+    # Journaled copies were kept, only the rest was copied again
+    assert not done & {str(p) for p in copies}
+    assert len(copies) == NUM_FILES - len(done)
+    assert not journal_path.exists()
+    assert _music_root() == str(new_root)
+
+
+def test_interrupted_copy_is_discarded_for_another_move(library, tmp_path):
+    old_root, new_root, archives = library
+    journal = MoveJournal.for_archives(archives)
+    journal.start(old_root, tmp_path / "elsewhere", [1], same_fs=False, verify_checksums=False)
+    journal.close()
+    mover = LibraryMover()
+
+    async def move():
+        mover.start_move(old_root, new_root, archives)
+        await mover._task
+    run(move())
+
+    assert mover.status == "completed", mover.log_lines
+    assert len(_files(new_root)) == NUM_FILES
+    assert not (archives / JOURNAL_NAME).exists()
+
+
+def test_interrupted_move_past_copy_must_be_resumed_first(library, tmp_path):
+    old_root, new_root, archives = library
+    journal = MoveJournal.for_archives(archives)
+    journal.start(old_root, tmp_path / "elsewhere", [1], same_fs=False, verify_checksums=False)
+    journal.set_phase("rewrite")
+    journal.close()
+
+    with pytest.raises(RuntimeError, match="must be resumed first"):
+        LibraryMover().start_move(old_root, new_root, archives)
+    assert MoveJournal.load(archives).new_root == tmp_path / "elsewhere"
+
+
+def test_resume_in_cleanup_phase(library):
+    old_root, new_root, archives = library
+    originals = sorted(p for p in old_root.rglob("*") if p.is_file())
+
+    async def source_ids():
+        async with async_session() as db:
+            return list((await db.execute(select(Source.id))).scalars())
+
+    # A crash after every copy was made and the cleanup had started
+    journal = MoveJournal.for_archives(archives)
+    journal.start(old_root, new_root, run(source_ids()), same_fs=False, verify_checksums=False)
+    for src in originals:
+        dst = new_root / src.relative_to(old_root)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        file_copy.copy_file(src, dst)
+        st = dst.stat()
+        journal.record_copy(src, st.st_size, st.st_mtime_ns, src.stat().st_mtime_ns, None)
+    journal.set_phase("rewrite")
+    journal.set_phase("cleanup")
+    journal.close()
+    originals[0].unlink()  # already deleted before the crash
+    originals[1].write_bytes(b"rewritten after the copy")
+    late = old_root / "mix" / "disc0" / "late.mp3"
+    late.write_bytes(b"added after the scan")
+
+    mover = LibraryMover()
+
+    async def resume():
+        assert mover.resume_interrupted(archives)
+        await mover._task
+    run(resume())
+
+    assert mover.status == "completed", mover.log_lines
+    assert {p for p in old_root.rglob("*") if p.is_file()} == {originals[1], late}
+    assert not (old_root / "mix" / "disc2").exists()  # emptied directories are removed
+    assert len(_files(new_root)) == NUM_FILES
+    assert _music_root() == str(new_root)
+
+
+def test_failed_move_is_not_resumed_at_startup(library, monkeypatch):
+    old_root, new_root, archives = library
+    real_copy = file_copy.copy_file
+    calls = 0
+
+    def failing_copy(src, dst, *args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls > 4:
+            raise OSError(28, "No space left on device")
+        return real_copy(src, dst, *args, **kwargs)
+
+    monkeypatch.setattr(file_copy, "copy_file", failing_copy)
+    monkeypatch.setattr(library_mover_module, "COPY_WORKERS", 1)
+    mover = LibraryMover()
+
+    async def move():
+        mover.start_move(old_root, new_root, archives)
+        await mover._task
+    run(move())
+
+    assert mover.status == "failed"
+    journal = MoveJournal.load(archives)
+    assert journal.failed and "No space left" in journal.failed_error
+    assert len(journal.copied) == 4
+
+    # A restart leaves it alone ...
+    restarted = LibraryMover()
+    assert not restarted.resume_interrupted(archives)
+    assert restarted.status == "failed" and not restarted.is_moving
+
+    # ... until the user starts the same move again, which resumes it
+    monkeypatch.setattr(file_copy, "copy_file", real_copy)
+
+    async def retry():
+        restarted.start_move(old_root, new_root, archives)
+        await restarted._task
+    run(retry())
+
+    assert restarted.status == "completed", restarted.log_lines
+    assert len(_files(new_root)) == NUM_FILES
+    assert not (archives / JOURNAL_NAME).exists()
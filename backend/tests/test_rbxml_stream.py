@@ -0,0 +1,188 @@
+import importlib
+import os
+import shutil
+
+import pytest
+
+from app.vendor import pyrekordbox
+from app.vendor.pyrekordbox import rbxml as rbxml_module
+from app.vendor.pyrekordbox import utils
+from app.vendor.pyrekordbox import xmlbackend
+
+LIBRARY = "/music/Library"
+TRACKS = [
+    f"{LIBRARY}/Artist/Track One.mp3",
+    f"{LIBRARY}/Artist/Track & Two.flac",
+    f"{LIBRARY}/Ünïcödé/Trä<ck> 3.mp3",
+    f"{LIBRARY}/Other/100% Track.mp3",
+    f"{LIBRARY}/Other/Tab\tTrack.opus",
+]
+NEW_TRACKS = [f"{LIBRARY}/New/Fresh Track {i}.mp3" for i in range(3)]
+
+
+@pytest.fixture(params=["stdlib", "lxml"])
+def rbxml(request, monkeypatch):
+    """The rbxml module imported under the parametrized XML backend."""
+    if request.param == "lxml":
+        pytest.importorskip("lxml")
+    monkeypatch.setenv(xmlbackend.BACKEND_ENV, request.param)
+    importlib.reload(xmlbackend)
+    module = importlib.reload(rbxml_module)
+    assert xmlbackend.BACKEND == request.param
+    yield module
+    monkeypatch.undo()
+    importlib.reload(xmlbackend)
+    importlib.reload(rbxml_module)
+    importlib.reload(pyrekordbox)
+
+
+@pytest.fixture
+def base_xml(rbxml, tmp_path):
+    """A collection with tracks, cue data and TrackID, Location and nested playlists."""
+    db = rbxml.RekordboxXml(name="scdl-web", version="1.0", company="scdl-web")
+    tracks = []
+    for i, location in enumerate(TRACKS):
+        track = db.add_track(location, Name=f"Track {i}", Artist="Artist", AverageBpm="128.00")
+        track.add_tempo(Inizio=0.05, Bpm=128.0, Metro="4/4", Battito=1)
+        track.add_mark(Name="Drop", Type="cue", Start=32.0, Num=0)
+        tracks.append(track)
+    by_id = db.add_playlist("By ID")
+    by_id.add_tracks([t.TrackID for t in tracks[:4]])
+    by_location = db.add_playlist("By Location", keytype="Location")
+    by_location.add_tracks([rbxml.encode_path(p) for p in TRACKS[1:]])
+    folder = db.add_playlist_folder("Folder")
+    nested = folder.add_playlist("Nested")
+    nested.add_tracks([t.TrackID for t in tracks])
+    folder.add_playlist_folder("Empty")
+    db.add_playlist("Empty Playlist")
+    path = tmp_path / "base.xml"
+    db.save(path)
+    return path
+
+
+def _playlists(node):
+    for child in node.get_playlists():
+        if child.is_folder:
+            yield from _playlists(child)
+        else:
+            yield child
+
+
+def _reference(rbxml, path, added, removed, splices):
+    """Apply the changes with the in-memory RekordboxXml."""
+    db = rbxml.RekordboxXml(path)
+    removed_ids = set()
+    removed_locations = set()
+    for location in removed:
+        track = db.get_track(Location=location)
+        removed_ids.add(str(track.TrackID))
+        removed_locations.add(rbxml.normalize_location(rbxml.encode_path(location)))
+        db.remove_track(track)
+    if removed:
+        for node in _playlists(db.root_playlist_folder):
+            if node.key_type == "TrackID":
+                node.remove_tracks(removed_ids)
+            else:
+                node.remove_tracks(
+                    k for k in node.get_tracks() if rbxml.normalize_location(k) in removed_locations
+                )
+    ids = [db.add_track(location, Name=f"New {i}").TrackID for i, location in enumerate(added)]
+    top_level = {node.name: node for node in db.root_playlist_folder.get_playlists()}
+    for name, keytype in splices:
+        keys = ids if keytype == "TrackID" else [rbxml.encode_path(p) for p in added]
+        node = top_level.get(name) or db.add_playlist(name, keytype=keytype)
+        node.add_tracks(keys)
+    db.save(path)
+
+
+def _stream(rbxml, path, added, removed, splices):
+    """Apply the same changes with the streaming RekordboxXmlStream."""
+    db = rbxml.RekordboxXmlStream(path)
+    db.scan(playlists=[name for name, _ in splices])
+    db.remove_tracks(removed)
+    ids = [db.add_track(location, Name=f"New {i}").TrackID for i, location in enumerate(added)]
+    for name, keytype in splices:
+        keys = ids if keytype == "TrackID" else [rbxml.encode_path(p) for p in added]
+        db.add_playlist_tracks(name, keys, keytype=keytype)
+    db.save()
+
+
+@pytest.mark.parametrize(
+    "added, removed, splices",
+    [
+        pytest.param([], [], [], id="unchanged"),
+        pytest.param(NEW_TRACKS, [], [], id="add"),
+        pytest.param([], [TRACKS[0], TRACKS[2]], [], id="remove"),
+        pytest.param(NEW_TRACKS, [], [("By ID", "TrackID")], id="splice-trackid"),
+        pytest.param(NEW_TRACKS, [], [("By Location", "Location")], id="splice-location"),
+        pytest.param(NEW_TRACKS, [], [("Empty Playlist", "TrackID")], id="splice-empty"),
+        pytest.param(NEW_TRACKS, [], [("Brand New", "TrackID")], id="new-playlist"),
+        pytest.param(NEW_TRACKS, [], [("Brand New", "Location")], id="new-location-playlist"),
+        pytest.param(
+            NEW_TRACKS,
+            [TRACKS[1], TRACKS[3]],
+            [("By ID", "TrackID"), ("By Location", "Location"), ("Brand New", "TrackID")],
+            id="combined",
+        ),
+    ],
+)
+def test_stream_save_matches_rekordbox_xml(rbxml, base_xml, tmp_path, added, removed, splices):
+    expected = tmp_path / "expected.xml"
+    actual = tmp_path / "actual.xml"
+    shutil.copyfile(base_xml, expected)
+    shutil.copyfile(base_xml, actual)
+
+    _reference(rbxml, expected, added, removed, splices)
+    _stream(rbxml, actual, added, removed, splices)
+
+    assert actual.read_bytes() == expected.read_bytes()
+
+
+def test_stream_save_creates_new_file(rbxml, tmp_path):
+    expected = tmp_path / "expected.xml"
+    actual = tmp_path / "actual.xml"
+    splices = [("scdl", "TrackID")]
+
+    rbxml.RekordboxXml(name="scdl-web", version="1.0", company="scdl-web").save(expected)
+    _reference(rbxml, expected, NEW_TRACKS, [], splices)
+    db = rbxml.RekordboxXmlStream(actual, name="scdl-web", version="1.0", company="scdl-web")
+    ids = [db.add_track(location, Name=f"New {i}").TrackID for i, location in enumerate(NEW_TRACKS)]
+    db.add_playlist_tracks("scdl", ids)
+    db.save()
+
+    assert actual.read_bytes() == expected.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "location, path",
+    [
+        ("file://localhost/music/a%20b.mp3", "music/a b.mp3"),
+        ("file://localhost/music/a%2520b.mp3", "music/a b.mp3"),
+        ("file://localhost/music/%25C3%25BC%2520x.mp3", "music/ü x.mp3"),
+        ("file://localhost/music/a%2541b.mp3", "music/a%41b.mp3"),
+        ("file://localhost/music/100%25%20Track.mp3", "music/100% Track.mp3"),
+    ],
+)
+def test_normalize_location(location, path):
+    assert rbxml_module.normalize_location(location) == path
+    assert rbxml_module.normalize_location(rbxml_module.encode_path(path)) == path
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_atomic_open_permissions(tmp_path):
+    new = tmp_path / "new.xml"
+    mask = os.umask(0o022)
+    try:
+        with utils.atomic_open(new) as fh:
+            fh.write("<DJ_PLAYLISTS/>")
+    finally:
+        os.umask(mask)
+    assert new.stat().st_mode & 0o777 == 0o644
+
+    existing = tmp_path / "existing.xml"
+    existing.write_text("old")
+    existing.chmod(0o640)
+    with utils.atomic_open(existing) as fh:
+        fh.write("new")
+    assert existing.stat().st_mode & 0o777 == 0o640
+    assert existing.read_text() == "new"
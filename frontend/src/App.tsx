@@ -4,6 +4,7 @@ import { Layout } from "./components/Layout";
 import { Dashboard } from "./pages/Dashboard";
 import { SourceDetail } from "./pages/SourceDetail";
 import { HistoryPage } from "./pages/HistoryPage";
+import { StatsPage } from "./pages/StatsPage";
 import { SettingsPage } from "./pages/SettingsPage";
 import { OnboardingWizard } from "./components/onboarding/OnboardingWizard";
 import { useSettings } from "./hooks/useSettings";
@@ -40,6 +41,7 @@ export function App() {
         <Route path="/" element={<Dashboard />} />
         <Route path="/sources/:id" element={<SourceDetail />} />
         <Route path="/history" element={<HistoryPage />} />
+        <Route path="/stats" element={<StatsPage />} />
         <Route path="/settings" element={<SettingsPage />} />
       </Route>
     </Routes>
@@ -5,12 +5,25 @@ export interface BrowseResult {
   parent: string | null;
   directories: { name: string; path: string }[];
   files: { name: string; path: string }[];
+  total: number;
+  offset: number;
+  has_more: boolean;
+}
+
+export interface BrowseOptions {
+  fileGlob?: string;
+  prefix?: string;
+  offset?: number;
+  limit?: number;
 }
 
 export const filesystemApi = {
-  browse: (path: string, fileGlob?: string) => {
+  browse: (path: string, { fileGlob, prefix, offset, limit }: BrowseOptions = {}) => {
     let url = `/filesystem/browse?path=${encodeURIComponent(path)}`;
     if (fileGlob) url += `&file_glob=${encodeURIComponent(fileGlob)}`;
+    if (prefix) url += `&prefix=${encodeURIComponent(prefix)}`;
+    if (offset) url += `&offset=${offset}`;
+    if (limit) url += `&limit=${limit}`;
     return api.get<BrowseResult>(url);
   },
 };
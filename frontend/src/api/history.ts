@@ -1,5 +1,5 @@
-import { api } from "./client";
-import type { SyncRun, SyncRunDetail } from "../types/sync";
+import { api, BASE_URL } from "./client";
+import type { SyncRun, SyncRunDetail, SyncRunSearchResult } from "../types/sync";
 
 export const historyApi = {
   list: (sourceId?: number, limit = 50, offset = 0) => {
@@ -9,5 +9,11 @@ export const historyApi = {
     params.set("offset", String(offset));
     return api.get<SyncRun[]>(`/history?${params}`);
   },
+  search: (q: string, before?: number | null) => {
+    const params = new URLSearchParams({ q });
+    if (before) params.set("before", String(before));
+    return api.get<SyncRunSearchResult>(`/history/search?${params}`);
+  },
   get: (runId: number) => api.get<SyncRunDetail>(`/history/${runId}`),
+  traceUrl: (runId: number) => `${BASE_URL}/history/${runId}/trace`,
 };
@@ -3,12 +3,20 @@ import { api } from "./client";
 export interface RekordboxExportResult {
   tracks_added: number;
   tracks_skipped: number;
+  tracks_removed: number;
   playlist_updated: number;
   xml_path: string;
   playlist_name: string;
   is_rekordbox_running: boolean;
 }
 
+export interface RekordboxBatchExportResult {
+  xml_path: string;
+  exported: number;
+  failed: number;
+  results: { source_id: number; result: RekordboxExportResult | null; error: string | null }[];
+}
+
 export interface RekordboxStatus {
   platform: string;
   xml_exists: boolean;
@@ -16,11 +24,21 @@ export interface RekordboxStatus {
   total_tracks: number;
   total_playlists: number;
   detected_paths: string[];
+  analysis_available: boolean;
+}
+
+export interface RekordboxExportProgress {
+  is_exporting: boolean;
+  progress: { phase: "scanning" | "analyzing" | "reading" | "saving"; current: number; total: number } | null;
 }
 
 export const rekordboxApi = {
   export: (sourceId: number) =>
     api.post<RekordboxExportResult>(`/rekordbox/${sourceId}/export`),
+  exportMany: (sourceIds?: number[]) =>
+    api.post<RekordboxBatchExportResult>("/rekordbox/export", { source_ids: sourceIds ?? null }),
+  progress: (sourceId: number) =>
+    api.get<RekordboxExportProgress>(`/rekordbox/${sourceId}/progress`),
   status: () => api.get<RekordboxStatus>("/rekordbox/status"),
   discover: () => api.get<{ detected_paths: string[] }>("/rekordbox/discover"),
 };
@@ -8,6 +8,27 @@ export interface MoveCheckResult {
   total_size: number;
 }
 
+export interface MaintenanceReport {
+  started_at: string;
+  duration_seconds: number;
+  logs_compacted: number;
+  log_bytes_removed: number;
+  runs_deleted: number;
+  reclaimed_bytes: number;
+  free_bytes: number;
+  database_bytes: number;
+  auto_vacuum: "none" | "full" | "incremental";
+  full_vacuum: boolean;
+  analyzed: boolean;
+  error: string | null;
+}
+
+export interface MaintenanceStatus {
+  running: boolean;
+  next_run_at: string | null;
+  last_report: MaintenanceReport | null;
+}
+
 export const settingsApi = {
   get: () => api.get<Settings>("/settings"),
   update: (data: SettingsUpdate) => api.put<Settings>("/settings", data),
@@ -15,8 +36,12 @@ export const settingsApi = {
     api.get<MoveCheckResult>(
       `/settings/move-check?new_music_root=${encodeURIComponent(newMusicRoot)}`
     ),
-  moveLibrary: (musicRoot: string) =>
-    api.post<{ status: string }>("/settings/move-library", {
-      music_root: musicRoot,
-    }),
+  moveLibrary: (musicRoot: string, verifyChecksums = false) =>
+    api.post<{ status: string }>(
+      `/settings/move-library?verify_checksums=${verifyChecksums}`,
+      { music_root: musicRoot },
+    ),
+  maintenance: () => api.get<MaintenanceStatus>("/settings/maintenance"),
+  runMaintenance: (fullVacuum = false) =>
+    api.post<{ status: string }>(`/settings/maintenance/run?full_vacuum=${fullVacuum}`),
 };
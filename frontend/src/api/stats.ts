@@ -0,0 +1,10 @@
+import { api } from "./client";
+import type { LibraryStats, StatsBucketSize } from "../types/stats";
+
+export const statsApi = {
+  get: (bucket: StatsBucketSize, days: number, sourceId?: number) => {
+    const params = new URLSearchParams({ bucket, days: String(days) });
+    if (sourceId) params.set("source_id", String(sourceId));
+    return api.get<LibraryStats>(`/stats?${params}`);
+  },
+};
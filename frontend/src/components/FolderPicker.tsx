@@ -1,6 +1,6 @@
 import { Modal, Stack, Group, Button, TextInput, Text, ScrollArea, UnstyledButton, Loader } from "@mantine/core";
-import { IconFolder, IconArrowUp, IconCheck, IconFileCode } from "@tabler/icons-react";
-import { useState, useEffect, useCallback } from "react";
+import { IconFolder, IconArrowUp, IconCheck, IconFileCode, IconSearch } from "@tabler/icons-react";
+import { useState, useEffect, useCallback, useRef } from "react";
 import { filesystemApi, type BrowseResult } from "../api/filesystem";
 
 interface Props {
@@ -17,22 +17,51 @@ export function FolderPicker({ opened, onClose, onSelect, initialPath, fileFilte
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [manualPath, setManualPath] = useState("");
+  const [prefix, setPrefix] = useState("");
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Ignore responses to superseded requests (e.g. while typing a filter)
+  const requestId = useRef(0);
 
-  const browse = useCallback(async (path: string) => {
+  const browse = useCallback(async (path: string, namePrefix = "") => {
+    const id = ++requestId.current;
     setLoading(true);
     setError(null);
+    setPrefix(namePrefix);
     try {
-      const result = await filesystemApi.browse(path, fileFilter);
+      const result = await filesystemApi.browse(path, { fileGlob: fileFilter, prefix: namePrefix });
+      if (id !== requestId.current) return;
       setData(result);
       setCurrentPath(result.current);
       setManualPath(result.current);
     } catch (e) {
-      setError(e instanceof Error ? e.message : "Failed to browse");
+      if (id === requestId.current) setError(e instanceof Error ? e.message : "Failed to browse");
     } finally {
-      setLoading(false);
+      if (id === requestId.current) setLoading(false);
     }
   }, [fileFilter]);
 
+  const loadMore = async () => {
+    if (!data) return;
+    setLoadingMore(true);
+    try {
+      const next = await filesystemApi.browse(data.current, {
+        fileGlob: fileFilter,
+        prefix,
+        offset: data.offset + data.directories.length + data.files.length,
+      });
+      setData({
+        ...next,
+        offset: data.offset,
+        directories: [...data.directories, ...next.directories],
+        files: [...data.files, ...next.files],
+      });
+    } catch (e) {
+      setError(e instanceof Error ? e.message : "Failed to browse");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     if (opened) {
       browse(initialPath || "/");
@@ -74,6 +103,14 @@ export function FolderPicker({ opened, onClose, onSelect, initialPath, fileFilte
           </Button>
         </Group>
 
+        <TextInput
+          size="xs"
+          value={prefix}
+          onChange={(e) => browse(currentPath, e.currentTarget.value)}
+          placeholder="Filter by name"
+          leftSection={<IconSearch size={14} />}
+        />
+
         {error && (
           <Text size="sm" c="red">{error}</Text>
         )}
@@ -139,6 +176,13 @@ export function FolderPicker({ opened, onClose, onSelect, initialPath, fileFilte
                   No matching files or subdirectories
                 </Text>
               )}
+              {data.has_more && (
+                <Group justify="center" py="xs">
+                  <Button variant="subtle" size="xs" loading={loadingMore} onClick={loadMore}>
+                    Load more ({data.total - data.directories.length - data.files.length} remaining)
+                  </Button>
+                </Group>
+              )}
             </Stack>
           ) : null}
         </ScrollArea>
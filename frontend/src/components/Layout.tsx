@@ -3,6 +3,7 @@ import { Outlet, useLocation, useNavigate } from "react-router-dom";
 import {
   IconDashboard,
   IconHistory,
+  IconChartBar,
   IconSettings,
   IconSun,
   IconMoon,
@@ -15,6 +16,7 @@ import { UpdateModal } from "./UpdateModal";
 const navItems = [
   { label: "Dashboard", icon: IconDashboard, path: "/" },
   { label: "History", icon: IconHistory, path: "/history" },
+  { label: "Statistics", icon: IconChartBar, path: "/stats" },
   { label: "Settings", icon: IconSettings, path: "/settings" },
 ];
 
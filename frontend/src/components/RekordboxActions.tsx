@@ -1,6 +1,10 @@
-import { Alert, Button, Stack, Text } from "@mantine/core";
+import { Alert, Button, Progress, Stack, Text } from "@mantine/core";
 import { IconVinyl } from "@tabler/icons-react";
-import { useExportToRekordbox, useRekordboxStatus } from "../hooks/useRekordbox";
+import {
+  useExportToRekordbox,
+  useRekordboxExportProgress,
+  useRekordboxStatus,
+} from "../hooks/useRekordbox";
 import { useState, useEffect } from "react";
 import type { RekordboxExportResult } from "../api/rekordbox";
 
@@ -12,6 +16,8 @@ interface Props {
 export function RekordboxActions({ sourceId, disabled }: Props) {
   const { data: status } = useRekordboxStatus();
   const exportMutation = useExportToRekordbox();
+  const { data: exportProgress } = useRekordboxExportProgress(sourceId, exportMutation.isPending);
+  const progress = exportMutation.isPending ? exportProgress?.progress : null;
   const [result, setResult] = useState<RekordboxExportResult | null>(null);
   const [error, setError] = useState<string | null>(null);
 
@@ -49,6 +55,15 @@ export function RekordboxActions({ sourceId, disabled }: Props) {
         Export to Rekordbox
       </Button>
 
+      {progress && (progress.phase === "analyzing" || progress.phase === "reading") && progress.total > 0 && (
+        <Stack gap={2}>
+          <Progress value={(progress.current / progress.total) * 100} size="sm" animated />
+          <Text size="xs" c="dimmed">
+            {progress.phase === "analyzing" ? "Analyzing BPM and key" : "Reading tags"}: {progress.current} / {progress.total}
+          </Text>
+        </Stack>
+      )}
+
       {error && (
         <Alert color="red" withCloseButton onClose={() => setError(null)}>
           {error}
@@ -10,6 +10,9 @@ interface LogLine {
 interface MoveProgress {
   current: number;
   total: number;
+  bytesDone?: number;
+  bytesTotal?: number;
+  bytesPerSec?: number;
 }
 
 export type MoveStatus = "idle" | "scanning" | "moving" | "rewriting" | "completed" | "failed";
@@ -21,6 +24,9 @@ interface MoveMessage {
   error?: string;
   current?: number;
   total?: number;
+  bytes_done?: number;
+  bytes_total?: number;
+  bytes_per_sec?: number;
 }
 
 export function useMoveWebSocket(active: boolean) {
@@ -57,7 +63,13 @@ export function useMoveWebSocket(active: boolean) {
           break;
         case "progress":
           if (msg.current !== undefined && msg.total !== undefined) {
-            setProgress({ current: msg.current, total: msg.total });
+            setProgress({
+              current: msg.current,
+              total: msg.total,
+              bytesDone: msg.bytes_done,
+              bytesTotal: msg.bytes_total,
+              bytesPerSec: msg.bytes_per_sec,
+            });
           }
           break;
       }
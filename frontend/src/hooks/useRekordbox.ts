@@ -13,3 +13,18 @@ export function useExportToRekordbox() {
     mutationFn: (sourceId: number) => rekordboxApi.export(sourceId),
   });
 }
+
+export function useExportAllToRekordbox() {
+  return useMutation({
+    mutationFn: (sourceIds?: number[]) => rekordboxApi.exportMany(sourceIds),
+  });
+}
+
+export function useRekordboxExportProgress(sourceId: number, enabled: boolean) {
+  return useQuery({
+    queryKey: ["rekordbox", "progress", sourceId],
+    queryFn: () => rekordboxApi.progress(sourceId),
+    enabled,
+    refetchInterval: enabled ? 500 : false,
+  });
+}
@@ -13,3 +13,19 @@ export function useUpdateSettings() {
     onSuccess: () => qc.invalidateQueries({ queryKey: ["settings"] }),
   });
 }
+
+export function useMaintenanceStatus() {
+  return useQuery({
+    queryKey: ["maintenance"],
+    queryFn: settingsApi.maintenance,
+    refetchInterval: (query) => (query.state.data?.running ? 2000 : false),
+  });
+}
+
+export function useRunMaintenance() {
+  const qc = useQueryClient();
+  return useMutation({
+    mutationFn: (fullVacuum: boolean) => settingsApi.runMaintenance(fullVacuum),
+    onSuccess: () => qc.invalidateQueries({ queryKey: ["maintenance"] }),
+  });
+}
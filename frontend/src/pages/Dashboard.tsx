@@ -1,7 +1,8 @@
 import { Title, SimpleGrid, Button, Group, Alert, Modal, Stack, Text, Checkbox, Badge } from "@mantine/core";
-import { IconRefresh, IconAlertCircle, IconPlus } from "@tabler/icons-react";
+import { IconRefresh, IconAlertCircle, IconPlus, IconVinyl } from "@tabler/icons-react";
 import { useSources, useCreateSource, useDeleteSource } from "../hooks/useSources";
 import { useSettings } from "../hooks/useSettings";
+import { useExportAllToRekordbox, useRekordboxStatus } from "../hooks/useRekordbox";
 import { syncApi } from "../api/sync";
 import { SourceCard } from "../components/SourceCard";
 import { SourceForm } from "../components/SourceForm";
@@ -15,6 +16,9 @@ export function Dashboard() {
   const { data: appSettings } = useSettings();
   const createSource = useCreateSource();
   const deleteSource = useDeleteSource();
+  const { data: rekordboxStatus } = useRekordboxStatus();
+  const exportAll = useExportAllToRekordbox();
+  const [exportMessage, setExportMessage] = useState<{ color: string; text: string } | null>(null);
   const qc = useQueryClient();
   const [syncing, setSyncing] = useState(false);
   const [syncSources, setSyncSources] = useState<Record<number, "running" | "queued">>({});
@@ -78,6 +82,19 @@ export function Dashboard() {
     }
   };
 
+  const handleExportAll = () => {
+    setExportMessage(null);
+    exportAll.mutate(undefined, {
+      onSuccess: (data) => {
+        const added = data.results.reduce((n, r) => n + (r.result?.tracks_added ?? 0), 0);
+        const text = `${data.exported} source${data.exported !== 1 ? "s" : ""} exported to Rekordbox (${added} new track${added !== 1 ? "s" : ""})`
+          + (data.failed ? `, ${data.failed} failed.` : ".");
+        setExportMessage({ color: data.failed ? "orange" : "green", text });
+      },
+      onError: (err) => setExportMessage({ color: "red", text: err.message }),
+    });
+  };
+
   const closeAddModal = () => {
     setAddOpened(false);
     setCreateError(null);
@@ -123,12 +140,28 @@ export function Dashboard() {
           <Button leftSection={<IconPlus size={16} />} variant="light" onClick={() => setAddOpened(true)}>
             Add Source
           </Button>
+          {rekordboxStatus && rekordboxStatus.platform !== "linux" && (
+            <Button
+              leftSection={<IconVinyl size={16} />}
+              variant="light"
+              onClick={handleExportAll}
+              loading={exportAll.isPending}
+            >
+              Export All to Rekordbox
+            </Button>
+          )}
           <Button leftSection={<IconRefresh size={16} />} onClick={handleSyncAll} loading={syncing}>
             Sync All
           </Button>
         </Group>
       </Group>
 
+      {exportMessage && (
+        <Alert color={exportMessage.color} mb="lg" withCloseButton onClose={() => setExportMessage(null)}>
+          {exportMessage.text}
+        </Alert>
+      )}
+
       {sources && sources.length === 0 ? (
         <Alert>No sources configured. Click "Add Source" to get started.</Alert>
       ) : (
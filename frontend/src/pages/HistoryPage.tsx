@@ -1,15 +1,47 @@
-import { Title, Table, Modal, Code, ScrollArea, Alert } from "@mantine/core";
-import { useQuery } from "@tanstack/react-query";
+import {
+  Title, Table, Modal, Code, ScrollArea, Alert, Group, Button, Text, TextInput, Mark, Stack,
+} from "@mantine/core";
+import { useDebouncedValue } from "@mantine/hooks";
+import { IconDownload, IconSearch } from "@tabler/icons-react";
+import { useInfiniteQuery, useQuery } from "@tanstack/react-query";
 import { historyApi } from "../api/history";
 import { StatusBadge } from "../components/StatusBadge";
-import { useState } from "react";
-import type { SyncRunDetail } from "../types/sync";
+import { useState, type ReactNode } from "react";
+import type { LogMatch, SyncRunDetail } from "../types/sync";
+
+function MatchLine({ match }: { match: LogMatch }) {
+  const parts: ReactNode[] = [];
+  let pos = 0;
+  match.highlights.forEach(([start, end], i) => {
+    parts.push(match.text.slice(pos, start));
+    parts.push(<Mark key={i}>{match.text.slice(start, end)}</Mark>);
+    pos = end;
+  });
+  parts.push(match.text.slice(pos));
+  return (
+    <Text size="xs" ff="monospace" style={{ whiteSpace: "pre-wrap", wordBreak: "break-all" }}>
+      <Text span c="dimmed" size="xs" ff="monospace">{match.line + 1}: </Text>
+      {parts}
+    </Text>
+  );
+}
 
 export function HistoryPage() {
+  const [query, setQuery] = useState("");
+  const [debouncedQuery] = useDebouncedValue(query.trim(), 300);
   const { data: runs, isLoading } = useQuery({
     queryKey: ["history"],
     queryFn: () => historyApi.list(),
+    enabled: !debouncedQuery,
+  });
+  const search = useInfiniteQuery({
+    queryKey: ["history-search", debouncedQuery],
+    queryFn: ({ pageParam }) => historyApi.search(debouncedQuery, pageParam),
+    initialPageParam: null as number | null,
+    getNextPageParam: (page) => page.next_before,
+    enabled: !!debouncedQuery,
   });
+  const hits = search.data?.pages.flatMap((page) => page.results);
   const [selectedRun, setSelectedRun] = useState<SyncRunDetail | null>(null);
 
   const openDetail = async (runId: number) => {
@@ -17,12 +49,20 @@ export function HistoryPage() {
     setSelectedRun(detail);
   };
 
-  if (isLoading) return <Title order={3}>Loading...</Title>;
+  if (isLoading && !debouncedQuery) return <Title order={3}>Loading...</Title>;
 
   return (
     <>
       <Title order={2} mb="lg">Sync History</Title>
 
+      <TextInput
+        mb="md"
+        placeholder='Search logs, e.g. "HTTP Error 404" or a track name'
+        leftSection={<IconSearch size={16} />}
+        value={query}
+        onChange={(e) => setQuery(e.currentTarget.value)}
+      />
+
       <Modal
         opened={!!selectedRun}
         onClose={() => setSelectedRun(null)}
@@ -30,13 +70,77 @@ export function HistoryPage() {
         size="xl"
       >
         {selectedRun && (
-          <ScrollArea h={400}>
-            <Code block>{selectedRun.log_output || "No output captured"}</Code>
-          </ScrollArea>
+          <>
+            <ScrollArea h={400}>
+              <Code block>{selectedRun.log_output || "No output captured (logs older than the retention period are removed)"}</Code>
+            </ScrollArea>
+            {selectedRun.has_trace && (
+              <Group justify="space-between" mt="sm">
+                <Text size="xs" c="dimmed">
+                  Phase and per-track timings; open in chrome://tracing or ui.perfetto.dev
+                </Text>
+                <Button
+                  component="a"
+                  href={historyApi.traceUrl(selectedRun.id)}
+                  download={`sync-run-${selectedRun.id}-trace.json`}
+                  variant="light"
+                  size="xs"
+                  leftSection={<IconDownload size={14} />}
+                >
+                  Download trace
+                </Button>
+              </Group>
+            )}
+          </>
         )}
       </Modal>
 
-      {runs && runs.length === 0 ? (
+      {debouncedQuery ? (
+        search.isError ? (
+          <Alert color="red">{(search.error as Error).message}</Alert>
+        ) : hits && hits.length === 0 ? (
+          <Alert>No sync logs match this search.</Alert>
+        ) : (
+          <>
+            <Table highlightOnHover>
+              <Table.Thead>
+                <Table.Tr>
+                  <Table.Th>Source</Table.Th>
+                  <Table.Th>Status</Table.Th>
+                  <Table.Th>Started</Table.Th>
+                  <Table.Th>Matching lines</Table.Th>
+                </Table.Tr>
+              </Table.Thead>
+              <Table.Tbody>
+                {hits?.map((hit) => (
+                  <Table.Tr key={hit.id} style={{ cursor: "pointer", verticalAlign: "top" }} onClick={() => openDetail(hit.id)}>
+                    <Table.Td>{hit.source_name || `Source #${hit.source_id}`}</Table.Td>
+                    <Table.Td><StatusBadge status={hit.status} /></Table.Td>
+                    <Table.Td>{new Date(hit.started_at).toLocaleString()}</Table.Td>
+                    <Table.Td>
+                      <Stack gap={2}>
+                        {hit.matches.map((m) => <MatchLine key={m.line} match={m} />)}
+                        {hit.match_count > hit.matches.length && (
+                          <Text size="xs" c="dimmed">
+                            +{hit.match_count - hit.matches.length} more
+                          </Text>
+                        )}
+                      </Stack>
+                    </Table.Td>
+                  </Table.Tr>
+                ))}
+              </Table.Tbody>
+            </Table>
+            {search.hasNextPage && (
+              <Group justify="center" mt="md">
+                <Button variant="light" onClick={() => search.fetchNextPage()} loading={search.isFetchingNextPage}>
+                  Load more
+                </Button>
+              </Group>
+            )}
+          </>
+        )
+      ) : runs && runs.length === 0 ? (
         <Alert>No sync history yet.</Alert>
       ) : (
         <Table striped highlightOnHover>
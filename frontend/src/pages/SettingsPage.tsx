@@ -14,9 +14,15 @@ import {
   Switch,
   NumberInput,
   CopyButton,
+  Checkbox,
 } from "@mantine/core";
-import { IconCheck, IconFolder, IconAlertTriangle, IconVinyl, IconWand, IconCopy } from "@tabler/icons-react";
-import { useSettings, useUpdateSettings } from "../hooks/useSettings";
+import { IconCheck, IconFolder, IconAlertTriangle, IconVinyl, IconWand, IconCopy, IconDatabase } from "@tabler/icons-react";
+import {
+  useSettings,
+  useUpdateSettings,
+  useMaintenanceStatus,
+  useRunMaintenance,
+} from "../hooks/useSettings";
 import { useRekordboxStatus } from "../hooks/useRekordbox";
 import { settingsApi, type MoveCheckResult } from "../api/settings";
 import { FolderPicker } from "../components/FolderPicker";
@@ -35,17 +41,26 @@ export function SettingsPage() {
   const { data: settings, isLoading } = useSettings();
   const updateSettings = useUpdateSettings();
   const { data: rekordboxStatus } = useRekordboxStatus();
+  const { data: maintenance } = useMaintenanceStatus();
+  const runMaintenance = useRunMaintenance();
   const [authToken, setAuthToken] = useState("");
   const [defaultFormat, setDefaultFormat] = useState("mp3");
   const [nameFormat, setNameFormat] = useState("");
+  const [shareTracks, setShareTracks] = useState(false);
   const [musicRoot, setMusicRoot] = useState("");
   const [autoSyncEnabled, setAutoSyncEnabled] = useState(false);
   const [autoSyncInterval, setAutoSyncInterval] = useState<number>(60);
   const [maxConcurrentSyncs, setMaxConcurrentSyncs] = useState<number>(2);
+  const [logRetentionDays, setLogRetentionDays] = useState<number>(0);
+  const [failedLogRetentionDays, setFailedLogRetentionDays] = useState<number>(0);
+  const [runRetentionDays, setRunRetentionDays] = useState<number>(0);
+  const [retentionSaved, setRetentionSaved] = useState(false);
   const [saved, setSaved] = useState(false);
   const [autoSyncSaved, setAutoSyncSaved] = useState(false);
   const [folderPickerOpened, setFolderPickerOpened] = useState(false);
   const [rekordboxXmlPath, setRekordboxXmlPath] = useState("");
+  const [rekordboxAutoExport, setRekordboxAutoExport] = useState(false);
+  const [rekordboxAnalyzeAudio, setRekordboxAnalyzeAudio] = useState(false);
   const [rekordboxSaved, setRekordboxSaved] = useState(false);
   const [rekordboxFolderPickerOpened, setRekordboxFolderPickerOpened] = useState(false);
 
@@ -55,6 +70,7 @@ export function SettingsPage() {
   const [isMoving, setIsMoving] = useState(false);
   const [checkingMove, setCheckingMove] = useState(false);
   const [moveError, setMoveError] = useState<string | null>(null);
+  const [verifyChecksums, setVerifyChecksums] = useState(false);
   const originalMusicRoot = useRef("");
 
   const {
@@ -70,12 +86,18 @@ export function SettingsPage() {
       setAuthToken(settings.auth_token || "");
       setDefaultFormat(settings.default_audio_format || "mp3");
       setNameFormat(settings.default_name_format || "");
+      setShareTracks(settings.share_tracks_across_sources ?? false);
       setMusicRoot(settings.music_root || "");
       originalMusicRoot.current = settings.music_root || "";
       setAutoSyncEnabled(settings.auto_sync_enabled ?? false);
       setAutoSyncInterval(settings.auto_sync_interval_minutes ?? 60);
       setMaxConcurrentSyncs(settings.max_concurrent_syncs ?? 2);
+      setLogRetentionDays(settings.history_log_retention_days ?? 0);
+      setFailedLogRetentionDays(settings.history_failed_log_retention_days ?? 0);
+      setRunRetentionDays(settings.history_run_retention_days ?? 0);
       setRekordboxXmlPath(settings.rekordbox_xml_path || "");
+      setRekordboxAutoExport(settings.rekordbox_auto_export ?? false);
+      setRekordboxAnalyzeAudio(settings.rekordbox_analyze_audio ?? false);
     }
   }, [settings]);
 
@@ -121,6 +143,7 @@ export function SettingsPage() {
       auth_token: authToken || null,
       default_audio_format: defaultFormat,
       default_name_format: nameFormat || null,
+      share_tracks_across_sources: shareTracks,
       music_root: musicRoot || null,
     });
     originalMusicRoot.current = musicRoot;
@@ -139,9 +162,10 @@ export function SettingsPage() {
         auth_token: authToken || null,
         default_audio_format: defaultFormat,
         default_name_format: nameFormat || null,
+        share_tracks_across_sources: shareTracks,
       });
       // Start the move (updates music_root in DB on completion)
-      await settingsApi.moveLibrary(musicRoot);
+      await settingsApi.moveLibrary(musicRoot, verifyChecksums);
     } catch (e: unknown) {
       const msg = e instanceof Error ? e.message : String(e);
       setMoveError(msg);
@@ -157,6 +181,13 @@ export function SettingsPage() {
     moveStatus !== "failed" &&
     moveStatus !== "idle";
 
+  // Byte-level progress is smoother than file counts when file sizes vary
+  const moveFraction = moveProgress
+    ? moveProgress.bytesTotal
+      ? (moveProgress.bytesDone ?? 0) / moveProgress.bytesTotal
+      : moveProgress.total > 0 ? moveProgress.current / moveProgress.total : 0
+    : 0;
+
   const statusLabel: Record<MoveStatus, string> = {
     idle: "Preparing...",
     scanning: "Scanning files...",
@@ -222,6 +253,12 @@ export function SettingsPage() {
             placeholder="{artist} - {title}"
             description="Default naming pattern for downloaded files"
           />
+          <Switch
+            label="Share tracks across sources"
+            description="Link tracks another source with the same format, naming and cover art settings already has instead of downloading them again. Shared downloads are not tagged with the playlist as album"
+            checked={shareTracks}
+            onChange={(e) => setShareTracks(e.currentTarget.checked)}
+          />
           <Button
             onClick={handleSave}
             loading={updateSettings.isPending || checkingMove}
@@ -291,6 +328,95 @@ export function SettingsPage() {
         </Stack>
       </Card>
 
+      {/* History retention / database maintenance card */}
+      <Card withBorder p="lg" maw={600} mt="md">
+        <Group mb="md" gap="xs">
+          <IconDatabase size={20} />
+          <Title order={4}>History &amp; Database</Title>
+        </Group>
+        <Stack gap="md">
+          <NumberInput
+            label="Keep sync logs (days)"
+            description="Older runs keep their counters but lose their log and trace. 0 keeps logs forever."
+            value={logRetentionDays}
+            onChange={(v) => setLogRetentionDays(typeof v === "number" ? v : 0)}
+            min={0}
+            step={30}
+          />
+          <NumberInput
+            label="Keep logs of failed syncs (days)"
+            description="Failed runs are usually the ones worth reading later. 0 keeps them forever."
+            value={failedLogRetentionDays}
+            onChange={(v) => setFailedLogRetentionDays(typeof v === "number" ? v : 0)}
+            min={0}
+            step={30}
+          />
+          <NumberInput
+            label="Delete sync runs after (days)"
+            description="Removes old runs from history entirely; each source keeps its latest run. 0 never deletes."
+            value={runRetentionDays}
+            onChange={(v) => setRunRetentionDays(typeof v === "number" ? v : 0)}
+            min={0}
+            step={30}
+          />
+          <Group>
+            <Button
+              onClick={async () => {
+                await updateSettings.mutateAsync({
+                  history_log_retention_days: logRetentionDays,
+                  history_failed_log_retention_days: failedLogRetentionDays,
+                  history_run_retention_days: runRetentionDays,
+                });
+                setRetentionSaved(true);
+                setTimeout(() => setRetentionSaved(false), 3000);
+              }}
+              loading={updateSettings.isPending}
+            >
+              Save
+            </Button>
+            <Button
+              variant="light"
+              onClick={() => runMaintenance.mutate(false)}
+              loading={runMaintenance.isPending || maintenance?.running}
+            >
+              Run maintenance now
+            </Button>
+            {maintenance?.last_report?.auto_vacuum !== "incremental" && (
+              <Button
+                variant="subtle"
+                onClick={() => runMaintenance.mutate(true)}
+                disabled={maintenance?.running}
+                title="Rebuilds the database file once so later runs can shrink it. Needs all syncs to be finished."
+              >
+                Compact database
+              </Button>
+            )}
+          </Group>
+          {retentionSaved && (
+            <Alert color="green" icon={<IconCheck size={16} />}>
+              Retention settings saved
+            </Alert>
+          )}
+          {runMaintenance.error && (
+            <Alert color="red">{runMaintenance.error.message}</Alert>
+          )}
+          {maintenance?.last_report && (
+            <Text size="xs" c="dimmed">
+              Last run {new Date(maintenance.last_report.started_at).toLocaleString()}:{" "}
+              {maintenance.last_report.error
+                ? `failed (${maintenance.last_report.error})`
+                : `${maintenance.last_report.logs_compacted} logs compacted, ` +
+                  `${maintenance.last_report.runs_deleted} runs deleted, ` +
+                  `${formatBytes(maintenance.last_report.reclaimed_bytes)} reclaimed. ` +
+                  `Database: ${formatBytes(maintenance.last_report.database_bytes)}` +
+                  (maintenance.last_report.free_bytes
+                    ? ` (${formatBytes(maintenance.last_report.free_bytes)} free for reuse)`
+                    : "")}
+            </Text>
+          )}
+        </Stack>
+      </Card>
+
       {/* Rekordbox card (hidden on Linux — Rekordbox is Windows/macOS only) */}
       {rekordboxStatus?.platform !== "linux" && <Card withBorder p="lg" maw={600} mt="md">
         <Group mb="md" gap="xs">
@@ -371,10 +497,29 @@ export function SettingsPage() {
               </Group>
             </>
           )}
+          <Switch
+            label="Export after each sync"
+            description="Add new tracks to (and remove deleted tracks from) the XML when a sync completes"
+            checked={rekordboxAutoExport}
+            onChange={(e) => setRekordboxAutoExport(e.currentTarget.checked)}
+          />
+          <Switch
+            label="Analyze BPM and key"
+            description={
+              rekordboxStatus?.analysis_available
+                ? "Estimate the tempo and key of new tracks when exporting"
+                : "Requires NumPy (pip install numpy) and FFmpeg; until then only BPM tags are exported"
+            }
+            checked={rekordboxAnalyzeAudio}
+            onChange={(e) => setRekordboxAnalyzeAudio(e.currentTarget.checked)}
+            disabled={!rekordboxStatus?.analysis_available}
+          />
           <Button
             onClick={async () => {
               await updateSettings.mutateAsync({
                 rekordbox_xml_path: rekordboxXmlPath || null,
+                rekordbox_auto_export: rekordboxAutoExport,
+                rekordbox_analyze_audio: rekordboxAnalyzeAudio,
               });
               setRekordboxSaved(true);
               setTimeout(() => setRekordboxSaved(false), 3000);
@@ -410,16 +555,20 @@ export function SettingsPage() {
               <Group justify="space-between">
                 <Text size="sm" c="dimmed">
                   {moveProgress.current} / {moveProgress.total} files
+                  {moveProgress.bytesTotal
+                    ? ` · ${formatBytes(moveProgress.bytesDone ?? 0)} / ${formatBytes(moveProgress.bytesTotal)}`
+                    : ""}
+                  {moveActive && moveProgress.bytesPerSec
+                    ? ` · ${formatBytes(moveProgress.bytesPerSec)}/s`
+                    : ""}
                 </Text>
                 <Text size="sm" c="dimmed">
-                  {Math.round(
-                    (moveProgress.current / moveProgress.total) * 100
-                  )}
+                  {Math.round(moveFraction * 100)}
                   %
                 </Text>
               </Group>
               <Progress
-                value={(moveProgress.current / moveProgress.total) * 100}
+                value={moveFraction * 100}
                 size="lg"
                 radius="md"
                 animated={moveActive}
@@ -478,6 +627,12 @@ export function SettingsPage() {
             Files will be copied to the new location and verified before
             removing the originals. Syncing will be blocked during the move.
           </Text>
+          <Checkbox
+            label="Compute checksums"
+            description="Hash each file while it is copied and keep the checksum in the move journal (slower, only used when moving to another disk)"
+            checked={verifyChecksums}
+            onChange={(e) => setVerifyChecksums(e.currentTarget.checked)}
+          />
           <Group justify="flex-end">
             <Button
               variant="default"
@@ -0,0 +1,186 @@
+import {
+  Title, Card, Group, SimpleGrid, Stack, Text, Table, SegmentedControl, Tooltip, Box, Alert,
+} from "@mantine/core";
+import { useQuery } from "@tanstack/react-query";
+import { statsApi } from "../api/stats";
+import { useState } from "react";
+import type { StatsBucket, StatsBucketSize } from "../types/stats";
+
+function formatBytes(bytes: number) {
+  if (bytes < 1024) return `${bytes} B`;
+  if (bytes < 1048576) return `${(bytes / 1024).toFixed(1)} KB`;
+  if (bytes < 1073741824) return `${(bytes / 1048576).toFixed(1)} MB`;
+  return `${(bytes / 1073741824).toFixed(2)} GB`;
+}
+
+function formatRate(rate: number | null) {
+  return rate === null ? "–" : `${(rate * 100).toFixed(1)}%`;
+}
+
+const RANGES: Record<StatsBucketSize, number> = { day: 30, week: 182, month: 730 };
+
+function BarSeries({
+  series,
+  value,
+  label,
+  color,
+}: {
+  series: StatsBucket[];
+  value: (b: StatsBucket) => number;
+  label: (b: StatsBucket) => string;
+  color: string;
+}) {
+  const max = Math.max(1, ...series.map(value));
+  return (
+    <Group gap={2} align="flex-end" h={120} wrap="nowrap">
+      {series.map((b) => (
+        <Tooltip key={b.bucket} label={`${b.bucket}: ${label(b)}`}>
+          <Box
+            style={{ flex: 1, minWidth: 2 }}
+            h={`${Math.max((value(b) / max) * 100, value(b) ? 2 : 0)}%`}
+            bg={color}
+          />
+        </Tooltip>
+      ))}
+    </Group>
+  );
+}
+
+export function StatsPage() {
+  const [bucket, setBucket] = useState<StatsBucketSize>("day");
+  const { data: stats, isLoading, error } = useQuery({
+    queryKey: ["stats", bucket],
+    queryFn: () => statsApi.get(bucket, RANGES[bucket]),
+  });
+
+  return (
+    <>
+      <Group justify="space-between" mb="lg">
+        <Title order={2}>Statistics</Title>
+        <SegmentedControl
+          value={bucket}
+          onChange={(v) => setBucket(v as StatsBucketSize)}
+          data={[
+            { label: "Daily", value: "day" },
+            { label: "Weekly", value: "week" },
+            { label: "Monthly", value: "month" },
+          ]}
+        />
+      </Group>
+
+      {error && <Alert color="red" mb="md">{error.message}</Alert>}
+      {isLoading || !stats ? (
+        <Text c="dimmed">Loading...</Text>
+      ) : (
+        <Stack gap="md">
+          <SimpleGrid cols={{ base: 1, sm: 2, lg: 4 }}>
+            <Card withBorder p="md">
+              <Text size="xs" c="dimmed">Tracks</Text>
+              <Text fw={700} size="xl">{stats.library.tracks.toLocaleString()}</Text>
+            </Card>
+            <Card withBorder p="md">
+              <Text size="xs" c="dimmed">Library size</Text>
+              <Text fw={700} size="xl">{formatBytes(stats.library.bytes)}</Text>
+            </Card>
+            <Card withBorder p="md">
+              <Text size="xs" c="dimmed">Sources</Text>
+              <Text fw={700} size="xl">{stats.sources.length}</Text>
+            </Card>
+            <Card withBorder p="md">
+              <Text size="xs" c="dimmed">Shared between sources</Text>
+              <Text fw={700} size="xl">{stats.shared.tracks.toLocaleString()}</Text>
+              <Text size="xs" c="dimmed">
+                {formatBytes(stats.shared.bytes_saved)} not downloaded,{" "}
+                {formatBytes(stats.shared.bytes_deduplicated)} not stored twice
+              </Text>
+            </Card>
+          </SimpleGrid>
+
+          <Card withBorder p="md">
+            <Text fw={500} mb="sm">Library size</Text>
+            <BarSeries
+              series={stats.series}
+              value={(b) => b.library_bytes}
+              label={(b) => `${b.library_tracks} tracks, ${formatBytes(b.library_bytes)}`}
+              color="blue"
+            />
+            {stats.library.tracking_since && (
+              <Text size="xs" c="dimmed" mt="xs">
+                File changes recorded since {stats.library.tracking_since}
+              </Text>
+            )}
+          </Card>
+
+          <SimpleGrid cols={{ base: 1, md: 2 }}>
+            <Card withBorder p="md">
+              <Text fw={500} mb="sm">Tracks added</Text>
+              <BarSeries
+                series={stats.series}
+                value={(b) => b.tracks_added}
+                label={(b) => `${b.tracks_added} added, ${b.tracks_removed} removed`}
+                color="teal"
+              />
+            </Card>
+            <Card withBorder p="md">
+              <Text fw={500} mb="sm">Failed syncs</Text>
+              <BarSeries
+                series={stats.series}
+                value={(b) => b.failure_rate ?? 0}
+                label={(b) => `${b.runs_failed} of ${b.runs} runs (${formatRate(b.failure_rate)})`}
+                color="red"
+              />
+            </Card>
+          </SimpleGrid>
+
+          <Card withBorder p="md">
+            <Text fw={500} mb="sm">Formats</Text>
+            <Table>
+              <Table.Thead>
+                <Table.Tr>
+                  <Table.Th>Format</Table.Th>
+                  <Table.Th>Tracks</Table.Th>
+                  <Table.Th>Size</Table.Th>
+                </Table.Tr>
+              </Table.Thead>
+              <Table.Tbody>
+                {stats.formats.map((f) => (
+                  <Table.Tr key={f.format}>
+                    <Table.Td>{f.format}</Table.Td>
+                    <Table.Td>{f.tracks.toLocaleString()}</Table.Td>
+                    <Table.Td>{formatBytes(f.bytes)}</Table.Td>
+                  </Table.Tr>
+                ))}
+              </Table.Tbody>
+            </Table>
+          </Card>
+
+          <Card withBorder p="md">
+            <Text fw={500} mb="sm">Sources</Text>
+            <Table>
+              <Table.Thead>
+                <Table.Tr>
+                  <Table.Th>Source</Table.Th>
+                  <Table.Th>Tracks</Table.Th>
+                  <Table.Th>Size</Table.Th>
+                  <Table.Th>Runs</Table.Th>
+                  <Table.Th>Failure rate</Table.Th>
+                </Table.Tr>
+              </Table.Thead>
+              <Table.Tbody>
+                {stats.sources.map((s) => (
+                  <Table.Tr key={s.source_id}>
+                    <Table.Td>{s.name}</Table.Td>
+                    <Table.Td>{s.tracks.toLocaleString()}</Table.Td>
+                    <Table.Td>{formatBytes(s.bytes)}</Table.Td>
+                    <Table.Td>{s.runs}</Table.Td>
+                    <Table.Td>{formatRate(s.failure_rate)}</Table.Td>
+                  </Table.Tr>
+                ))}
+              </Table.Tbody>
+            </Table>
+          </Card>
+        </Stack>
+      )}
+    </>
+  );
+}
@@ -7,7 +7,14 @@ export interface Settings {
   auto_sync_interval_minutes: number;
   max_concurrent_syncs: number;
   rekordbox_xml_path: string | null;
+  rekordbox_auto_export: boolean;
+  rekordbox_analyze_audio: boolean;
   onboarding_complete: boolean;
+  profiling_enabled: boolean;
+  history_log_retention_days: number;
+  history_failed_log_retention_days: number;
+  history_run_retention_days: number;
+  share_tracks_across_sources: boolean;
 }
 
 export type SettingsUpdate = Partial<Settings>;
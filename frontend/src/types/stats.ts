@@ -0,0 +1,50 @@
+export type StatsBucketSize = "day" | "week" | "month";
+
+export interface FormatTotals {
+  format: string;
+  tracks: number;
+  bytes: number;
+}
+
+export interface SharedTotals {
+  tracks: number;
+  bytes_saved: number;
+  bytes_deduplicated: number;
+}
+
+export interface SourceStats {
+  source_id: number;
+  name: string;
+  tracks: number;
+  bytes: number;
+  runs: number;
+  runs_failed: number;
+  failure_rate: number | null;
+}
+
+export interface StatsBucket {
+  bucket: string;
+  runs: number;
+  runs_failed: number;
+  runs_cancelled: number;
+  run_seconds: number;
+  failure_rate: number | null;
+  tracks_added: number;
+  tracks_removed: number;
+  files_added: number;
+  files_removed: number;
+  bytes_added: number;
+  bytes_removed: number;
+  library_tracks: number;
+  library_bytes: number;
+}
+
+export interface LibraryStats {
+  bucket: StatsBucketSize;
+  start: string;
+  library: { tracks: number; bytes: number; tracking_since: string | null };
+  formats: FormatTotals[];
+  shared: SharedTotals;
+  sources: SourceStats[];
+  series: StatsBucket[];
+}
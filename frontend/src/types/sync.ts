@@ -13,6 +13,23 @@ export interface SyncRun {
 
 export interface SyncRunDetail extends SyncRun {
   log_output: string | null;
+  has_trace: boolean;
+}
+
+export interface LogMatch {
+  line: number;
+  text: string;
+  highlights: [number, number][];
+}
+
+export interface SyncRunSearchHit extends SyncRun {
+  match_count: number;
+  matches: LogMatch[];
+}
+
+export interface SyncRunSearchResult {
+  results: SyncRunSearchHit[];
+  next_before: number | null;
 }
 
 export interface SyncStatus {
@@ -21,7 +38,7 @@ export interface SyncStatus {
 }
 
 export interface WsMessage {
-  type: "log" | "status" | "stats" | "progress";
+  type: "log" | "status" | "stats" | "progress" | "export_progress";
   line?: string;
   status?: string;
   error?: string;
@@ -30,4 +47,5 @@ export interface WsMessage {
   skipped?: number;
   current?: number;
   total?: number;
+  phase?: string;
 }
@@ -1,11 +1,14 @@
 package main
 
 import (
+	"bytes"
+	"io"
 	"log"
 	"net/http"
 	"net/http/httputil"
 	"net/url"
 	"strings"
+	"sync"
 	"time"
 )
 
@@ -33,21 +36,66 @@ func (a *App) apiMiddleware() func(next http.Handler) http.Handler {
 	}
 }
 
-// waitForBackend polls the backend health endpoint until it responds.
-func waitForBackend(timeout time.Duration) bool {
-	deadline := time.Now().Add(timeout)
-	client := &http.Client{Timeout: 2 * time.Second}
+// backendReadyMarker starts the line app.serve prints on stdout once the backend
+// accepts connections, followed by its startup timing report as JSON.
+const backendReadyMarker = "SCDL_WEB_READY"
 
-	for time.Now().Before(deadline) {
-		resp, err := client.Get("http://127.0.0.1:8000/api/health")
-		if err == nil && resp.StatusCode == 200 {
-			resp.Body.Close()
-			return true
-		}
-		if resp != nil {
-			resp.Body.Close()
+// readyWriter forwards the backend's stdout and closes a channel when a line
+// starting with the readiness marker goes by.
+type readyWriter struct {
+	out    io.Writer
+	marker []byte
+	ready  chan struct{}
+	once   sync.Once
+	line   []byte
+}
+
+func newReadyWriter(out io.Writer, marker string) *readyWriter {
+	return &readyWriter{out: out, marker: []byte(marker), ready: make(chan struct{})}
+}
+
+// Ready returns a channel closed once the readiness line has been seen.
+func (w *readyWriter) Ready() <-chan struct{} {
+	return w.ready
+}
+
+func (w *readyWriter) Write(p []byte) (int, error) {
+	select {
+	case <-w.ready:
+		// Already ready: plain pass-through
+	default:
+		w.line = append(w.line, p...)
+		for {
+			i := bytes.IndexByte(w.line, '\n')
+			if i < 0 {
+				break
+			}
+			if line := w.line[:i]; bytes.HasPrefix(line, w.marker) {
+				log.Printf("Backend startup: %s", bytes.TrimSpace(line[len(w.marker):]))
+				w.once.Do(func() { close(w.ready) })
+				w.line = nil
+				break
+			}
+			w.line = w.line[i+1:]
 		}
-		time.Sleep(500 * time.Millisecond)
 	}
-	return false
+	// The copy to our own stdout is best-effort: in a Windows GUI build
+	// (-H windowsgui) os.Stdout is invalid, and an error here would end the
+	// io.Copy draining the backend's stdout pipe, leaving the backend to block
+	// or die on its next print.
+	w.out.Write(p) //nolint:errcheck
+	return len(p), nil
+}
+
+// waitForBackend waits for the backend's readiness line on stdout. It gives up
+// when the timeout expires or the backend process exits first.
+func waitForBackend(ready <-chan struct{}, exited <-chan struct{}, timeout time.Duration) bool {
+	select {
+	case <-ready:
+		return true
+	case <-exited:
+		return false
+	case <-time.After(timeout):
+		return false
+	}
 }
@@ -110,9 +110,11 @@ func pipInstall() error {
 	return nil
 }
 
-// startBackend launches uvicorn as a subprocess and returns the Cmd.
-func startBackend(envVars []string) (*exec.Cmd, error) {
-	uvicorn := venvBin("uvicorn")
+// startBackend launches the backend (uvicorn via app.serve) as a subprocess and
+// returns the Cmd together with a channel that is closed once the backend
+// prints its readiness line on stdout.
+func startBackend(envVars []string) (*exec.Cmd, <-chan struct{}, error) {
+	python := venvBin("python")
 
 	// Prepend venv Scripts/bin to PATH so subprocesses (scdl, ffmpeg…) are found.
 	// We de-duplicate PATH to avoid glibc picking the old entry (first match wins).
@@ -133,26 +135,29 @@ func startBackend(envVars []string) (*exec.Cmd, error) {
 	env = append(env, "PATH="+newPath)
 	env = append(env, envVars...)
 
-	cmd := exec.Command(uvicorn,
-		"app.main:app",
+	cmd := exec.Command(python,
+		"-m", "app.serve",
 		"--host", "127.0.0.1",
 		"--port", "8000",
 	)
 	hideWindow(cmd)
+	ready := newReadyWriter(os.Stdout, backendReadyMarker)
 	cmd.Dir = backendDir()
 	cmd.Env = env
-	cmd.Stdout = os.Stdout
+	cmd.Stdout = ready
 	cmd.Stderr = os.Stderr
 
 	if err := cmd.Start(); err != nil {
-		return nil, fmt.Errorf("failed to start backend: %w", err)
+		return nil, nil, fmt.Errorf("failed to start backend: %w", err)
 	}
 
-	return cmd, nil
+	return cmd, ready.Ready(), nil
 }
 
-// stopBackend sends a termination signal to the backend process.
-func stopBackend(cmd *exec.Cmd) {
+// stopBackend sends a termination signal to the backend process and waits
+// until it has exited, as reported by the exited channel of the goroutine that
+// owns cmd.Wait (an exec.Cmd must not be waited for twice).
+func stopBackend(cmd *exec.Cmd, exited <-chan struct{}) {
 	if cmd == nil || cmd.Process == nil {
 		return
 	}
@@ -161,7 +166,9 @@ func stopBackend(cmd *exec.Cmd) {
 	} else {
 		cmd.Process.Signal(syscall.SIGTERM)
 	}
-	cmd.Wait()
+	if exited != nil {
+		<-exited
+	}
 }
 
 // venvBin returns the path to a binary inside the venv.